@@ -0,0 +1,53 @@
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+from moodle import BOOKING_NOTE
+from httpengine import USER_AGENT, MoodleHttp
+
+
+class AsyncHttpEngine(MoodleHttp):
+    """asyncio counterpart of HttpEngine for use on one shared event loop.
+
+    The client is built on a transport owned by the runner, so every engine
+    for the same host and proxy reuses one connection pool while keeping its
+    own cookie jar (one Moodle session per account).
+    """
+
+    name = "HTTP (async)"
+
+    def __init__(self, transport, timeout=10.0):
+        super().__init__()
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not installed. Run: pip install httpx")
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def _run(self, flow):
+        """Drive a MoodleHttp flow by awaiting the async client and return its result."""
+        try:
+            request = next(flow)
+            while True:
+                method, url, kwargs = request
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.HTTPError as e:
+                    request = flow.throw(e)
+                else:
+                    request = flow.send(response)
+        except StopIteration as done:
+            return done.value
+
+    async def login(self, username, password):
+        return await self._run(self._login_flow(username, password))
+
+    async def fetch(self, scheduler_url):
+        return await self._run(self._fetch_flow(scheduler_url))
+
+    async def book(self, row, handle, slot, note=BOOKING_NOTE):
+        return await self._run(self._book_flow(row, handle, note))
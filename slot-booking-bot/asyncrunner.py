@@ -0,0 +1,274 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+from asyncengine import AsyncHttpEngine
+from coordinator import BookingCoordinator
+from metrics import job_metrics, job_report
+from moodle import PageState
+from poller import SlotWatcher, VenuePoller
+from sessionbroker import session_broker
+from slotindex import slot_key
+
+
+class AsyncJobSpec:
+    """One account's booking job: the ranked slots to watch on each of `venues`, a list of (scheduler_url, slots)."""
+
+    def __init__(self, job, username, password, venues, proxy=None, continuous=True, deadline=None, start_at=None):
+        self.job = job
+        self.username = username
+        self.password = password
+        self.venues = venues
+        self.proxy = proxy
+        self.continuous = continuous
+        self.deadline = deadline
+        self.start_at = start_at
+
+
+class AsyncBookingRunner:
+    """Runs many booking jobs as tasks on one asyncio event loop in a single background thread.
+
+    Each job is one account watching its ranked slots on one or more venues,
+    with its own deadline and cancellation. A job fetches all its venues
+    concurrently each cycle, then books the most preferred bookable slot
+    across them. A job with start_at logs in and polls once ahead of time,
+    then waits for T-0. Jobs for the same account share a
+    BookingCoordinator, so cancel_all() on those coordinators (what the Stop
+    button does) cancels the tasks. Engines for the same host and proxy share
+    one connection pool.
+
+    notify(kind, title, message) is called with kind "info", "warning" or
+    "error" for user-facing results, and on_status(job_name, text) for progress.
+    """
+
+    def __init__(self, refresh_interval=0.5, notify=None, on_status=None, max_connections=100):
+        self.refresh_interval = refresh_interval
+        self.notify = notify or (lambda kind, title, message: print(f"{title}: {message}"))
+        self.on_status = on_status or (lambda job_name, text: None)
+        self.max_connections = max_connections
+        self.specs = []
+        self.coordinators = {}
+        self._transports = {}
+        self._loop = None
+        self._thread = None
+
+    def add_job(self, username, password, venues, proxy=None, continuous=True, deadline=None, start_at=None):
+        """Add a job for (scheduler_url, slots) pairs; slots carry a "rank" when preference spans venues."""
+        coordinator = self.coordinators.get(username)
+        if coordinator is None:
+            coordinator = self.coordinators[username] = BookingCoordinator(username)
+        where = venues[0][0] if len(venues) == 1 else "all venues"
+        job = coordinator.add_job(f"{username} @ {where}")
+        self.specs.append(AsyncJobSpec(job, username, password, venues, proxy, continuous, deadline, start_at))
+        return job
+
+    def start(self):
+        """Run every added job on a fresh event loop in a daemon thread and return the thread."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def run(self):
+        if not HTTPX_AVAILABLE:
+            self.notify("error", "Error", "httpx is not installed. Run: pip install httpx")
+            return
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(self._run_job(spec)) for spec in self.specs]
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for transport in self._transports.values():
+                await transport.aclose()
+            self._transports.clear()
+
+    def _transport(self, scheduler_url, proxy):
+        key = (urlsplit(scheduler_url).netloc, proxy)
+        transport = self._transports.get(key)
+        if transport is None:
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            transport = self._transports[key] = httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+        return transport
+
+    def _cancel_task(self, task):
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def _fetch(self, engine, scheduler_url, metrics):
+        started = time.monotonic()
+        page = await engine.fetch(scheduler_url)
+        metrics.incr("polls")
+        metrics.observe("fetch", time.monotonic() - started)
+        return page
+
+    async def _relogin(self, engine, spec, metrics, started):
+        """Replace an expired session through the broker; `started` is when the poll that found it began."""
+        relogged = await session_broker.sign_in_async(engine, spec.username, spec.password, refresh=True)
+        metrics.incr("relogins")
+        metrics.observe("relogin", time.monotonic() - started)
+        if not relogged:
+            metrics.incr("relogin_failures")
+        return relogged
+
+    async def _warm_up(self, engine, spec, scheduler_url, metrics):
+        """One poll before T-0, replacing a session that expired since it was cached, like slot_booking.warm_up."""
+        started = time.monotonic()
+        state, rows, handles = await engine.fetch(scheduler_url)
+        # Twice: the first refresh may only adopt cookies another engine cached, which can be just as stale
+        for _ in range(2):
+            if state != PageState.LOGIN_REQUIRED:
+                break
+            print(f"{spec.job.name} warm-up found the session expired. Logging in again before T-0...")
+            if not await self._relogin(engine, spec, metrics, started):
+                break
+            state, rows, handles = await engine.fetch(scheduler_url)
+        lead = (spec.start_at - datetime.now()).total_seconds()
+        if state in (PageState.TABLE_READY, PageState.EMPTY):
+            print(f"{spec.job.name} warm: first valid poll {lead:.2f}s before T-0 ({len(rows)} rows parsed)")
+        else:
+            print(f"{spec.job.name} warm-up poll returned {state.name}; the first valid poll will happen after T-0.")
+        return state
+
+    async def _run_job(self, spec):
+        job = spec.job
+        task = asyncio.current_task()
+        job.on_cancel(lambda reason: self._cancel_task(task))
+        # The pollers only keep the ranked watchers and stop state here; fetching is awaited below
+        pollers = {}
+        slots = {}
+        for scheduler_url, venue_slots in spec.venues:
+            poller = VenuePoller(None, self.refresh_interval, spec.deadline)
+            for rank, slot in enumerate(venue_slots):
+                try:
+                    watcher = SlotWatcher(slot_key(slot["date"], slot["start_time"], slot["end_time"]),
+                                          f"{slot['day']}, {slot['date']}, {slot['start_time']}-{slot['end_time']}", None,
+                                          slot.get("rank", rank))
+                except ValueError:
+                    self.notify("error", "Error", f"❌ Invalid date or time: {slot['date']}, {slot['start_time']}-{slot['end_time']}")
+                    continue
+                slots[watcher] = slot
+                poller.register(watcher)
+            if poller.watchers:
+                pollers[scheduler_url] = poller
+        if not pollers:
+            return
+
+        def stop_all(reason):
+            # Bookings, existing bookings, frozen slots and the session are all per account
+            for poller in pollers.values():
+                poller.stop(reason)
+
+        metrics = job_metrics.start(job.name)
+        try:
+            engine = AsyncHttpEngine(self._transport(spec.venues[0][0], spec.proxy))
+            metrics.set_state("logging in")
+            if not await session_broker.sign_in_async(engine, spec.username, spec.password):
+                self.notify("error", "Error", f"❌ {engine.error}")
+                return
+            if spec.start_at:
+                # Warm-up: one poll per venue before T-0 so the first real poll is hot
+                metrics.set_state("warming up")
+                for scheduler_url in pollers:
+                    await self._warm_up(engine, spec, scheduler_url, metrics)
+                lead = (spec.start_at - datetime.now()).total_seconds()
+                if lead > 0:
+                    await asyncio.sleep(lead)
+            metrics.set_state("polling")
+            attempt = 0
+            active = dict(pollers)
+            while active:
+                loop_start = time.monotonic()
+                if spec.deadline and datetime.now() > spec.deadline:
+                    stop_all("deadline")
+                    break
+                attempt += 1
+                for poller in active.values():
+                    poller.attempt += 1
+                watching = sum(len(poller.watchers) for poller in active.values())
+                self.on_status(job.name, f"Attempt {attempt}: Checking {watching} slot(s) on {len(active)} venue(s)...")
+                urls = list(active)
+                pages = await asyncio.gather(*(self._fetch(engine, url, metrics) for url in urls))
+                fetched_at = time.monotonic()
+                expired = [i for i, page in enumerate(pages) if page[0] == PageState.LOGIN_REQUIRED]
+                if expired and not job.cancelled:
+                    # Redirected to the login page: sign in once and repeat those fetches in the same cycle
+                    if await self._relogin(engine, spec, metrics, loop_start):
+                        refetched = await asyncio.gather(*(self._fetch(engine, urls[i], metrics) for i in expired))
+                        for i, page in zip(expired, refetched):
+                            pages[i] = page
+                        fetched_at = time.monotonic()
+                found = []
+                server_error = False
+                for url, (state, rows, handles) in zip(urls, pages):
+                    poller = active[url]
+                    if state in (PageState.TABLE_READY, PageState.EMPTY):
+                        match = poller.best_match(rows)
+                        if match:
+                            watcher, position = match
+                            found.append((watcher.rank, watcher, rows[position], handles[position]))
+                    elif state == PageState.SERVER_ERROR:
+                        server_error = True
+                    else:
+                        if state == PageState.HAS_BOOKING:
+                            self.notify("warning", "Booking Exists", "You already have an upcoming slot booked. Please cancel it to book a new slot.")
+                        elif state == PageState.FROZEN:
+                            self.notify("warning", "Slot Frozen", "Your slot is frozen. Please resolve this to book a new slot.")
+                        else:
+                            self.notify("error", "Error", f"❌ Session expired and re-login failed: {engine.error}")
+                        stop_all(state)
+                        break
+                # Every venue was fetched, so the most preferred bookable slot across all of them goes first
+                for _, watcher, row, handle in sorted(found, key=lambda item: item[0]):
+                    if job.cancelled or any(poller.stopped for poller in pollers.values()) or not job.claim():
+                        break
+                    booked = False
+                    try:
+                        booked, verified = await engine.book(row, handle, slots[watcher])
+                    finally:
+                        if not booked:
+                            job.release()
+                        if engine.clicked_at is not None and engine.clicked_at >= fetched_at:
+                            metrics.observe("detect_to_click", engine.clicked_at - fetched_at)
+                    if booked:
+                        suffix = "" if verified else " (Verify manually)"
+                        self.notify("info", "Success", f"Slot booked: {watcher.label} ✅{suffix}")
+                        stop_all("booked")
+                        metrics.incr("bookings")
+                        job.confirm()
+                        break
+                active = {url: poller for url, poller in active.items() if poller.watchers and not poller.stopped}
+                if not spec.continuous or not active:
+                    break
+                if server_error:
+                    await asyncio.sleep(min(self.refresh_interval * (2 ** (attempt % 5)), 5))
+                else:
+                    remaining = self.refresh_interval - (time.monotonic() - loop_start)
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+            reason = next((poller.stop_reason for poller in pollers.values() if poller.stop_reason), None)
+            metrics.set_state(getattr(reason, "name", reason or "not found").lower())
+            if reason in (None, "deadline"):
+                for poller in pollers.values():
+                    for watcher in poller.watchers:
+                        self.notify("error", "Failure", f"❌ Slot not found for {watcher.label}.")
+        except asyncio.CancelledError:
+            metrics.set_state("cancelled")
+            print(f"Job {job.name} stopped: {job.cancel_reason}")
+        except Exception as e:
+            if job.cancelled:
+                return
+            metrics.set_state("error")
+            print(f"Unexpected error in {job.name}: {type(e).__name__}: {str(e)}")
+            self.notify("error", "Error", f"❌ {type(e).__name__}: {str(e)}")
+        finally:
+            job.finish()
+            for line in job_report(metrics):
+                print(line)
@@ -0,0 +1,149 @@
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from slotparser import parse_slot_table, format_minutes
+
+ROW_TEMPLATE = (
+    '<tr><td class="cell c0">{date}</td><td class="cell c1">{start}</td><td class="cell c2">{end}</td>'
+    '<td class="cell c3">Lab 1611</td><td class="cell c4"></td><td class="cell c5">Staff</td><td class="cell c6"></td>'
+    '<td class="cell c7"><form method="post" action="https://lms2.ai.saveetha.in/mod/scheduler/view.php">'
+    '<input type="hidden" name="what" value="bookslot"><input type="hidden" name="id" value="36137">'
+    '<input type="hidden" name="slotid" value="{slotid}"><input type="hidden" name="sesskey" value="abc123">'
+    '<button type="submit" class="btn btn-primary">Book slot</button></form></td></tr>'
+)
+
+
+def synthetic_table_html(n_rows, slot_minutes=15):
+    """Build a scheduler page with n_rows slots on a 15-minute grid, 32 slots per day."""
+    day = date(2025, 6, 16)
+    rows = []
+    for i in range(n_rows):
+        start = 8 * 60 + (i % 32) * slot_minutes
+        if i % 32 == 0 and i:
+            day += timedelta(days=1)
+        rows.append(ROW_TEMPLATE.format(
+            date=day.strftime("%A, %d %B %Y") if i % 32 == 0 else "",
+            start=format_minutes(start), end=format_minutes(start + slot_minutes), slotid=1000 + i
+        ))
+    return f'<html><body><table id="slotbookertable" class="generaltable"><tbody>{"".join(rows)}</tbody></table></body></html>'
+
+
+def bench_parse(n_rows=10000, repeat=5):
+    html = synthetic_table_html(n_rows)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = parse_slot_table(html)
+        best = min(best, time.perf_counter() - started)
+    print(f"parse_slot_table: {len(rows)} rows in {best * 1000:.1f} ms (best of {repeat})")
+
+
+# Mock page for readiness timing: #ready is inserted after ?delay=ms and the
+# browser records the exact moment in window.__appearedAt.
+READINESS_PAGE = b"""<html><body><script>
+var delay = parseInt(new URLSearchParams(location.search).get('delay') || '0', 10);
+setTimeout(function () {
+    var el = document.createElement('div');
+    el.id = 'ready';
+    el.textContent = 'ready';
+    document.body.appendChild(el);
+    window.__appearedAt = performance.now();
+}, delay);
+</script></body></html>"""
+
+
+def serve_page(page):
+    """Serve `page` (bytes) for every GET on a local port; returns (server, base_url)."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def bench_readiness(delays=(50, 130, 270, 410, 530), browser="Chrome"):
+    """Compare detection lag of WebDriverWait(poll_frequency=0.1) with domready.wait_for on a local mock page.
+
+    Lag is measured in the browser from the element's insertion to the end of
+    the wait, so both include the same single WebDriver round trip.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from domready import wait_for
+    from seleniumengine import create_driver
+
+    server, url = serve_page(READINESS_PAGE)
+    driver = create_driver(browser, True, None)
+    waits = (
+        ("WebDriverWait(poll_frequency=0.1)", lambda: WebDriverWait(driver, 5, poll_frequency=0.1).until(EC.presence_of_element_located((By.ID, "ready")))),
+        ("domready.wait_for (MutationObserver)", lambda: wait_for(driver, "#ready", 5)),
+    )
+    try:
+        for label, wait in waits:
+            lags = []
+            for delay in delays:
+                driver.get(f"{url}?delay={delay}")
+                wait()
+                lags.append(driver.execute_script("return performance.now() - window.__appearedAt;"))
+            print(f"{label}: detection lag mean {sum(lags) / len(lags):.1f} ms, max {max(lags):.1f} ms over {len(lags)} runs")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+def bench_tab_memory(n_venues=4, browser="Chrome"):
+    """Compare resident memory of one browser per venue with one browser holding a tab per venue (needs psutil)."""
+    from driverpool import process_tree_rss
+    from seleniumengine import SeleniumEngine
+
+    server, url = serve_page(synthetic_table_html(200).encode())
+    venue_urls = [f"{url}?venue={i}" for i in range(n_venues)]
+    engines = []
+    try:
+        for venue_url in venue_urls:
+            engine = SeleniumEngine(browser, True, None)
+            engine.start()
+            engines.append(engine)
+            engine.fetch(venue_url)
+        per_thread = sum(process_tree_rss(engine.service_pid()) or 0 for engine in engines)
+        for engine in engines:
+            engine.quit()
+        engines = []
+
+        engine = SeleniumEngine(browser, True, None)
+        engine.start()
+        engines.append(engine)
+        engine.use_tabs = True
+        for _ in range(2):
+            for venue_url in venue_urls:
+                engine.fetch(venue_url)
+        multi_tab = process_tree_rss(engine.service_pid()) or 0
+    finally:
+        for engine in engines:
+            engine.quit()
+        server.shutdown()
+    if not per_thread:
+        print("Install psutil to measure browser memory.")
+        return
+    print(f"{n_venues} venues, one {browser} each: {per_thread / 2**20:.0f} MB resident")
+    print(f"{n_venues} venues, one {browser} with {n_venues} tabs: {multi_tab / 2**20:.0f} MB resident ({multi_tab / per_thread:.0%})")
+
+
+if __name__ == "__main__":
+    bench_parse()
+    if "readiness" in sys.argv[1:]:
+        bench_readiness()
+    if "tabs" in sys.argv[1:]:
+        bench_tab_memory()
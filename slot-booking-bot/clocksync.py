@@ -0,0 +1,106 @@
+import http.client
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from moodle import LMS_BASE_URL
+
+
+class ClockOffset:
+    """Estimated server-minus-local clock offset in seconds, +/- uncertainty."""
+
+    def __init__(self, offset, uncertainty, samples):
+        self.offset = offset
+        self.uncertainty = uncertainty
+        self.samples = samples
+
+    def __str__(self):
+        return f"{self.offset * 1000:+.0f} ms +/- {self.uncertainty * 1000:.0f} ms ({self.samples} samples)"
+
+
+class ClockSync:
+    """Estimates the LMS server clock from the Date headers of HEAD requests.
+
+    A Date header only has one-second resolution, so each sample is used
+    NTP-style as a bound: if the request left at t0 and the reply arrived
+    at t1 (local wall clock) carrying Date D, then the server clock read
+    somewhere in [D, D + 1) while local time was in [t0, t1], so the offset
+    lies in [D - t1, D + 1 - t0]. Samples are staggered so their second
+    boundaries fall at different phases, and intersecting the bounds
+    narrows the estimate to roughly the round-trip time.
+    """
+
+    def __init__(self, url=LMS_BASE_URL, samples=8, spacing=0.37, timeout=5.0):
+        self.url = url
+        self.samples = samples
+        self.spacing = spacing
+        self.timeout = timeout
+        self.offset = 0.0
+        self.last = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        parts = urlsplit(self.url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        return connection_class(parts.netloc, timeout=self.timeout), parts.path or "/"
+
+    def sample(self, connection, path):
+        """Return (low, high) bounds on the offset from one HEAD request."""
+        t0 = time.time()
+        connection.request("HEAD", path)
+        response = connection.getresponse()
+        t1 = time.time()
+        response.read()
+        date = response.getheader("Date")
+        if not date:
+            raise ValueError("Server sent no Date header")
+        server = parsedate_to_datetime(date).timestamp()
+        return server - t1, server + 1 - t0
+
+    def measure(self):
+        """Take `samples` readings and update the offset; returns a ClockOffset."""
+        connection, path = self._connect()
+        bounds = []
+        try:
+            for i in range(self.samples):
+                if i:
+                    time.sleep(self.spacing)
+                bounds.append(self.sample(connection, path))
+        finally:
+            connection.close()
+        low = max(bound[0] for bound in bounds)
+        high = min(bound[1] for bound in bounds)
+        if low > high:
+            # Inconsistent samples (server clock stepped or a slow outlier): fall back to the median midpoint
+            midpoints = sorted((bound[0] + bound[1]) / 2 for bound in bounds)
+            estimate = ClockOffset(midpoints[len(midpoints) // 2], 0.5, len(bounds))
+        else:
+            estimate = ClockOffset((low + high) / 2, (high - low) / 2, len(bounds))
+        with self._lock:
+            self.offset = estimate.offset
+            self.last = estimate
+        print(f"Server clock offset: {estimate}")
+        return estimate
+
+    def measure_in_background(self):
+        """Measure on a daemon thread, keeping the previous offset if the LMS can't be reached."""
+        def run():
+            try:
+                self.measure()
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                print(f"Clock sync failed, keeping offset {self.offset * 1000:+.0f} ms: {e}")
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def now(self):
+        """Current time on the server's clock, as a naive local-style datetime."""
+        return datetime.now() + timedelta(seconds=self.offset)
+
+    def to_local(self, server_time):
+        """Convert a datetime on the server's clock to the matching local datetime."""
+        return server_time - timedelta(seconds=self.offset)
+
+
+server_clock = ClockSync()
@@ -1,12 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
 from tkcalendar import DateEntry
-from config import venue_details
+from venues import load_venues
+from metrics import DASHBOARD_COLUMNS
 
 # Initialize Tkinter root
 root = tk.Tk()
 root.title("Enhanced Slot Booking Bot - Saveetha LMS")
-root.geometry("500x950")
+root.geometry("700x1130")
 
 # GUI components
 ttk.Label(root, text="Username").pack(pady=5)
@@ -18,12 +19,12 @@ entry_password = ttk.Entry(root, width=30, show="*")
 entry_password.pack()
 
 ttk.Label(root, text="Select Schedule").pack(pady=5)
-combo_schedule = ttk.Combobox(root, values=list(venue_details.keys()), state="readonly")
+combo_schedule = ttk.Combobox(root, values=list(load_venues()), state="readonly")
 combo_schedule.pack()
 combo_schedule.set("1731")
 
 ttk.Label(root, text="Select Browser").pack(pady=5)
-combo_browser = ttk.Combobox(root, values=["Chrome", "Firefox", "Edge"], state="readonly")
+combo_browser = ttk.Combobox(root, values=["HTTP", "HTTP (async)", "Chrome", "Firefox", "Edge"], state="readonly")
 combo_browser.pack()
 combo_browser.set("Chrome")
 
@@ -35,6 +36,11 @@ ttk.Label(root, text="Schedule Time (HH:MM, e.g., 21:03)").pack(pady=5)
 entry_schedule_time = ttk.Entry(root, width=30)
 entry_schedule_time.pack()
 
+ttk.Label(root, text="Warm-up Lead (seconds before scheduled time)").pack(pady=5)
+entry_warmup = ttk.Entry(root, width=30)
+entry_warmup.insert(0, "60")
+entry_warmup.pack()
+
 ttk.Label(root, text="Check Until Time (HH:MM, e.g., 21:30, optional)").pack(pady=5)
 entry_check_until = ttk.Entry(root, width=30)
 entry_check_until.pack()
@@ -62,6 +68,9 @@ button_add_slot.pack(pady=5)
 button_remove_slot = ttk.Button(root, text="Remove Selected Slot")
 button_remove_slot.pack(pady=5)
 
+button_move_up = ttk.Button(root, text="Move Selected Slot Up (Higher Preference)")
+button_move_up.pack(pady=5)
+
 frame_slots = ttk.Frame(root)
 frame_slots.pack(pady=10)
 listbox_slots = tk.Listbox(frame_slots, height=5, width=60)
@@ -74,9 +83,28 @@ headless_var = tk.BooleanVar()
 check_headless = ttk.Checkbutton(root, text="Run Headless (Continuous Refresh)", variable=headless_var)
 check_headless.pack(pady=10)
 
+http_polling_var = tk.BooleanVar()
+check_http_polling = ttk.Checkbutton(root, text="Poll over HTTP after browser login (closes the browser)", variable=http_polling_var)
+check_http_polling.pack(pady=5)
+
+park_browser_var = tk.BooleanVar()
+check_park_browser = ttk.Checkbutton(root, text="Keep the browser parked to retry a failed HTTP booking", variable=park_browser_var)
+check_park_browser.pack(pady=5)
+
+parallel_var = tk.BooleanVar()
+check_parallel = ttk.Checkbutton(root, text="Poll venues in parallel (preference order only holds within a venue)", variable=parallel_var)
+check_parallel.pack(pady=5)
+
 status_label = ttk.Label(root, text="Status: Idle")
 status_label.pack(pady=5)
 
+# Live per-job dashboard, refreshed by statusview
+tree_jobs = ttk.Treeview(root, columns=[key for key, _ in DASHBOARD_COLUMNS], show="headings", height=4)
+for key, heading in DASHBOARD_COLUMNS:
+    tree_jobs.heading(key, text=heading)
+    tree_jobs.column(key, width=120 if key in ("job", "state") else 70, anchor="w" if key in ("job", "state") else "e")
+tree_jobs.pack(fill="x", padx=10, pady=5)
+
 button_book = ttk.Button(root, text="Book Slots Now")
 button_book.pack(pady=10)
 
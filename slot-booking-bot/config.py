@@ -1,30 +0,0 @@
-venue_details = {
-    "1731": {
-        "overall_start_time_str": "8:00 AM",
-        "overall_end_time_str": "4:30 PM",
-        "break_time_str": ["12:00 PM", "1:00 PM"],
-        "slot_duration_minutes": 60,
-        "fixed_start_times_str": ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "1:00 PM", "2:00 PM", "3:00 PM"]
-    },
-    "1851": {
-        "overall_start_time_str": "8:00 AM",
-        "overall_end_time_str": "6:00 PM",
-        "break_time_str": ["12:30 PM", "1:30 PM"],
-        "slot_duration_minutes": 60,
-        "fixed_start_times_str": ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "1:30 PM", "2:30 PM", "3:30 PM", "4:30 PM"]
-    },
-    "1852": {
-        "overall_start_time_str": "8:00 AM",
-        "overall_end_time_str": "4:00 PM",
-        "break_time_str": ["1:00 PM", "2:00 PM"],
-        "slot_duration_minutes": 60,
-        "fixed_start_times_str": ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "12:00 PM", "2:00 PM", "3:00 PM"]
-    },
-    "1611": {
-        "overall_start_time_str": "8:00 AM",
-        "overall_end_time_str": "4:30 PM",
-        "break_time_str": ["12:00 PM", "2:00 PM"],
-        "slot_duration_minutes": 15,
-        "generate_all_intervals": True
-    }
-}
\ No newline at end of file
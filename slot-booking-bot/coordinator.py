@@ -0,0 +1,115 @@
+import threading
+
+
+class BookingJob:
+    """One booking job (a venue poller and its driver) owned by a BookingCoordinator."""
+
+    def __init__(self, coordinator, name):
+        self.coordinator = coordinator
+        self.name = name
+        self.cancel_reason = None
+        self._cancel_event = threading.Event()
+        self._drivers = []
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def attach_driver(self, driver):
+        """Register a driver so the coordinator can tear it down if another job books first."""
+        self._drivers.append(driver)
+        if self.cancelled:
+            self._quit_drivers()
+
+    def on_cancel(self, callback):
+        self._callbacks.append(callback)
+        if self.cancelled:
+            callback(self.cancel_reason)
+
+    def claim(self):
+        return self.coordinator.claim(self)
+
+    def release(self):
+        self.coordinator.release(self)
+
+    def confirm(self):
+        self.coordinator.confirm(self)
+
+    def finish(self):
+        """Called when the job's thread or task ends, however it ends; frees a claim it never confirmed."""
+        self.coordinator.release(self)
+
+    def cancel(self, reason):
+        if self._cancel_event.is_set():
+            return
+        self.cancel_reason = reason
+        self._cancel_event.set()
+        self.coordinator.release(self)
+        for callback in self._callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                print(f"Error cancelling job {self.name}: {e}")
+        self._quit_drivers()
+
+    def _quit_drivers(self):
+        for driver in self._drivers[:]:
+            try:
+                driver.quit()
+                print(f"Closed browser for cancelled job {self.name}.")
+            except Exception as e:
+                print(f"Error closing driver for job {self.name}: {e}")
+            self._drivers.remove(driver)
+
+
+class BookingCoordinator:
+    """Owns every booking job for one account.
+
+    Moodle's scheduler only lets a student hold one upcoming booking, so the
+    first job to confirm a booking cancels its siblings straight away instead
+    of letting them find the "Cancel booking" button on their next poll.
+    """
+
+    def __init__(self, username):
+        self.username = username
+        self.jobs = []
+        self.booked_by = None
+        self._claimed_by = None
+        self._lock = threading.Lock()
+
+    def add_job(self, name):
+        job = BookingJob(self, name)
+        with self._lock:
+            self.jobs.append(job)
+        return job
+
+    def claim(self, job):
+        """Let one job at a time enter a booking form; False if another job is booking or has booked."""
+        with self._lock:
+            if job.cancelled or self.booked_by is not None:
+                return False
+            if self._claimed_by not in (None, job):
+                return False
+            self._claimed_by = job
+            return True
+
+    def release(self, job):
+        with self._lock:
+            if self._claimed_by is job:
+                self._claimed_by = None
+
+    def confirm(self, job):
+        with self._lock:
+            self.booked_by = job
+            self._claimed_by = None
+            siblings = [other for other in self.jobs if other is not job]
+        print(f"Booking confirmed by {job.name}; cancelling {len(siblings)} other job(s) for {self.username}.")
+        for other in siblings:
+            other.cancel(f"booked by {job.name}")
+
+    def cancel_all(self, reason):
+        with self._lock:
+            jobs = list(self.jobs)
+        for job in jobs:
+            job.cancel(reason)
@@ -0,0 +1,51 @@
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+
+# Async script that resolves the moment an element matching the query exists (and, if asked,
+# is visible and enabled), using a MutationObserver instead of fixed-interval polling.
+# arguments: kind ('css' or 'xpath'), query, timeout in ms, require visible+enabled, callback.
+WAIT_FOR_ELEMENT_JS = """
+var kind = arguments[0], query = arguments[1], timeoutMs = arguments[2], ready = arguments[3];
+var done = arguments[arguments.length - 1];
+var find = function () {
+    var el = kind === 'xpath'
+        ? document.evaluate(query, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(query);
+    if (el && ready && (el.disabled || !el.getClientRects().length)) { return null; }
+    return el;
+};
+var found = find();
+if (found) { done(found); return; }
+var observer, timer;
+var finish = function (el) { observer.disconnect(); clearTimeout(timer); done(el); };
+observer = new MutationObserver(function () { var el = find(); if (el) { finish(el); } });
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+
+def wait_for(driver, query, timeout, kind="css", ready=False):
+    """Return the first element matching `query` as soon as it appears, or raise TimeoutException.
+
+    If a navigation replaces the document while waiting (e.g. after clicking a
+    form button), the observer is re-armed on the new document until the
+    overall timeout runs out.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {query}")
+        driver.set_script_timeout(remaining + 1)
+        try:
+            element = driver.execute_async_script(WAIT_FOR_ELEMENT_JS, kind, query, int(remaining * 1000), ready)
+        except (JavascriptException, TimeoutException):
+            # Document unloaded mid-wait; try again on the page that replaced it
+            continue
+        except WebDriverException as e:
+            if "unload" not in str(e).lower():
+                raise
+            continue
+        if element is None:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {query}")
+        return element
@@ -0,0 +1,241 @@
+import os
+import signal
+import threading
+import time
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Rough resident size of one headless Chromium/Firefox with images disabled
+BROWSER_BUDGET_BYTES = 350 * 1024 * 1024
+
+
+def available_memory():
+    """Bytes of RAM available for new browsers, or None if it can't be determined."""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_pool_size():
+    """Size the pool from free RAM (one browser budget each) and cores (two browsers per core)."""
+    cores = os.cpu_count() or 1
+    memory = available_memory()
+    by_memory = memory // BROWSER_BUDGET_BYTES if memory else cores * 2
+    return max(1, min(by_memory, cores * 2))
+
+
+def process_tree_rss(pid):
+    """Resident bytes of `pid` and all its children (driver service plus browser processes), or None."""
+    if not PSUTIL_AVAILABLE or pid is None:
+        return None
+    try:
+        root = psutil.Process(pid)
+        return sum(process.memory_info().rss for process in [root] + root.children(recursive=True))
+    except psutil.Error:
+        return None
+
+
+def kill_process_tree(pid):
+    """Kill `pid` and all its children; without psutil only `pid` itself is signalled."""
+    if pid is None:
+        return
+    if PSUTIL_AVAILABLE:
+        try:
+            root = psutil.Process(pid)
+            processes = root.children(recursive=True) + [root]
+        except psutil.Error:
+            return
+        for process in processes:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+class PooledDriver:
+    def __init__(self, key, engine):
+        self.key = key
+        self.engine = engine
+        self.uses = 0
+        self.leased = False
+        self.returned_at = time.monotonic()
+
+
+class DriverPool:
+    """Long-lived, logged-in Selenium engines keyed by (account, browser), reused across runs and schedules.
+
+    lease() hands out an idle engine for the key after a health check, or
+    starts a new one; give_back() returns it for the next run. Engines are
+    recycled after max_uses leases or once their browser's process tree
+    exceeds max_rss_mb (needs psutil). The pool also tracks engines it does
+    not own (HTTP engines) so Stop can shut everything down in one place.
+    """
+
+    def __init__(self, max_size=None, max_uses=20, max_rss_mb=1024, lease_timeout=30):
+        self.max_size = max_size or default_pool_size()
+        self.max_uses = max_uses
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.lease_timeout = lease_timeout
+        self._entries = []
+        self._tracked = []
+        self._condition = threading.Condition()
+
+    def __iter__(self):
+        with self._condition:
+            return iter([entry.engine for entry in self._entries] + list(self._tracked))
+
+    def __len__(self):
+        with self._condition:
+            return len(self._entries) + len(self._tracked)
+
+    def pooled(self, engine):
+        """True for browsers the pool owns (leased or idle), as opposed to tracked engines."""
+        with self._condition:
+            return self._entry_for(engine) is not None
+
+    def track(self, engine):
+        """Register an engine the pool doesn't own so quit_all() reaches it."""
+        with self._condition:
+            self._tracked.append(engine)
+
+    def untrack(self, engine):
+        with self._condition:
+            if engine in self._tracked:
+                self._tracked.remove(engine)
+
+    def lease(self, account, browser_choice, headless=True, proxy=None, gpu_arg="--disable-gpu", starting=None):
+        """Return a started SeleniumEngine for (account, browser); check engine.logged_in_as before logging in.
+
+        Health checks, starts and quits make WebDriver calls, so they run with
+        the entry claimed but the pool's lock released. starting(engine), if
+        given, is called before each of them (see SupervisedDriver).
+        """
+        key = (account, browser_choice)
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            evicted = None
+            with self._condition:
+                idle = self._idle(key)
+                if idle:
+                    entry = idle[0]
+                    entry.leased = True
+                else:
+                    if len(self._entries) >= self.max_size:
+                        others = [entry for entry in self._entries if not entry.leased]
+                        if not others:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise RuntimeError(f"Driver pool exhausted: all {self.max_size} browsers are busy")
+                            self._condition.wait(remaining)
+                            continue
+                        # Its place goes straight to the new browser, so no waiter is woken
+                        evicted = min(others, key=lambda entry: entry.returned_at)
+                        self._entries.remove(evicted)
+                    # Imported here so HTTP-only processes never load Selenium
+                    from seleniumengine import SeleniumEngine
+                    entry = PooledDriver(key, SeleniumEngine(browser_choice, headless, proxy, gpu_arg))
+                    entry.leased = True
+                    self._entries.append(entry)
+            if evicted:
+                self._quit(evicted)
+            if entry.uses:
+                if starting:
+                    starting(entry.engine)
+                if self._usable(entry, headless, proxy):
+                    entry.uses += 1
+                    print(f"Reusing pooled {browser_choice} for {account} (use {entry.uses}/{self.max_uses})")
+                    return entry.engine
+                self._retire(entry)
+                continue
+            entry.uses = 1
+            if starting:
+                starting(entry.engine)
+            try:
+                entry.engine.start()
+            except Exception:
+                self._retire(entry)
+                raise
+            return entry.engine
+
+    def give_back(self, engine):
+        """Return a leased engine; dead or worn-out engines are quit instead of kept."""
+        with self._condition:
+            entry = self._entry_for(engine)
+            if entry is None:
+                return
+            entry.leased = False
+            entry.returned_at = time.monotonic()
+            worn_out = entry.uses >= self.max_uses or not engine.driver
+            if not worn_out:
+                self._condition.notify()
+        if worn_out:
+            self._retire(entry)
+
+    def discard(self, engine):
+        with self._condition:
+            entry = self._entry_for(engine)
+        if entry:
+            self._retire(entry)
+
+    def quit_all(self):
+        with self._condition:
+            engines = [entry.engine for entry in self._entries] + self._tracked
+            self._entries = []
+            self._tracked = []
+            self._condition.notify_all()
+        for engine in engines:
+            try:
+                engine.quit()
+                print(f"Closed an active {engine.name} engine.")
+            except Exception as e:
+                print(f"Error closing driver: {e}")
+
+    def _idle(self, key):
+        return [entry for entry in self._entries if entry.key == key and not entry.leased]
+
+    def _entry_for(self, engine):
+        for entry in self._entries:
+            if entry.engine is engine:
+                return entry
+        return None
+
+    def _usable(self, entry, headless, proxy):
+        engine = entry.engine
+        if engine.headless != headless or engine.proxy != proxy:
+            return False
+        if entry.uses >= self.max_uses:
+            print(f"Recycling {engine.browser_choice} after {entry.uses} uses")
+            return False
+        rss = process_tree_rss(engine.service_pid())
+        if rss is not None and rss > self.max_rss_bytes:
+            print(f"Recycling {engine.browser_choice}: {rss // (1024 * 1024)} MB resident")
+            return False
+        if not engine.is_alive():
+            print(f"Pooled {engine.browser_choice} failed its health check")
+            return False
+        return True
+
+    def _retire(self, entry):
+        """Drop an entry from the pool, wake a waiting lease, and quit its browser outside the lock."""
+        with self._condition:
+            if entry in self._entries:
+                self._entries.remove(entry)
+            self._condition.notify()
+        self._quit(entry)
+
+    def _quit(self, entry):
+        try:
+            entry.engine.quit()
+        except Exception as e:
+            print(f"Error closing pooled driver: {e}")
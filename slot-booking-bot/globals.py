@@ -1,6 +1,9 @@
 
+from driverpool import DriverPool
+
 # Global variables shared across modules
 slot_list = []
 active_threads = []
-active_drivers = []
-scheduled_time = None
\ No newline at end of file
+# Registry of every live engine; logged-in browsers stay pooled between runs
+active_drivers = DriverPool()
+active_coordinators = []
\ No newline at end of file
@@ -1,27 +1,30 @@
 import time
 from datetime import datetime, timedelta
+from clocksync import server_clock
 
-def _generate_interval_start_times(overall_start_dt, overall_end_dt, interval_m, break_start_dt, break_end_dt):
-    """
-    Generates a list of start times at fixed intervals, skipping any time within a break.
-    This is for venues like 1611 where all granular 15-min slots are available.
-    """
-    times = []
-    current_time = overall_start_dt
-    
-    while current_time < overall_end_dt: 
-        is_during_break = False
-        if break_start_dt and break_end_dt:
-            if break_start_dt <= current_time < break_end_dt:
-                is_during_break = True
+def next_time_of_day(time_str, grace_seconds=0, now=None):
+    """Return the next datetime at 'HH:MM' (today, or tomorrow if more than grace_seconds past)."""
+    parsed = datetime.strptime(time_str, "%H:%M")
+    now = now or datetime.now()
+    target = now.replace(hour=parsed.hour, minute=parsed.minute, second=0, microsecond=0)
+    if target < now - timedelta(seconds=grace_seconds):
+        target += timedelta(days=1)
+    return target
 
-        if not is_during_break:
-            formatted_time = current_time.strftime("%I:%M %p").lstrip('0').replace(' 0', ' ').replace(':00 ', ':00').replace('AM',' AM').replace('PM',' PM')
-            times.append(formatted_time)
-        
-        current_time += timedelta(minutes=interval_m)
+def next_server_time(time_str, grace_seconds=0):
+    """next_time_of_day on the LMS server's clock, converted to the matching local datetime."""
+    return server_clock.to_local(next_time_of_day(time_str, grace_seconds, server_clock.now()))
 
-        if break_start_dt and break_end_dt and break_start_dt <= current_time < break_end_dt:
-            current_time = break_end_dt
-            
-    return times
\ No newline at end of file
+def check_until_deadline(check_until_time):
+    """Turn an 'HH:MM' check-until time (LMS clock) into the local datetime of its next occurrence."""
+    return next_server_time(check_until_time)
+
+def wait_until(target, cancelled=None, step=0.5):
+    """Sleep until the datetime `target`; returns False early if cancelled() becomes true."""
+    while True:
+        if cancelled and cancelled():
+            return False
+        remaining = (target - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return True
+        time.sleep(min(remaining, step))
@@ -0,0 +1,181 @@
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+import time
+from urllib.parse import urljoin
+from moodle import (
+    COURSE_URL, BOOKING_NOTE, PageState,
+    is_login_page, page_status, find_sesskey, login_form, booking_form, form_request, booking_confirmed
+)
+from slotparser import parse_slot_table
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+class MoodleHttp:
+    """Moodle login, polling and booking over HTTP, shared by HttpEngine and AsyncHttpEngine.
+
+    Each operation is written once as a flow: a generator that yields
+    (method, url, request kwargs) and is sent back the httpx response, or
+    has the httpx.HTTPError thrown into it. The engines only differ in how
+    they run a flow: HttpEngine with a blocking client, AsyncHttpEngine by
+    awaiting an AsyncClient. Both clients share the same cookie API, so
+    session hand-over lives here too. clicked_at is the time.monotonic()
+    at which the last booking POST was sent.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.sesskey = None
+        self.page_url = None
+        self.logged_in_as = None
+        self.session_generation = None
+        self.error = None
+        self.clicked_at = None
+
+    def adopt_session(self, cookies, username=None, user_agent=None):
+        """Load exported cookies (driver.get_cookies() or export_cookies()) so this client shares that Moodle session."""
+        for cookie in cookies:
+            self.client.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        if user_agent:
+            self.client.headers["User-Agent"] = user_agent
+        self.logged_in_as = username
+
+    def export_cookies(self):
+        return [{"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path} for cookie in self.client.cookies.jar]
+
+    def _login_flow(self, username, password):
+        try:
+            response = yield "GET", COURSE_URL, {}
+            if self._login_server_error(response):
+                return False
+            if not is_login_page(response.text, str(response.url)):
+                # Cookie jar is already authenticated
+                self.sesskey = find_sesskey(response.text)
+                self.logged_in_as = username
+                return True
+            action, fields = login_form(response.text, str(response.url))
+            if action is None:
+                self.error = "Login failed: Fields not found."
+                return False
+            fields = [(name, value) for name, value in fields if name not in ("username", "password")]
+            fields += [("username", username), ("password", password)]
+            response = yield "POST", action, form_request(fields)
+        except httpx.HTTPError as e:
+            self.error = f"Login failed: {type(e).__name__}: {e}"
+            return False
+        if self._login_server_error(response):
+            return False
+        if is_login_page(response.text, str(response.url)):
+            self.error = "Login failed: Invalid username or password."
+            return False
+        self.sesskey = find_sesskey(response.text)
+        self.logged_in_as = username
+        print(f"Logged in. Current URL: {response.url}")
+        return True
+
+    def _login_server_error(self, response):
+        # An error page is neither the login form nor proof of a session
+        if response.status_code < 500 and page_status(response.text, str(response.url)) != PageState.SERVER_ERROR:
+            return False
+        self.error = f"Login failed: the LMS returned a server error (HTTP {response.status_code})."
+        return True
+
+    def _fetch_flow(self, scheduler_url):
+        try:
+            response = yield "GET", scheduler_url, {}
+        except httpx.HTTPError as e:
+            print(f"HTTP error fetching scheduler: {e}")
+            return PageState.SERVER_ERROR, [], []
+        html = response.text
+        self.page_url = str(response.url)
+        state = PageState.SERVER_ERROR if response.status_code >= 500 else page_status(html, self.page_url)
+        if state != PageState.TABLE_READY:
+            return state, [], []
+        self.sesskey = find_sesskey(html) or self.sesskey
+        rows = parse_slot_table(html)
+        # The handle is the page a row came from, so rows from several venues can be booked after one round of fetches
+        return state, rows, [self.page_url] * len(rows)
+
+    def _book_flow(self, row, page_url, note):
+        params = list(row.params)
+        if self.sesskey and not any(name == "sesskey" for name, _ in params):
+            params.append(("sesskey", self.sesskey))
+        try:
+            print("Booking slot...")
+            self.clicked_at = time.monotonic()
+            response = yield "POST", urljoin(page_url or self.page_url, row.action), form_request(params)
+            action, fields = booking_form(response.text, str(response.url), note)
+            if action is None:
+                print("No form found, assuming success.")
+                return True, False
+            response = yield "POST", action, form_request(fields)
+        except httpx.HTTPError as e:
+            print(f"HTTP error while booking: {e}")
+            return False, False
+        if booking_confirmed(response.text, row):
+            print("Booking confirmed.")
+            return True, True
+        print("Booking form submitted but not confirmed.")
+        return False, False
+
+
+class HttpEngine(MoodleHttp):
+    """Booking engine that talks to Moodle over plain HTTP with one keep-alive client.
+
+    Rows come from slotparser.parse_slot_table, so each row already carries
+    its booking form's action and hidden params; each handle is the URL of
+    the page its row was parsed from.
+    """
+
+    name = "HTTP"
+
+    def __init__(self, proxy=None, timeout=10.0):
+        super().__init__()
+        self.proxy = proxy
+        self.timeout = timeout
+
+    def start(self):
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not installed. Run: pip install httpx")
+        self.client = httpx.Client(
+            proxy=self.proxy,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
+        print("Running in HTTP mode (no browser)")
+
+    def _run(self, flow):
+        """Drive a MoodleHttp flow with the blocking client and return its result."""
+        try:
+            request = next(flow)
+            while True:
+                method, url, kwargs = request
+                try:
+                    response = self.client.request(method, url, **kwargs)
+                except httpx.HTTPError as e:
+                    request = flow.throw(e)
+                else:
+                    request = flow.send(response)
+        except StopIteration as done:
+            return done.value
+
+    def login(self, username, password):
+        return self._run(self._login_flow(username, password))
+
+    def fetch(self, scheduler_url):
+        """GET the scheduler page and return (PageState, rows, handles), matching SeleniumEngine.fetch."""
+        return self._run(self._fetch_flow(scheduler_url))
+
+    def book(self, row, handle, slot, note=BOOKING_NOTE):
+        """Submit the row's Book slot form and, if Moodle asks for one, the student note form; returns (booked, verified)."""
+        return self._run(self._book_flow(row, handle, note))
+
+    def quit(self):
+        if self.client:
+            client, self.client = self.client, None
+            client.close()
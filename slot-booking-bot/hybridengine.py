@@ -0,0 +1,83 @@
+from slotparser import ButtonState
+
+
+class HybridEngine:
+    """Logs in with a Selenium browser, then polls over HTTP using the browser's session cookies.
+
+    When the account already has a shared session (sessionbroker), no browser
+    is started at all.
+
+    By default the browser is closed once its cookies are handed over. With
+    park_browser=True it stays open but idle, and is only used again if the
+    HTTP booking submit fails.
+    """
+
+    name = "Hybrid"
+
+    def __init__(self, browser, http, park_browser=False):
+        self.browser = browser
+        self.http = http
+        self.park_browser = park_browser
+        self.error = None
+
+    @property
+    def logged_in_as(self):
+        return self.http.logged_in_as
+
+    @property
+    def clicked_at(self):
+        # The HTTP POST is the first attempt; a parked-browser retry comes after it
+        return self.http.clicked_at
+
+    def start(self):
+        # The browser is only started if this engine has to log in itself
+        self.http.start()
+
+    def login(self, username, password):
+        if not self.browser.driver:
+            self.browser.start()
+        if not self.browser.login(username, password):
+            self.error = self.browser.error
+            return False
+        driver = self.browser.driver
+        self.http.adopt_session(driver.get_cookies(), username, driver.execute_script("return navigator.userAgent"))
+        # Confirms the handed-over session (and picks up sesskey); falls back to an HTTP login if it was rejected
+        if not self.http.login(username, password):
+            self.error = self.http.error
+            return False
+        if self.park_browser:
+            print("Browser parked; polling over HTTP.")
+        else:
+            self.browser.quit()
+            print("Browser closed; polling over HTTP.")
+        return True
+
+    def export_cookies(self):
+        return self.http.export_cookies()
+
+    def adopt_session(self, cookies, username=None):
+        self.http.adopt_session(cookies, username)
+
+    def fetch(self, scheduler_url):
+        return self.http.fetch(scheduler_url)
+
+    def book(self, row, handle, slot):
+        booked, verified = self.http.book(row, handle, slot)
+        if booked or self.browser.driver is None:
+            return booked, verified
+        print("HTTP booking failed, retrying in the parked browser...")
+        state, rows, handles = self.browser.fetch(handle or self.http.page_url)
+        key = (row.date_ordinal, row.start, row.end)
+        for browser_row, browser_handle in zip(rows, handles):
+            if browser_row and browser_row.state == ButtonState.BOOKABLE and (browser_row.date_ordinal, browser_row.start, browser_row.end) == key:
+                return self.browser.book(browser_row, browser_handle, slot)
+        return False, False
+
+    def abort(self):
+        """Kill the browser (if one is running) and close the HTTP client; safe from any thread."""
+        self.browser.abort()
+        self.http.quit()
+
+    def quit(self):
+        self.http.quit()
+        self.browser.quit()
@@ -0,0 +1,178 @@
+import math
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class Timing:
+    """Count and total of one kind of duration, plus the most recent samples for percentiles and rate."""
+
+    def __init__(self, window, rate_window=20):
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+        self.samples = deque(maxlen=window)
+        self.stamps = deque(maxlen=rate_window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.samples.append(seconds)
+        self.stamps.append(time.monotonic())
+
+    def rate(self):
+        """Events per second over the last rate_window events, or None before there are two."""
+        if len(self.stamps) < 2 or self.stamps[-1] == self.stamps[0]:
+            return None
+        return (len(self.stamps) - 1) / (self.stamps[-1] - self.stamps[0])
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class Metrics:
+    """Thread-safe counters and timings for one booking job.
+
+    Engines and poll loops call incr() and observe() as things happen and
+    set_state() when the job moves on; snapshot() and summary() return
+    plain numbers for printing or display.
+    """
+
+    def __init__(self, name, window=512):
+        self.name = name
+        self.state = "starting"
+        self.started = time.monotonic()
+        self._window = window
+        self._counters = defaultdict(int)
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def set_state(self, state):
+        self.state = state
+
+    def incr(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def observe(self, key, seconds):
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = Timing(self._window)
+            timing.add(seconds)
+
+    def count(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def total(self, key):
+        """Seconds spent in `key` so far."""
+        with self._lock:
+            timing = self._timings.get(key)
+            return timing.total if timing else 0.0
+
+    def mean(self, key):
+        with self._lock:
+            timing = self._timings.get(key)
+            return timing.total / timing.count if timing else None
+
+    def percentile(self, key, q):
+        with self._lock:
+            timing = self._timings.get(key)
+            return timing.percentile(q) if timing else None
+
+    def summary(self):
+        """One dashboard row: state, attempts, polls/s, last fetch latency and detection-to-click p50/p95 (ms)."""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000)
+
+        with self._lock:
+            fetch = self._timings.get("fetch")
+            click = self._timings.get("detect_to_click")
+            rate = fetch.rate() if fetch else None
+            return {
+                "job": self.name,
+                "state": self.state,
+                "attempts": self._counters.get("polls", 0),
+                "polls_per_s": None if rate is None else round(rate, 1),
+                "last_fetch_ms": ms(fetch.last) if fetch else None,
+                "p50_ms": ms(click.percentile(50)) if click else None,
+                "p95_ms": ms(click.percentile(95)) if click else None,
+            }
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "uptime": time.monotonic() - self.started,
+                "counters": dict(self._counters),
+                "timings": {key: {"count": timing.count, "total": timing.total, "last": timing.last,
+                                  "p50": timing.percentile(50), "p95": timing.percentile(95)}
+                            for key, timing in self._timings.items()},
+            }
+
+
+class MetricsRegistry:
+    """Metrics for every job of the current process, by job name."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, name):
+        """Fresh Metrics for a job that is (re)starting under `name`."""
+        metrics = Metrics(name)
+        with self._lock:
+            self._jobs[name] = metrics
+        return metrics
+
+    def get(self, name):
+        with self._lock:
+            return self._jobs.get(name)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._jobs.values()))
+
+    def clear(self):
+        with self._lock:
+            self._jobs.clear()
+
+
+# (key in Metrics.summary(), column heading) for the Tk and Streamlit dashboards
+DASHBOARD_COLUMNS = (
+    ("job", "Job"),
+    ("state", "State"),
+    ("attempts", "Attempts"),
+    ("polls_per_s", "Polls/s"),
+    ("last_fetch_ms", "Last fetch (ms)"),
+    ("p50_ms", "Click p50 (ms)"),
+    ("p95_ms", "Click p95 (ms)"),
+)
+
+
+def job_report(metrics):
+    """Summary lines on session expiries, timeouts and engine restarts for a finished job (empty if none happened)."""
+    lines = []
+    relogins = metrics.count("relogins")
+    if relogins:
+        failed = metrics.count("relogin_failures")
+        suffix = f", {failed} failed" if failed else ""
+        lines.append(f"{metrics.name}: session expired {relogins} time(s){suffix}, {metrics.total('relogin'):.1f}s lost re-logging in")
+    timeouts = {key[:-len("_timeouts")]: n for key, n in metrics.snapshot()["counters"].items() if key.endswith("_timeouts")}
+    if timeouts:
+        lines.append(f"{metrics.name}: timed out in " + ", ".join(f"{op} x{n}" for op, n in sorted(timeouts.items())))
+    crashes = metrics.count("crashes")
+    if crashes:
+        recovered = metrics.count("recoveries")
+        mttr = f", mean time to recover {metrics.mean('recovery'):.1f}s" if recovered else ""
+        lines.append(f"{metrics.name}: engine died {crashes} time(s), recovered {recovered}{mttr}")
+    return lines
+
+
+job_metrics = MetricsRegistry()
@@ -0,0 +1,146 @@
+import re
+from enum import IntEnum
+from html import unescape
+from urllib.parse import urlencode, urljoin
+from slotparser import ButtonState, parse_slot_table
+
+# Saveetha LMS endpoints
+LMS_BASE_URL = "https://lms2.ai.saveetha.in/"
+COURSE_URL = "https://lms2.ai.saveetha.in/course/view.php?id=302"
+LOGIN_PATH = "/login/index.php"
+
+
+class PageState(IntEnum):
+    """What a loaded scheduler page shows, as classified by every engine's fetch()."""
+    TABLE_READY = 0
+    EMPTY = 1
+    SERVER_ERROR = 2
+    LOGIN_REQUIRED = 3
+    HAS_BOOKING = 4
+    FROZEN = 5
+
+
+SERVER_ERROR_MARKERS = ("503 Service Unavailable", "Service Temporarily Unavailable", "ERR_CONNECTION_REFUSED")
+BOOKING_NOTE = "Booking for project work (automated)"
+
+_FORM_RE = re.compile(r"<form\b([^>]*)>(.*?)</form>", re.S | re.I)
+_INPUT_RE = re.compile(r"<input\b[^>]*>", re.I)
+_TEXTAREA_RE = re.compile(r"<textarea\b([^>]*)>(.*?)</textarea>", re.S | re.I)
+_ATTR_RE = re.compile(r"\b([a-z_-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')", re.I)
+_SESSKEY_RE = re.compile(r"\"sesskey\"\s*:\s*\"([^\"]+)\"|name=\"sesskey\"\s+value=\"([^\"]+)\"")
+_CANCEL_BUTTON_RE = re.compile(r"<button\b[^>]*>\s*Cancel booking|<input\b[^>]*value=\"Cancel booking\"", re.I)
+_FROZEN_RE = re.compile(r"<th\b[^>]*>[^<]*Other participants", re.I)
+_SLOT_TABLE_RE = re.compile(r"\bid\s*=\s*[\"']slotbookertable[\"']", re.I)
+# Moodle's notification boxes: <div class="alert alert-success" role="alert">...</div>
+_NOTICE_RE = re.compile(r"<div\b[^>]*\b(?:role\s*=\s*[\"']alert[\"']|class\s*=\s*[\"'](?:[^\"']*\s)?alert\b)[^>]*>(.*?)</div>", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+CONFIRMATION_WORDS = ("confirmed", "success")
+
+
+def _attrs(tag):
+    return {name.lower(): unescape(double or single) for name, double, single in _ATTR_RE.findall(tag)}
+
+
+def is_login_page(html, url=""):
+    return LOGIN_PATH in url or ('name="username"' in html and 'id="loginbtn"' in html)
+
+
+def page_status(html, url=""):
+    """Classify a fetched scheduler page the same way tablescript.CLASSIFY_PAGE_JS does in the browser."""
+    if any(marker in html for marker in SERVER_ERROR_MARKERS):
+        return PageState.SERVER_ERROR
+    if is_login_page(html, url):
+        return PageState.LOGIN_REQUIRED
+    if _CANCEL_BUTTON_RE.search(html):
+        return PageState.HAS_BOOKING
+    if _FROZEN_RE.search(html):
+        return PageState.FROZEN
+    if _SLOT_TABLE_RE.search(html):
+        return PageState.TABLE_READY
+    return PageState.EMPTY
+
+
+def find_sesskey(html):
+    match = _SESSKEY_RE.search(html)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+def find_form(html, marker, base_url=""):
+    """Return (action, fields) for the first form containing `marker`, or (None, []).
+
+    fields is a list of (name, value) pairs for every named input and
+    textarea, with unchecked checkboxes and radios left out, as a browser
+    would submit them.
+    """
+    for match in _FORM_RE.finditer(html):
+        form_attrs, body = match.group(1), match.group(2)
+        if marker not in match.group(0):
+            continue
+        action = urljoin(base_url, _attrs(form_attrs).get("action", base_url))
+        fields = []
+        for tag in _INPUT_RE.findall(body):
+            attrs = _attrs(tag)
+            kind = attrs.get("type", "text").lower()
+            if "name" not in attrs or kind in ("submit", "button", "image", "reset", "file"):
+                continue
+            if kind in ("checkbox", "radio") and "checked" not in tag.lower():
+                continue
+            fields.append((attrs["name"], attrs.get("value", "")))
+        for attrs_text, text in _TEXTAREA_RE.findall(body):
+            attrs = _attrs(attrs_text)
+            if "name" in attrs:
+                fields.append((attrs["name"], unescape(text)))
+        return action, fields
+    return None, []
+
+
+def form_request(fields):
+    """Keyword arguments for client.post() that send (name, value) pairs as a browser submits a form.
+
+    The pairs are URL-encoded in order, repeated names included; httpx's
+    data= only takes a mapping.
+    """
+    return {"content": urlencode(fields), "headers": {"Content-Type": "application/x-www-form-urlencoded"}}
+
+
+def login_form(html, base_url):
+    """Return (action, fields) for Moodle's login form, including its logintoken."""
+    action, fields = find_form(html, 'id="loginbtn"', base_url)
+    if action is None:
+        action, fields = find_form(html, 'name="logintoken"', base_url)
+    return action, fields
+
+
+def booking_form(html, base_url, note=BOOKING_NOTE):
+    """Return (action, fields) for the scheduler's booking form with the student note filled in."""
+    action, fields = find_form(html, 'id="id_submitbutton"', base_url)
+    if action is None:
+        return None, []
+    filled = []
+    for name, value in fields:
+        if name.endswith("[text]") or name == "studentnote":
+            value = note
+        filled.append((name, value))
+    filled.append(("submitbutton", "Book slot"))
+    return action, filled
+
+
+def notice_text(html):
+    """The visible text of the page's notification boxes, lowercased; markup, classes and scripts are left out."""
+    return " ".join(" ".join(unescape(_TAG_RE.sub(" ", body)).split()) for body in _NOTICE_RE.findall(html)).lower()
+
+
+def booking_confirmed(html, row):
+    """Whether the page returned by the booking submit shows `row` booked.
+
+    The row's own button decides when the row is on the page ("Cancel
+    booking" means booked, anything else means not). Otherwise only the text
+    of the notification boxes is checked, never the raw HTML, where class
+    names like alert-success and inline scripts would match.
+    """
+    key = (row.date_ordinal, row.start, row.end)
+    for shown in parse_slot_table(html):
+        if (shown.date_ordinal, shown.start, shown.end) == key:
+            return shown.state == ButtonState.BOOKED
+    notice = notice_text(html)
+    return any(word in notice for word in CONFIRMATION_WORDS)
@@ -0,0 +1,128 @@
+import bisect
+import threading
+import time
+from datetime import datetime
+from slotindex import build_slot_index
+from slotparser import ButtonState
+
+
+class SlotWatcher:
+    """A requested slot waiting for its row to become bookable on a venue page.
+
+    on_row(row, handle) is called with the matching SlotRow and the engine's
+    handle for it (a button element for Selenium). It returns True once the
+    watcher is done and should be dropped from the poller. Lower rank means
+    more preferred.
+    """
+
+    def __init__(self, key, label, on_row, rank=0):
+        self.key = key
+        self.label = label
+        self.on_row = on_row
+        self.rank = rank
+
+
+class VenuePoller:
+    """Fetches one venue's scheduler page per cycle and finds the best-ranked bookable slot on it.
+
+    Watchers are kept in preference order, so best_match() is one lookup
+    per watcher. run_round_robin() polls every venue before booking, so the
+    highest-ranked match across all of them gets the one booking.
+
+    fetch() returns (rows, handles) where rows are SlotRow records (or None
+    for unparseable rows) and handles is aligned with rows, or None when the
+    page should simply be retried on the next cycle.
+    """
+
+    def __init__(self, fetch, refresh_interval=0.5, deadline=None, on_attempt=None):
+        self.fetch = fetch
+        self.on_attempt = on_attempt
+        self.refresh_interval = refresh_interval
+        self.deadline = deadline
+        self.watchers = []
+        self.attempt = 0
+        self.stop_reason = None
+        self._stop_event = threading.Event()
+
+    def register(self, watcher):
+        ranks = [registered.rank for registered in self.watchers]
+        self.watchers.insert(bisect.bisect_right(ranks, watcher.rank), watcher)
+
+    def unregister(self, watcher):
+        if watcher in self.watchers:
+            self.watchers.remove(watcher)
+
+    def stop(self, reason):
+        self.stop_reason = reason
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def poll(self):
+        """Fetch the page once; returns (rows, handles), or None if the page was not usable this cycle."""
+        self.attempt += 1
+        if self.on_attempt:
+            self.on_attempt()
+        page = self.fetch()
+        if page is None or self.stopped:
+            return None
+        return page
+
+    def dispatch(self, watcher, row, handle):
+        """Hand the watcher its bookable row; returns True (and drops the watcher) once it is done."""
+        if watcher.on_row(row, handle):
+            self.unregister(watcher)
+            return True
+        return False
+
+    def best_match(self, rows):
+        """Return (watcher, position) for the highest-ranked watcher whose row is bookable, or None."""
+        index = build_slot_index(rows)
+        for watcher in self.watchers:
+            position = index.get(watcher.key)
+            if position is not None and rows[position].state == ButtonState.BOOKABLE:
+                return watcher, position
+        return None
+
+    def run(self, continuous=True):
+        """Poll until every watcher is done, the deadline passes or stop() is called."""
+        return run_round_robin([self], continuous, self.refresh_interval)[self]
+
+
+def run_round_robin(pollers, continuous=True, refresh_interval=0.5):
+    """Poll several venues from one thread until each is done or stopped.
+
+    Each cycle fetches every venue once, then offers the bookable matches to
+    their watchers in rank order across all venues, so a preferred slot on a
+    later venue wins over a lesser one on an earlier venue. A match that is
+    not booked (claimed elsewhere, submit failed) falls through to the next.
+    Returns {poller: remaining watchers}.
+    """
+    active = list(pollers)
+    while active:
+        cycle_start = time.monotonic()
+        found = []
+        for poller in active:
+            if poller.deadline and datetime.now() > poller.deadline:
+                poller.stop("deadline")
+                continue
+            page = None if poller.stopped else poller.poll()
+            if page is None:
+                continue
+            rows, handles = page
+            match = poller.best_match(rows)
+            if match:
+                watcher, position = match
+                found.append((watcher.rank, poller, watcher, rows[position], handles[position]))
+        for _, poller, watcher, row, handle in sorted(found, key=lambda item: item[0]):
+            if not poller.stopped and poller.dispatch(watcher, row, handle):
+                break
+        active = [poller for poller in active if poller.watchers and not poller.stopped]
+        if not continuous:
+            break
+        remaining = refresh_interval - (time.monotonic() - cycle_start)
+        if remaining > 0 and active:
+            active[0]._stop_event.wait(remaining)
+    return {poller: list(poller.watchers) for poller in pollers}
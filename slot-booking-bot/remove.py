@@ -7,4 +7,15 @@ def remove_slot():
     if selected:
         index = selected[0]
         listbox_slots.delete(index)
-        slot_list.pop(index)
\ No newline at end of file
+        slot_list.pop(index)
+
+def move_slot_up():
+    """Raise the selected slot one place; slot_list order is the booking preference order."""
+    selected = listbox_slots.curselection()
+    if selected and selected[0] > 0:
+        index = selected[0]
+        slot_list[index - 1], slot_list[index] = slot_list[index], slot_list[index - 1]
+        slot_str = listbox_slots.get(index)
+        listbox_slots.delete(index)
+        listbox_slots.insert(index - 1, slot_str)
+        listbox_slots.selection_set(index - 1)
@@ -1,41 +1,51 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-import threading
-import time
-import schedule
-from config import venue_details
-from components import root, entry_schedule_time, combo_schedule, entry_start_time, entry_end_time, combo_day, entry_date, status_label
-from gti import _generate_interval_start_times
+from tkinter import ttk
+from datetime import datetime
+from venues import load_venues
+from slotparser import parse_minutes, format_minutes
+from components import entry_schedule_time, entry_warmup, combo_schedule, entry_start_time, entry_end_time, combo_day, entry_date
+from gti import next_server_time
 from runbooking import run_booking
+from scheduler import booking_scheduler
+from clocksync import server_clock
+from statusbus import status_bus
 
 def schedule_booking():
-    global scheduled_time
     schedule_time = entry_schedule_time.get().strip()
     if not schedule_time:
-        root.after(0, lambda: messagebox.showerror("Error", "Schedule time cannot be empty."))
+        status_bus.notify("error", "Error", "Schedule time cannot be empty.")
         return
     try:
         datetime.strptime(schedule_time, "%H:%M")
-        schedule.clear()
-        scheduled_time = schedule_time
-        schedule.every().day.at(schedule_time).do(lambda: run_booking(continuous=True))
-        print(f"Scheduled booking daily at {schedule_time}")
-        root.after(0, lambda: messagebox.showinfo("Scheduled", f"Booking scheduled daily at {schedule.next_run().strftime('%Y-%m-%d %H:%M:%S')}."))
-        root.after(0, lambda: status_label.config(text=f"Status: Scheduled at {schedule_time}"))
-
-        def run_schedule():
-            while True:
-                now = datetime.now()
-                next_run = schedule.next_run()
-                if next_run:
-                    time_to_next = (next_run - now).total_seconds()
-                    print(f"Next scheduled run at {next_run.strftime('%H:%M:%S')} ({time_to_next:.0f} seconds from now)")
-                schedule.run_pending()
-                time.sleep(30)
-        threading.Thread(target=run_schedule, daemon=True).start()
+        warmup_seconds = int(entry_warmup.get().strip() or 0)
+        if warmup_seconds < 0:
+            raise ValueError("negative warm-up lead")
     except ValueError:
-        root.after(0, lambda: messagebox.showerror("Error", "Invalid time format. Use HH:MM (e.g., 21:03)."))
+        status_bus.notify("error", "Error", "Invalid time format. Use HH:MM (e.g., 21:03) and a whole number of warm-up seconds.")
+        return
+
+    # Slots open on the LMS clock; the scheduler picks up the measured offset on its next wake-up
+    server_clock.measure_in_background()
+    booking_scheduler.clear()
+
+    def fire():
+        if warmup_seconds:
+            run_booking(continuous=True, start_at=next_server_time(schedule_time, warmup_seconds))
+        else:
+            run_booking(continuous=True)
+        # After run_booking, which clears the status lines, so the report stays up for the run
+        status_bus.publish("Scheduler", job.skew_report())
+
+    if warmup_seconds:
+        # Start engines and log in ahead of time; polling itself starts at the scheduled minute
+        job = booking_scheduler.daily(schedule_time, fire, lead_seconds=warmup_seconds, name=f"warm-up for {schedule_time}")
+        print(f"Warm-up scheduled daily {warmup_seconds}s before {schedule_time}")
+    else:
+        job = booking_scheduler.daily(schedule_time, fire, name=f"booking at {schedule_time}")
+    next_run = booking_scheduler.next_run()
+    print(f"Scheduled booking daily at {schedule_time}; next run at {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+    status_bus.notify("info", "Scheduled", f"Booking scheduled daily at {next_run.strftime('%Y-%m-%d %H:%M:%S')}.")
+    status_bus.publish("", f"Status: Scheduled at {schedule_time}")
 
 def on_date_selected(event=None):
     date = entry_date.get()
@@ -47,57 +57,22 @@ def on_date_selected(event=None):
         combo_day.set("")
 
 def on_schedule_selected(event=None):
-    selected_venue_id = combo_schedule.get()
-    if selected_venue_id in venue_details:
-        config = venue_details[selected_venue_id]
-        
-        overall_start_dt = datetime.strptime(config["overall_start_time_str"], "%I:%M %p")
-        overall_end_dt = datetime.strptime(config["overall_end_time_str"], "%I:%M %p")
-        
-        break_start_dt = None
-        break_end_dt = None
-        if config["break_time_str"]:
-            break_start_dt = datetime.strptime(config["break_time_str"][0], "%I:%M %p")
-            break_end_dt = datetime.strptime(config["break_time_str"][1], "%I:%M %p")
-
-        start_time_options = []
-        if "fixed_start_times_str" in config:
-            start_time_options = config["fixed_start_times_str"]
-        elif "generate_all_intervals" in config and config["generate_all_intervals"]:
-            start_time_options = _generate_interval_start_times(
-                overall_start_dt, overall_end_dt, config["slot_duration_minutes"],
-                break_start_dt, break_end_dt
-            )
-        
-        entry_start_time['values'] = start_time_options
-        
-        if start_time_options:
-            entry_start_time.set(start_time_options[0])
-            on_start_time_selected()
-        else:
-            entry_start_time.set("")
-            entry_end_time.set("")
+    venue = load_venues().get(combo_schedule.get())
+    start_time_options = list(venue.labels) if venue else []
+    entry_start_time['values'] = start_time_options
+    if start_time_options:
+        entry_start_time.set(start_time_options[0])
+        on_start_time_selected()
     else:
-        entry_start_time['values'] = []
         entry_start_time.set("")
         entry_end_time.set("")
 
 def on_start_time_selected(event=None):
     selected_start_time_str = entry_start_time.get()
-    selected_venue_id = combo_schedule.get()
-
-    if selected_start_time_str and selected_venue_id in venue_details:
-        config = venue_details[selected_venue_id]
-        try:
-            start_dt_obj = datetime.strptime(selected_start_time_str.strip(), "%I:%M %p")
-            overall_end_dt = datetime.strptime(config["overall_end_time_str"], "%I:%M %p")
+    venue = load_venues().get(combo_schedule.get())
 
-            potential_end_dt_obj = start_dt_obj + timedelta(minutes=config["slot_duration_minutes"])
-            actual_end_dt_obj = min(potential_end_dt_obj, overall_end_dt)
-            
-            end_time_str = actual_end_dt_obj.strftime("%I:%M %p").lstrip('0').replace(' 0', ' ').replace(':00 ', ':00').replace('AM',' AM').replace('PM',' PM')
-            entry_end_time.set(end_time_str)
-        except ValueError:
-            entry_end_time.set("Invalid Time")
+    if selected_start_time_str and venue:
+        end = venue.end_for(parse_minutes(selected_start_time_str))
+        entry_end_time.set(format_minutes(end) if end is not None else "Invalid Time")
     else:
         entry_end_time.set("")
\ No newline at end of file
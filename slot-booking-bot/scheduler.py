@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from clocksync import server_clock
+
+DAY = timedelta(days=1)
+
+
+class ScheduledJob:
+    """A callback due at `next_run` (wall-clock datetime), repeating every `interval` if one is given."""
+
+    def __init__(self, callback, next_run, interval=None, name=None):
+        self.callback = callback
+        self.next_run = next_run
+        self.interval = interval
+        self.name = name or getattr(callback, "__name__", "job")
+        self.skews = []
+
+    def skew_report(self):
+        """One line on how far from next_run (on the scheduler's clock) each run actually fired."""
+        if not self.skews:
+            return f"{self.name}: not fired yet"
+        worst = max(self.skews, key=abs)
+        mean = sum(self.skews) / len(self.skews)
+        return f"{self.name}: {len(self.skews)} run(s), mean skew {mean * 1000:+.1f} ms, worst {worst * 1000:+.1f} ms"
+
+
+class Scheduler:
+    """Fires jobs within a few milliseconds of their target time.
+
+    The scheduler thread sleeps on a condition until spin_window seconds
+    before the earliest job, then busy-waits on time.monotonic() for the
+    last stretch. Long sleeps are capped at resync_interval so a wall-clock
+    change (NTP step, suspend) is noticed before the target. now() supplies
+    the reference wall clock, so a server-corrected clock can be plugged in.
+    Callbacks run on their own daemon threads and never delay other jobs.
+    """
+
+    def __init__(self, now=datetime.now, spin_window=0.02, resync_interval=30.0):
+        self.now = now
+        self.spin_window = spin_window
+        self.resync_interval = resync_interval
+        self.jobs = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def at(self, when, callback, interval=None, name=None):
+        """Run callback once at the datetime `when`, then every `interval` (a timedelta) if given."""
+        job = ScheduledJob(callback, when, interval, name)
+        with self._condition:
+            self.jobs.append(job)
+            self._condition.notify()
+        self._ensure_thread()
+        return job
+
+    def daily(self, time_str, callback, lead_seconds=0, name=None):
+        """Run callback every day at 'HH:MM' or 'HH:MM:SS', lead_seconds early."""
+        fmt = "%H:%M:%S" if time_str.count(":") == 2 else "%H:%M"
+        parsed = datetime.strptime(time_str, fmt)
+        now = self.now()
+        when = now.replace(hour=parsed.hour, minute=parsed.minute, second=parsed.second, microsecond=0) - timedelta(seconds=lead_seconds)
+        while when <= now:
+            when += DAY
+        return self.at(when, callback, DAY, name)
+
+    def cancel(self, job):
+        with self._condition:
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self._condition.notify()
+
+    def clear(self):
+        with self._condition:
+            self.jobs.clear()
+            self._condition.notify()
+
+    def next_run(self):
+        with self._condition:
+            return min((job.next_run for job in self.jobs), default=None)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self.jobs.clear()
+            self._condition.notify()
+
+    def _ensure_thread(self):
+        with self._condition:
+            self._stopped = False
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                if not self.jobs:
+                    self._condition.wait()
+                    continue
+                job = min(self.jobs, key=lambda scheduled: scheduled.next_run)
+                remaining = (job.next_run - self.now()).total_seconds()
+                if remaining > self.spin_window:
+                    # Woken early by new/cancelled jobs or to re-read the wall clock
+                    self._condition.wait(min(remaining - self.spin_window, self.resync_interval))
+                    continue
+            target = time.monotonic() + remaining
+            while time.monotonic() < target:
+                pass
+            with self._condition:
+                if job not in self.jobs:
+                    continue
+                self._fire(job)
+
+    def _fire(self, job):
+        # Called with the condition held
+        fired_at = self.now()
+        skew = (fired_at - job.next_run).total_seconds()
+        job.skews.append(skew)
+        print(f"Fired '{job.name}' at {fired_at.strftime('%H:%M:%S.%f')[:-3]} (target {job.next_run.strftime('%H:%M:%S.%f')[:-3]}, skew {skew * 1000:+.1f} ms)")
+        threading.Thread(target=job.callback, daemon=True).start()
+        if job.interval:
+            while job.next_run <= fired_at:
+                job.next_run += job.interval
+        else:
+            self.jobs.remove(job)
+
+
+# Fires on the LMS server clock once server_clock has been measured
+booking_scheduler = Scheduler(now=server_clock.now)
@@ -0,0 +1,226 @@
+import time
+from selenium import webdriver
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    NoSuchWindowException,
+    NoSuchElementException,
+    TimeoutException,
+    ElementClickInterceptedException,
+    WebDriverException
+)
+from moodle import LMS_BASE_URL, COURSE_URL, BOOKING_NOTE, PageState
+from slotparser import rows_from_payload
+from tablescript import classify_page
+from domready import wait_for
+from slottime import SlotKey
+
+
+SERVICES = {"Chrome": ChromeService, "Firefox": FirefoxService, "Edge": EdgeService}
+
+
+def create_driver(browser_choice, headless, proxy, gpu_arg="--disable-gpu", service=None):
+    """Build a Chrome, Firefox or Edge driver with the bot's speed-oriented options."""
+    if browser_choice == "Chrome":
+        options = ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        else:
+            options.add_argument("--start-maximized")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(gpu_arg)
+        options.add_argument("--window-size=1280,720")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--page-load-strategy=eager")
+        if proxy:
+            options.add_argument(f"--proxy-server={proxy}")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return webdriver.Chrome(options=options, service=service)
+    elif browser_choice == "Firefox":
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+        if proxy:
+            host, port = proxy.replace("http://", "").split(":")
+            options.set_preference("network.proxy.type", 1)
+            options.set_preference("network.proxy.http", host)
+            options.set_preference("network.proxy.http_port", int(port))
+        options.set_preference("permissions.default.image", 2)
+        options.set_preference("dom.ipc.processCount", 8)
+        return webdriver.Firefox(options=options, service=service)
+    elif browser_choice == "Edge":
+        options = EdgeOptions()
+        if headless:
+            options.add_argument("--headless")
+        else:
+            options.add_argument("--start-maximized")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1280,720")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--page-load-strategy=eager")
+        if proxy:
+            options.add_argument(f"--proxy-server={proxy}")
+        return webdriver.Edge(options=options, service=service)
+    else:
+        raise ValueError("Unsupported browser")
+
+
+class SeleniumEngine:
+    """Booking engine that drives a real browser through Selenium."""
+
+    name = "Selenium"
+
+    def __init__(self, browser_choice, headless, proxy=None, gpu_arg="--disable-gpu"):
+        self.browser_choice = browser_choice
+        self.headless = headless
+        self.proxy = proxy
+        self.gpu_arg = gpu_arg
+        self.driver = None
+        self.service = None
+        self.logged_in_as = None
+        self.use_tabs = False
+        self.tabs = {}
+        self.error = None
+        # time.monotonic() when the last Book slot click was performed
+        self.clicked_at = None
+
+    def start(self):
+        # Kept before the driver exists, so abort() can also kill a browser that hangs while starting
+        service_class = SERVICES.get(self.browser_choice)
+        self.service = service_class() if service_class else None
+        self.driver = create_driver(self.browser_choice, self.headless, self.proxy, self.gpu_arg, self.service)
+        print(f"Running in {self.browser_choice} {'headless' if self.headless else 'visible'} mode")
+        self.driver.implicitly_wait(0.2)
+
+    def login(self, username, password):
+        driver = self.driver
+        driver.get(COURSE_URL)
+        try:
+            username_field = wait_for(driver, "input[name='username']", 5)
+            username_field.send_keys(username)
+            driver.find_element(By.NAME, 'password').send_keys(password)
+            driver.find_element(By.ID, 'loginbtn').click()
+            print(f"Logged in. Current URL: {driver.current_url}, Title: {driver.title}")
+            self.logged_in_as = username
+            return True
+        except TimeoutException as e:
+            print(f"Login timeout: {e}")
+            self.error = "Login failed: Fields not found."
+            return False
+
+    def export_cookies(self):
+        return self.driver.get_cookies()
+
+    def adopt_session(self, cookies, username=None):
+        """Replace this browser's LMS cookies with a shared session (the browser must be on the LMS domain to set them)."""
+        self.driver.get(LMS_BASE_URL)
+        self.driver.delete_all_cookies()
+        for cookie in cookies:
+            self.driver.add_cookie({"name": cookie["name"], "value": cookie["value"], "path": cookie.get("path", "/")})
+        self.logged_in_as = username
+
+    def fetch(self, scheduler_url):
+        """Load the scheduler page and return (PageState, rows, handles); handles are Book slot buttons.
+
+        The page is classified and the table read in one injected script, so
+        a normal poll has no fixed waits. A dead browser raises WebDriverException.
+        """
+        try:
+            if self.use_tabs:
+                self._show_tab(scheduler_url)
+            self.driver.get(scheduler_url)
+        except WebDriverException as e:
+            if "net::ERR_" in str(e):
+                print(f"Connection error loading scheduler: {e}")
+                return PageState.SERVER_ERROR, [], []
+            raise
+        state, rows, buttons = classify_page(self.driver)
+        print(f"Navigated to scheduler URL: {scheduler_url}, page state: {state.name}")
+        return state, rows_from_payload(rows), buttons
+
+    def _show_tab(self, scheduler_url):
+        """Switch to the tab that watches scheduler_url, opening it on first use (the first venue keeps the login tab)."""
+        handle = self.tabs.get(scheduler_url)
+        if handle is None:
+            if self.tabs:
+                self.driver.switch_to.new_window("tab")
+            handle = self.tabs[scheduler_url] = self.driver.current_window_handle
+            return
+        try:
+            self.driver.switch_to.window(handle)
+        except NoSuchWindowException:
+            del self.tabs[scheduler_url]
+            self._show_tab(scheduler_url)
+
+    def select_tab(self, scheduler_url):
+        """Bring back the tab already showing scheduler_url so the buttons fetched from it can be clicked."""
+        handle = self.tabs.get(scheduler_url)
+        if self.use_tabs and handle and handle != self.driver.current_window_handle:
+            self.driver.switch_to.window(handle)
+
+    def book(self, row, book_button, slot, note=BOOKING_NOTE):
+        """Click the row's Book slot button and submit the note form; returns (booked, verified)."""
+        if book_button is None:
+            print("Book slot button not found.")
+            return False, False
+        driver = self.driver
+        key = SlotKey.parse(slot["date"], slot["start_time"], slot["end_time"])
+        try:
+            print("Booking slot...")
+            ActionChains(driver).move_to_element(book_button).click().perform()
+            self.clicked_at = time.monotonic()
+            try:
+                note_field = wait_for(driver, "#id_studentnote_editoreditable", 3, ready=True)
+                note_field.send_keys(note)
+                submit_button = wait_for(driver, "#id_submitbutton", 1, ready=True)
+                submit_button.click()
+                try:
+                    wait_for(driver, "//*[contains(text(), 'confirmed') or contains(text(), 'success')]", 2, kind="xpath")
+                    print("Booking confirmed.")
+                except TimeoutException:
+                    print("No confirmation text, checking booked slot...")
+                    wait_for(driver, f"//tr[td[contains(text(), '{key.date_text()}')]][td[contains(text(), '{key.start}')]][td[contains(text(), '{key.end}')]]", 2, kind="xpath")
+                    print("Slot found in booked section.")
+                return True, True
+            except TimeoutException:
+                print("No form found, assuming success.")
+                return True, False
+        except (NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException) as e:
+            print(f"Button interaction error: {e}")
+            return False, False
+
+    def is_alive(self):
+        """Cheap health check: one WebDriver round trip that fails if the browser or session is gone."""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def service_pid(self):
+        """PID of the chromedriver/geckodriver/msedgedriver process; the browser runs as its child."""
+        try:
+            return self.service.process.pid
+        except AttributeError:
+            return None
+
+    def abort(self):
+        """Kill the driver service and its browser so a call blocked on them fails at once; safe from any thread."""
+        from driverpool import kill_process_tree
+        kill_process_tree(self.service_pid())
+
+    def quit(self):
+        if self.driver:
+            driver, self.driver = self.driver, None
+            driver.quit()
@@ -0,0 +1,106 @@
+import threading
+import weakref
+
+
+class AccountSession:
+    def __init__(self):
+        self.cookies = None
+        self.generation = 0
+        self.lock = threading.Lock()
+        # One asyncio.Lock per event loop, for engines whose login() is a coroutine
+        self.async_locks = weakref.WeakKeyDictionary()
+
+
+class SessionBroker:
+    """Logs each account in once and hands its Moodle session cookies to every engine.
+
+    The first engine to sign in for an account performs the real login while
+    the others wait, then export_cookies() from it is handed to the rest via
+    adopt_session() (add_cookie for Selenium, the cookie jar for HTTP). When
+    an engine finds itself on the login page it calls refresh(); only the
+    first caller per session generation logs in again, later callers just
+    adopt the new cookies. sign_in_async() does the same for asyncio engines.
+    """
+
+    def __init__(self):
+        self._accounts = {}
+        self._lock = threading.Lock()
+
+    def _account(self, username):
+        with self._lock:
+            account = self._accounts.get(username)
+            if account is None:
+                account = self._accounts[username] = AccountSession()
+            return account
+
+    def sign_in(self, engine, username, password):
+        """Give `engine` a session for `username`, logging in only if the account has none yet."""
+        return self._sign_in(engine, username, password, refresh=False)
+
+    def refresh(self, engine, username, password):
+        """Replace an expired session: log in again unless another engine already has since this one signed in."""
+        return self._sign_in(engine, username, password, refresh=True)
+
+    async def sign_in_async(self, engine, username, password, refresh=False):
+        """sign_in(), or refresh() with refresh=True, for an engine whose login() is a coroutine.
+
+        Tasks on one event loop wait for each other's login on an asyncio.Lock
+        instead of blocking the loop on the account's thread lock.
+        """
+        # Imported here so threaded and CLI runs never load asyncio
+        import asyncio
+        account = self._account(username)
+        loop = asyncio.get_running_loop()
+        lock = account.async_locks.get(loop)
+        if lock is None:
+            lock = account.async_locks[loop] = asyncio.Lock()
+        async with lock:
+            with account.lock:
+                session = self._shared_session(account, engine, username, refresh)
+            if session is None:
+                if not await engine.login(username, password):
+                    return False
+                with account.lock:
+                    self._store(account, engine)
+                return True
+        self._adopt(engine, username, *session)
+        return True
+
+    def forget(self, username):
+        with self._lock:
+            self._accounts.pop(username, None)
+
+    def _sign_in(self, engine, username, password, refresh):
+        account = self._account(username)
+        with account.lock:
+            session = self._shared_session(account, engine, username, refresh)
+            if session is None:
+                # Other engines for the account wait on the lock for this login
+                if not engine.login(username, password):
+                    return False
+                self._store(account, engine)
+                return True
+        self._adopt(engine, username, *session)
+        return True
+
+    def _shared_session(self, account, engine, username, refresh):
+        """Return (cookies, generation) for the engine to adopt, or None if it has to log in itself."""
+        if account.cookies is None:
+            return None
+        if refresh and account.generation == getattr(engine, "session_generation", None):
+            print(f"Session for {username} expired; logging in again")
+            return None
+        return account.cookies, account.generation
+
+    def _store(self, account, engine):
+        account.cookies = engine.export_cookies()
+        account.generation += 1
+        engine.session_generation = account.generation
+
+    def _adopt(self, engine, username, cookies, generation):
+        print(f"Reusing the shared session for {username}")
+        engine.adopt_session(cookies, username)
+        engine.session_generation = generation
+
+
+session_broker = SessionBroker()
@@ -1,282 +1,328 @@
-from selenium.webdriver.common.action_chains import ActionChains
-import tkinter as tk
-from tkinter import ttk, messagebox
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    StaleElementReferenceException,
-    NoSuchElementException,
-    TimeoutException,
-    ElementClickInterceptedException,
-    WebDriverException
-)
 import threading
 import re
 import time
 import os
 from datetime import datetime, timedelta
-import schedule
 from gpu import check_gpu_availability, SOUND_AVAILABLE
-from gti import _generate_interval_start_times
+from gti import check_until_deadline, wait_until
+from moodle import PageState
+from slotindex import slot_key
+from poller import SlotWatcher, VenuePoller, run_round_robin
 from globals import active_drivers
-from components import root, status_label
+from sessionbroker import session_broker
+from supervisor import SupervisedDriver
+from metrics import job_metrics, job_report
+from statusbus import status_bus
 try:
     from playsound import playsound
 except ImportError:
     playsound = None
 
-def slot_booking_process(username_input, password_input, day, date, start_time, end_time, scheduler_url, proxy, headless, browser_choice, root, continuous=False, check_until_time=None):
-    driver = None
+def create_engine(browser_choice, headless, proxy, gpu_arg="--disable-gpu", http_polling=False, park_browser=False):
+    """Return the booking engine for a job: "HTTP" needs no browser, anything else is a Selenium browser.
+
+    With http_polling the browser only logs in and its session is handed to an HTTP poller;
+    park_browser keeps it open afterwards for retrying a failed booking.
+    Engines are imported on first use so a headless HTTP run never loads Selenium.
+    """
+    from httpengine import HttpEngine
+    if browser_choice == "HTTP":
+        return HttpEngine(proxy)
+    from seleniumengine import SeleniumEngine
+    from hybridengine import HybridEngine
+    browser = SeleniumEngine(browser_choice, headless, proxy, gpu_arg)
+    if http_polling:
+        return HybridEngine(browser, HttpEngine(proxy), park_browser)
+    return browser
+
+def warm_up(engine, scheduler_url, start_at, job_name="", relogin=None):
+    """Poll once before T-0 so the session, connection and parser are hot; returns the lead in seconds, or None.
+
+    A session that expired since the engine signed in (cookies cached by the
+    session broker, or a pooled browser still marked as logged in from an
+    earlier run) is replaced with `relogin(started)` now instead of after T-0.
+    """
+    started = time.monotonic()
+    state, rows, handles = engine.fetch(scheduler_url)
+    # Twice: the first refresh may only adopt cookies another engine cached, which can be just as stale
+    for _ in range(2):
+        if state != PageState.LOGIN_REQUIRED or relogin is None:
+            break
+        print("Warm-up found the session expired. Logging in again before T-0...")
+        if not relogin(started):
+            break
+        state, rows, handles = engine.fetch(scheduler_url)
+    if state not in (PageState.TABLE_READY, PageState.EMPTY):
+        print(f"Warm-up poll returned {state.name}; the first valid poll will happen after T-0.")
+        return None
+    lead = (start_at - datetime.now()).total_seconds()
+    if lead >= 0:
+        print(f"Warm: first valid poll {lead:.2f}s before T-0 ({len(rows)} rows parsed)")
+    else:
+        print(f"Warm-up ran late: first valid poll {-lead:.2f}s after T-0. Increase the warm-up lead.")
+    status_bus.publish(job_name, f"Warm: ready {lead:.1f}s before {start_at.strftime('%H:%M:%S')}")
+    return lead
+
+def slot_booking_process(username_input, password_input, day, date, start_time, end_time, scheduler_url, proxy, headless, browser_choice, continuous=False, check_until_time=None):
+    slot = {"day": day, "date": date, "start_time": start_time, "end_time": end_time}
+    venue_booking_process(username_input, password_input, [slot], scheduler_url, proxy, headless, browser_choice, continuous, check_until_time)
+
+def venue_booking_process(username_input, password_input, slots, scheduler_url, proxy, headless, browser_choice, continuous=False, check_until_time=None, job=None, http_polling=False, start_at=None, park_browser=False):
+    """Watch every slot in `slots` on one venue with a single engine, fetching the scheduler page once per cycle."""
+    multi_venue_booking_process(username_input, password_input, [(scheduler_url, slots)], proxy, headless, browser_choice,
+                                continuous, check_until_time, job, http_polling, start_at, park_browser)
+
+def multi_venue_booking_process(username_input, password_input, venues, proxy, headless, browser_choice, continuous=False, check_until_time=None, job=None, http_polling=False, start_at=None, park_browser=False):
+    """Watch (scheduler_url, slots) pairs from one thread with a single engine, polling the venues round-robin.
+
+    With more than one venue a Selenium engine keeps one tab per scheduler
+    URL, so a single browser and login serve them all.
+    When `job` (from coordinator.BookingCoordinator) is given, bookings are
+    claimed through it and the job is torn down as soon as a sibling books.
+    When `start_at` (T-0) is given the call is a warm-up: the engine is started,
+    logged in and checked with one poll per venue, then polling starts at T-0.
+    """
+    engine = None
+    job_name = job.name if job else username_input
+    metrics = job_metrics.start(job_name)
+
+    def cancelled():
+        return job is not None and job.cancelled
+
     try:
         # Check GPU availability
         use_gpu, gpu_arg = check_gpu_availability()
-        root.after(0, lambda: status_label.config(text=f"Using {'GPU' if use_gpu else 'CPU'} | Initializing..."))
+        status_bus.publish(job_name, f"Using {'GPU' if use_gpu else 'CPU'} | Initializing...")
 
         # Validate proxy
         if proxy:
             if not re.match(r'^http://[a-zA-Z0-9.-]+:[0-9]+$', proxy):
                 print(f"Invalid proxy format: {proxy}")
-                root.after(0, lambda: messagebox.showerror("Error", f"Invalid proxy format: {proxy}. Use http://host:port"))
+                status_bus.notify("error", "Error", f"Invalid proxy format: {proxy}. Use http://host:port")
                 return
 
         # Parse deadline
         deadline = None
         if check_until_time and continuous:
             try:
-                deadline = datetime.strptime(check_until_time, "%H:%M")
-                deadline = datetime.now().replace(hour=deadline.hour, minute=deadline.minute, second=0, microsecond=0)
-                if deadline < datetime.now():
-                    deadline = deadline.replace(day=deadline.day + 1)
+                deadline = check_until_deadline(check_until_time)
                 print(f"Will check until {deadline.strftime('%H:%M:%S')}")
             except ValueError:
                 print(f"Invalid check until time format: {check_until_time}")
-                root.after(0, lambda: messagebox.showerror("Error", "Invalid time format. Use HH:MM (e.g., 21:30)."))
+                status_bus.notify("error", "Error", "Invalid time format. Use HH:MM (e.g., 21:30).")
                 return
 
-        # Browser setup
-        if browser_choice == "Chrome":
-            options = ChromeOptions()
-            if headless:
-                options.add_argument("--headless=new")
-            else:
-                options.add_argument("--start-maximized")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument(gpu_arg)
-            options.add_argument("--window-size=1280,720")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--blink-settings=imagesEnabled=false")
-            options.add_argument("--page-load-strategy=eager")
-            if proxy:
-                options.add_argument(f"--proxy-server={proxy}")
-            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
-            driver = webdriver.Chrome(options=options)
-        elif browser_choice == "Firefox":
-            options = FirefoxOptions()
-            if headless:
-                options.add_argument("--headless")
-            if proxy:
-                host, port = proxy.replace("http://", "").split(":")
-                options.set_preference("network.proxy.type", 1)
-                options.set_preference("network.proxy.http", host)
-                options.set_preference("network.proxy.http_port", int(port))
-            options.set_preference("permissions.default.image", 2)
-            options.set_preference("dom.ipc.processCount", 8)
-            driver = webdriver.Firefox(options=options)
-        elif browser_choice == "Edge":
-            options = EdgeOptions()
-            if headless:
-                options.add_argument("--headless")
+        # Engine setup: plain HTTP, or a Selenium browser (leased from the pool) as the fallback
+        def spawn(starting):
+            if browser_choice == "HTTP" or http_polling:
+                new_engine = create_engine(browser_choice, headless, proxy, gpu_arg, http_polling, park_browser)
+                active_drivers.track(new_engine)
+                starting(new_engine)
+                new_engine.start()
             else:
-                options.add_argument("--start-maximized")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1280,720")
-            options.add_argument("--blink-settings=imagesEnabled=false")
-            options.add_argument("--page-load-strategy=eager")
-            if proxy:
-                options.add_argument(f"--proxy-server={proxy}")
-            driver = webdriver.Edge(options=options)
-        else:
-            raise ValueError("Unsupported browser")
+                new_engine = active_drivers.lease(username_input, browser_choice, headless, proxy, gpu_arg, starting)
+                new_engine.use_tabs = len(venues) > 1
+            return new_engine
 
-        active_drivers.append(driver)
-        print(f"Running in {browser_choice} {'headless' if headless else 'visible'} mode")
-        driver.implicitly_wait(0.2)
+        def sign_in(new_engine):
+            return new_engine.logged_in_as == username_input or session_broker.sign_in(new_engine, username_input, password_input)
 
-        # Login
-        root.after(0, lambda: status_label.config(text="Logging in..."))
-        driver.get("https://lms2.ai.saveetha.in/course/view.php?id=302")
-        try:
-            username_field = WebDriverWait(driver, 5, poll_frequency=0.1).until(EC.presence_of_element_located((By.NAME, 'username')))
-            username_field.send_keys(username_input)
-            driver.find_element(By.NAME, 'password').send_keys(password_input)
-            driver.find_element(By.ID, 'loginbtn').click()
-            print(f"Logged in. Current URL: {driver.current_url}, Title: {driver.title}")
-        except TimeoutException as e:
-            print(f"Login timeout: {e}")
-            root.after(0, lambda: messagebox.showerror("Error", "❌ Login failed: Fields not found."))
-            return
+        # A crashed or hung browser is replaced and signed in again without losing the job's attempts or deadline
+        engine = SupervisedDriver(spawn, release_engine, sign_in, metrics)
+        engine.start()
+        if job:
+            job.attach_driver(engine)
 
-        # Parse date
-        try:
-            date_obj = datetime.strptime(date.strip(), "%d %m %Y")
-            formatted_date_for_comparison = date_obj.strftime("%A, %d %B %Y")
-        except ValueError:
-            print(f"Invalid date format: {date}")
-            root.after(0, lambda: messagebox.showerror("Error", f"❌ Invalid date format: {date}"))
-            return
+        # One login per account: the first engine logs in and the rest adopt its session,
+        # unless a pooled browser is still logged in from an earlier run
+        if engine.logged_in_as != username_input:
+            metrics.set_state("logging in")
+            status_bus.publish(job_name, "Logging in...")
+            if not engine.call("sign_in", sign_in):
+                status_bus.notify("error", "Error", f"❌ {engine.error}")
+                return
 
-        # Normalize time function
-        def normalize_time(time_str):
-            return re.sub(r'\s+', ' ', time_str.strip().lstrip('0').replace(':00 ', ':00').replace('AM', ' AM').replace('PM', ' PM')).replace("  ", " ")
+        def relogin(started):
+            """Replace an expired session through the broker; `started` is when the poll that found it began.
 
-        normalized_start_time = normalize_time(start_time)
-        normalized_end_time = normalize_time(end_time)
-        print(f"Looking for slot: {formatted_date_for_comparison}, {normalized_start_time}-{normalized_end_time}")
+            The "relogin" timing runs from there, so it includes the failed
+            fetch, as in the async runner. Returns whether the engine is signed in again.
+            """
+            status_bus.publish(job_name, "Session expired. Logging in again...")
+            metrics.set_state("re-login")
+            relogged = engine.call("sign_in", lambda current: session_broker.refresh(current, username_input, password_input))
+            metrics.incr("relogins")
+            metrics.observe("relogin", time.monotonic() - started)
+            if not relogged:
+                metrics.incr("relogin_failures")
+            return relogged
 
-        found_slot = False
-        attempt = 0
-        refresh_interval = 0.5
+        if start_at:
+            for scheduler_url, slots in venues:
+                metrics.set_state("warming up")
+                warm_up(engine, scheduler_url, start_at, job_name, relogin)
+            if not wait_until(start_at, cancelled):
+                return
 
-        while not found_slot:
-            attempt += 1
-            loop_start_time = time.time()
-            root.after(0, lambda: status_label.config(text=f"Attempt {attempt}: Checking slot..."))
+        refresh_interval = 0.5
+        pollers = []
 
-            if deadline and datetime.now() > deadline:
-                print(f"Deadline {deadline.strftime('%H:%M:%S')} reached.")
-                root.after(0, lambda: messagebox.showerror("Failure", f"❌ Slot not found for {day}, {date}, {start_time}-{end_time}."))
-                return
+        def stop_all(reason):
+            # Bookings, existing bookings, frozen slots and the session are all per account
+            for poller in pollers:
+                poller.stop(reason)
 
-            try:
-                driver.get(scheduler_url)
-                print(f"Navigated to scheduler URL: {scheduler_url}, Current URL: {driver.current_url}, Title: {driver.title}")
-                page_source = driver.page_source
-                if "503 Service Unavailable" in page_source or "Service Temporarily Unavailable" in page_source or "ERR_CONNECTION_REFUSED" in page_source:
-                    print(f"Detected 503/Connection error on attempt {attempt}. Retrying...")
-                    root.after(0, lambda: status_label.config(text=f"503 Error detected. Retrying... (Attempt {attempt})"))
-                    time.sleep(min(refresh_interval * (2 ** (attempt % 5)), 5))
-                    continue
+        def make_fetch(scheduler_url, poller):
+            def fetch():
+                started = time.monotonic()
+                state, rows, handles = engine.fetch(scheduler_url)
+                if state == PageState.LOGIN_REQUIRED and not cancelled():
+                    # Moodle redirected to its login page: sign in again and repeat the fetch in the same cycle
+                    print(f"Session expired on attempt {poller.attempt}. Logging in again...")
+                    if relogin(started):
+                        metrics.set_state("polling")
+                        state, rows, handles = engine.fetch(scheduler_url)
+                if state in (PageState.TABLE_READY, PageState.EMPTY):
+                    # EMPTY means no slots are published yet: keep polling
+                    return rows, handles
+                if cancelled():
+                    return None
+                if state == PageState.SERVER_ERROR:
+                    print(f"Detected 503/Connection error on attempt {poller.attempt}. Retrying...")
+                    status_bus.publish(job_name, f"503 Error detected. Retrying... (Attempt {poller.attempt})")
+                    time.sleep(min(refresh_interval * (2 ** (poller.attempt % 5)), 5))
+                    return None
+                if state == PageState.HAS_BOOKING:
+                    print("Existing booking found. Stopping process.")
+                    status_bus.notify("warning", "Booking Exists", "You already have an upcoming slot booked. Please cancel it to book a new slot.")
+                elif state == PageState.FROZEN:
+                    print("Frozen slot detected. Stopping process.")
+                    status_bus.notify("warning", "Slot Frozen", "Your slot is frozen. Please resolve this to book a new slot.")
+                elif state == PageState.LOGIN_REQUIRED:
+                    print("Session expired and logging in again failed. Stopping process.")
+                    status_bus.notify("error", "Error", f"❌ Session expired and re-login failed: {engine.error}")
+                stop_all(state)
+                return None
+            return fetch
 
-                WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table#slotbookertable, table.generaltable")))
-            except TimeoutException as e:
-                print(f"Timeout waiting for slot table: {e}")
-                root.after(0, lambda: messagebox.showerror("Error", f"❌ Timeout loading slot table: {str(e)}"))
-                return
-            except WebDriverException as e:
-                print(f"WebDriver error navigating to scheduler: {e}")
-                root.after(0, lambda: messagebox.showerror("Error", f"❌ WebDriver error: {str(e)}"))
-                return
+        def book(row, handle, slot, scheduler_url):
+            day, date, start_time, end_time = slot["day"], slot["date"], slot["start_time"], slot["end_time"]
+            metrics.set_state("booking")
+            if getattr(engine, "use_tabs", False):
+                # Every venue was fetched this cycle, so the browser is showing the last venue's tab
+                engine.select_tab(scheduler_url)
+            booked, verified = engine.book(row, handle, slot)
+            if not booked:
+                metrics.set_state("polling")
+                return False
+            metrics.incr("bookings")
+            if verified:
+                status_bus.notify("info", "Success", f"Slot booked: {day}, {date}, {start_time}-{end_time} ✅")
+                if SOUND_AVAILABLE and playsound:
+                    try:
+                        if os.path.exists('success.wav'):
+                            playsound('success.wav')
+                        else:
+                            print("Sound file 'success.wav' not found.")
+                    except Exception as se:
+                        print(f"Error playing sound: {se}")
+            else:
+                status_bus.notify("info", "Success", f"Slot booked: {day}, {date}, {start_time}-{end_time} ✅ (Verify manually)")
+            return True
 
-            try:
-                WebDriverWait(driver, 0.5).until(
-                    EC.presence_of_element_located((By.XPATH, "//button[contains(@class, 'btn') and contains(text(), 'Cancel booking')]"))
-                )
-                print("Existing booking found. Stopping process.")
-                root.after(0, lambda: messagebox.showwarning("Booking Exists", "You already have an upcoming slot booked. Please cancel it to book a new slot."))
-                return
-            except TimeoutException:
-                pass
+        def make_watcher(rank, slot, scheduler_url):
+            def on_row(row, handle):
+                print(f"Found bookable slot: {watcher.label} (preference {watcher.rank + 1})")
+                if job and not job.claim():
+                    print("Another job is booking for this account, skipping this cycle.")
+                    return False
+                booked = False
+                try:
+                    booked = book(row, handle, slot, scheduler_url)
+                finally:
+                    # Also when the engine raised, so sibling jobs are not locked out for good
+                    if job and not booked:
+                        job.release()
+                if not booked:
+                    return False
+                # Moodle allows one upcoming booking per student, so the other watchers are done too
+                stop_all("booked")
+                if job:
+                    job.confirm()
+                return True
+            watcher = SlotWatcher(slot_key(slot["date"], slot["start_time"], slot["end_time"]),
+                                  f"{slot['day']}, {slot['date']}, {slot['start_time']}-{slot['end_time']}", on_row,
+                                  slot.get("rank", rank))
+            return watcher
 
-            try:
-                WebDriverWait(driver, 0.5).until(
-                    EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'Other participants')]"))
-                )
-                print("Frozen slot detected. Stopping process.")
-                root.after(0, lambda: messagebox.showwarning("Slot Frozen", "Your slot is frozen. Please resolve this to book a new slot."))
-                return
-            except TimeoutException:
-                pass
+        def on_attempt():
+            attempts = sum(poller.attempt for poller in pollers)
+            watching = sum(len(poller.watchers) for poller in pollers)
+            status_bus.publish(job_name, f"Attempt {attempts}: Checking {watching} slot(s) on {len(pollers)} venue(s)...")
 
-            for _ in range(3):
+        for scheduler_url, slots in venues:
+            poller = VenuePoller(None, refresh_interval, deadline, on_attempt)
+            poller.fetch = make_fetch(scheduler_url, poller)
+            for rank, slot in enumerate(slots):
                 try:
-                    all_rows = WebDriverWait(driver, 1, poll_frequency=0.1).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table#slotbookertable tbody tr"))
-                    )
-                    current_date_in_table = ""
-                    for row in all_rows:
-                        cells = row.find_elements(By.TAG_NAME, 'td')
-                        if len(cells) < 8:
-                            continue
-                        date_cell_text = cells[0].text.strip()
-                        if date_cell_text:
-                            current_date_in_table = date_cell_text
-                        try:
-                            parsed_table_date = datetime.strptime(current_date_in_table, "%A, %d %B %Y")
-                        except ValueError:
-                            continue
-                        if parsed_table_date.date() == date_obj.date():
-                            table_start_time = normalize_time(cells[1].text.strip())
-                            table_end_time = normalize_time(cells[2].text.strip())
-                            if normalized_start_time == table_start_time and normalized_end_time == table_end_time:
-                                print(f"Found slot: {table_start_time}-{table_end_time}")
-                                try:
-                                    book_button = cells[7].find_element(By.XPATH, ".//button[contains(text(), 'Book slot')]")
-                                    if book_button.is_enabled():
-                                        print("Booking slot...")
-                                        ActionChains(driver).move_to_element(book_button).click().perform()
-                                        found_slot = True
-                                        try:
-                                            note_field = WebDriverWait(driver, 3, poll_frequency=0.1).until(EC.visibility_of_element_located((By.ID, "id_studentnote_editoreditable")))
-                                            note_field.send_keys("Booking for project work (automated)")
-                                            submit_button = WebDriverWait(driver, 1, poll_frequency=0.1).until(EC.element_to_be_clickable((By.ID, "id_submitbutton")))
-                                            submit_button.click()
-                                            try:
-                                                WebDriverWait(driver, 2, poll_frequency=0.1).until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'confirmed') or contains(text(), 'success')]")))
-                                                print("Booking confirmed.")
-                                            except TimeoutException:
-                                                print("No confirmation text, checking booked slot...")
-                                                WebDriverWait(driver, 2, poll_frequency=0.1).until(EC.presence_of_element_located((By.XPATH, f"//tr[td[contains(text(), '{formatted_date_for_comparison}')]][td[contains(text(), '{start_time}')]][td[contains(text(), '{end_time}')]]")))
-                                                print("Slot found in booked section.")
-                                            root.after(0, lambda: messagebox.showinfo("Success", f"Slot booked: {day}, {date}, {start_time}-{end_time} ✅"))
-                                            if SOUND_AVAILABLE and playsound:
-                                                try:
-                                                    if os.path.exists('success.wav'):
-                                                        playsound('success.wav')
-                                                    else:
-                                                        print("Sound file 'success.wav' not found.")
-                                                except Exception as se:
-                                                    print(f"Error playing sound: {se}")
-                                            return
-                                        except TimeoutException:
-                                            print("No form found, assuming success.")
-                                            root.after(0, lambda: messagebox.showinfo("Success", f"Slot booked: {day}, {date}, {start_time}-{end_time} ✅ (Verify manually)"))
-                                            return
-                                    else:
-                                        print("Book slot button disabled.")
-                                        break
-                                except (NoSuchElementException, ElementClickInterceptedException) as e:
-                                    print(f"Button interaction error: {e}")
-                                    break
-                    break
-                except StaleElementReferenceException:
-                    print("Stale element detected, retrying...")
-                    time.sleep(0.1)
-                    continue
-                except Exception as e:
-                    print(f"Row processing error: {e}")
-                    continue
+                    poller.register(make_watcher(rank, slot, scheduler_url))
+                except ValueError:
+                    print(f"Invalid slot: {slot}")
+                    status_bus.notify("error", "Error", f"❌ Invalid date or time: {slot['date']}, {slot['start_time']}-{slot['end_time']}")
+            if poller.watchers:
+                pollers.append(poller)
+        if not pollers:
+            return
+        if job:
+            job.on_cancel(lambda reason: stop_all("cancelled"))
+        for poller in pollers:
+            for watcher in poller.watchers:
+                print(f"Looking for slot: {watcher.label}")
 
-            if not continuous:
-                print("Slot not found in single attempt.")
-                root.after(0, lambda: messagebox.showerror("Failure", f"❌ Slot not found for {day}, {date}, {start_time}-{end_time}."))
-                return
-            time.sleep(refresh_interval)
+        metrics.set_state("polling")
+        remaining = run_round_robin(pollers, continuous, refresh_interval)
+        for poller in pollers:
+            if poller.stop_reason == "deadline":
+                print(f"Deadline {deadline.strftime('%H:%M:%S')} reached.")
+            if poller.stop_reason in (None, "deadline"):
+                for watcher in remaining[poller]:
+                    if not continuous:
+                        print("Slot not found in single attempt.")
+                    status_bus.notify("error", "Failure", f"❌ Slot not found for {watcher.label}.")
+        outcomes = sorted({getattr(poller.stop_reason, "name", poller.stop_reason or "not found").lower() for poller in pollers})
+        metrics.set_state(", ".join(outcomes))
+        status_bus.publish(job_name, f"Finished after {sum(poller.attempt for poller in pollers)} attempt(s): {', '.join(outcomes)}")
 
     except Exception as e:
+        if cancelled():
+            print(f"Job stopped: {job.cancel_reason}")
+            metrics.set_state("cancelled")
+            return
+        metrics.set_state("error")
         print(f"Unexpected error: {type(e).__name__}: {str(e)}")
-        root.after(0, lambda: messagebox.showerror("Error", f"❌ {type(e).__name__}: {str(e)}"))
+        status_bus.notify("error", "Error", f"❌ {type(e).__name__}: {str(e)}")
     finally:
-        if driver:
-            print("Closing browser")
-            if driver in active_drivers:
-                active_drivers.remove(driver)
-            try:
-                driver.quit()
-            except Exception as e:
-                print(f"Error closing driver: {e}")
\ No newline at end of file
+        if job:
+            job.finish()
+        for line in job_report(metrics):
+            print(line)
+        if engine is not None and engine.engine is not None:
+            release_engine(engine.engine, keep=True)
+
+def release_engine(engine, keep=False):
+    """Hand a job's engine back: pooled browsers return to the pool (or are discarded), other engines are closed."""
+    if engine not in active_drivers:
+        return
+    if active_drivers.pooled(engine):
+        if keep:
+            print("Returning browser to the pool")
+            active_drivers.give_back(engine)
+        else:
+            active_drivers.discard(engine)
+    else:
+        print(f"Closing {engine.name} engine")
+        active_drivers.untrack(engine)
+        try:
+            engine.quit()
+        except Exception as e:
+            print(f"Error closing driver: {e}")
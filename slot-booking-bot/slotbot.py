@@ -0,0 +1,303 @@
+"""Run booking jobs without the GUI: python -m slotbot run --config jobs.yaml
+
+Nothing imported here touches tkinter, so the bot runs on a display-less
+server and reaches its first engine start in tens of milliseconds. Engines
+(Selenium, httpx) are imported only when a job creates one. The same
+functions are the library API: start_booking() is what the GUI's Book
+button calls, and load_config()/run_jobs() are what the CLI calls.
+
+A config is YAML (needs PyYAML) or JSON:
+
+    browser: HTTP            # Chrome, Firefox, Edge, HTTP or "HTTP (async)"
+    headless: true
+    http_polling: false      # browsers log in, HTTP polls
+    park_browser: false      # with http_polling: keep the browser to retry a failed HTTP booking
+    parallel_venues: false   # one engine per venue instead of one per account (preference only within a venue)
+    continuous: true
+    check_until: "21:30"     # LMS clock
+    schedule: "21:00"        # optional: run daily at this LMS time instead of now
+    warmup: 60               # seconds to start engines and log in before schedule
+    proxies: []
+    accounts:
+      - username: 22BCE1234
+        password_env: SLOTBOT_PASSWORD   # or password: ...
+        slots:                           # in order of preference
+          - {venue: "1731", date: "16 06 2025", start: "8:00 AM"}
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Cold start is reported relative to this, the first thing the entry point runs
+LAUNCHED = time.perf_counter()
+
+from globals import active_threads, active_coordinators
+from slot_booking import venue_booking_process, multi_venue_booking_process
+from coordinator import BookingCoordinator
+from gti import check_until_deadline, next_server_time
+from venues import load_venues
+from slottime import SlotKey, SlotTime, parse_slot_date
+from scheduler import booking_scheduler
+from clocksync import server_clock
+from statusbus import status_bus
+from stop import shut_down
+from metrics import job_metrics, DASHBOARD_COLUMNS
+
+BROWSERS = ("Chrome", "Firefox", "Edge", "HTTP", "HTTP (async)")
+# Seconds between console status frames
+CONSOLE_FRAME_S = 1.0
+
+# Thread lock for safety
+thread_lock = threading.Lock()
+
+
+def start_booking(username, password, slots, default_venue=None, browser_choice="HTTP", headless=True, http_polling=False,
+                  parallel_venues=False, proxies=(), continuous=True, check_until_time=None, start_at=None, park_browser=False):
+    """Start booking `slots` (slot dicts, in preference order) for one account; returns the started threads.
+
+    Each slot's "venue_id" picks its scheduler, falling back to default_venue.
+    All venues are polled round-robin by one engine (a tab per venue for a
+    browser), so the most preferred bookable slot across every venue wins.
+    parallel_venues instead gives each venue its own engine and thread,
+    which then race for the account's one booking.
+    With http_polling, park_browser keeps each browser open after login so a
+    failed HTTP booking submit is retried in it.
+    Threads and coordinators are registered in globals so stop.shut_down()
+    reaches them; problems are reported on status_bus.
+    """
+    urls = {venue_id: venue.scheduler_url for venue_id, venue in load_venues().items()}
+    # Every slot on the same scheduler page shares its poller; slots order is the preference order across all venues
+    slots_by_venue = {}
+    for rank, slot in enumerate(slots):
+        venue_id = slot.get("venue_id") if slot.get("venue_id") in urls else default_venue
+        if venue_id not in urls:
+            status_bus.notify("error", "Error", f"Unknown venue for slot {slot.get('date')} {slot.get('start_time')}.")
+            return []
+        slots_by_venue.setdefault(venue_id, []).append(dict(slot, rank=rank))
+
+    if browser_choice == "HTTP (async)":
+        return start_async_booking(username, password, slots_by_venue, urls, proxies, continuous, check_until_time, start_at, parallel_venues)
+
+    # All venue jobs for this account are cancelled as soon as one of them books
+    coordinator = BookingCoordinator(username)
+    with thread_lock:
+        active_coordinators.append(coordinator)
+
+    print(f"Starting booking process at {datetime.now().strftime('%H:%M:%S')}...")
+    threads = []
+    if not parallel_venues:
+        # One engine and login, polled round-robin from one thread
+        job = coordinator.add_job(f"{username} @ all venues")
+        venues = [(urls[venue_id], list(venue_slots)) for venue_id, venue_slots in slots_by_venue.items()]
+        threads.append(threading.Thread(target=multi_venue_booking_process, args=(
+            username, password, venues, proxies[0] if proxies else None, headless, browser_choice, continuous, check_until_time, job,
+            http_polling, start_at, park_browser
+        )))
+    else:
+        for i, (venue_id, venue_slots) in enumerate(slots_by_venue.items()):
+            proxy = proxies[i % len(proxies)] if proxies else None
+            job = coordinator.add_job(f"{username} @ {urls[venue_id]}")
+            threads.append(threading.Thread(target=venue_booking_process, args=(
+                username, password, list(venue_slots), urls[venue_id], proxy, headless, browser_choice, continuous, check_until_time, job, http_polling, start_at, park_browser
+            )))
+    for thread in threads:
+        with thread_lock:
+            active_threads.append(thread)
+        thread.start()
+    return threads
+
+
+def start_async_booking(username, password, slots_by_venue, urls, proxies, continuous, check_until_time, start_at, parallel_venues=False):
+    """Run the account's booking on one asyncio event loop: one task for all venues, or one per venue with parallel_venues."""
+    # Imported here so threaded runs never load httpx's async stack
+    from asyncrunner import AsyncBookingRunner
+
+    deadline = None
+    if check_until_time and continuous:
+        try:
+            deadline = check_until_deadline(check_until_time)
+        except ValueError:
+            status_bus.notify("error", "Error", "Invalid time format. Use HH:MM (e.g., 21:30).")
+            return []
+
+    runner = AsyncBookingRunner(notify=status_bus.notify, on_status=status_bus.publish)
+    venues = [(urls[venue_id], list(slots)) for venue_id, slots in slots_by_venue.items()]
+    if parallel_venues:
+        for i, venue in enumerate(venues):
+            runner.add_job(username, password, [venue], proxies[i % len(proxies)] if proxies else None, continuous, deadline, start_at)
+    else:
+        runner.add_job(username, password, venues, proxies[0] if proxies else None, continuous, deadline, start_at)
+
+    # Stop cancels the runner's tasks through its coordinators
+    with thread_lock:
+        active_coordinators.extend(runner.coordinators.values())
+    print(f"Starting {len(runner.specs)} async booking job(s) at {datetime.now().strftime('%H:%M:%S')}...")
+    thread = runner.start()
+    with thread_lock:
+        active_threads.append(thread)
+    return [thread]
+
+
+def load_config(path):
+    """Read a YAML or JSON job config and check it; raises ValueError describing the first problem."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        config = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML configs need PyYAML (pip install pyyaml); or pass a .json config") from None
+        config = yaml.safe_load(text)
+    if not isinstance(config, dict) or not config.get("accounts"):
+        raise ValueError(f"{path}: no accounts to book for")
+    if config.setdefault("browser", "HTTP") not in BROWSERS:
+        raise ValueError(f"{path}: browser must be one of {', '.join(BROWSERS)}")
+    for key in ("schedule", "check_until"):
+        if config.get(key) is not None:
+            config[key] = str(config[key])
+            try:
+                datetime.strptime(config[key], "%H:%M")
+            except ValueError:
+                raise ValueError(f"{path}: {key} must be HH:MM (e.g., 21:30)") from None
+    config["accounts"] = [load_account(account) for account in config["accounts"]]
+    return config
+
+
+def load_account(account):
+    username = str(account.get("username") or "")
+    password = account.get("password")
+    if password is None and account.get("password_env"):
+        password = os.environ.get(account["password_env"])
+    if not username or not password:
+        raise ValueError(f"Account {username or '?'}: username and password (or password_env) are required")
+    if not account.get("slots"):
+        raise ValueError(f"Account {username}: no slots to book")
+    return dict(account, username=username, password=password, slots=[load_slot(username, slot) for slot in account["slots"]])
+
+
+def load_slot(username, slot):
+    """Turn a config slot into the slot dict the GUI's slot list holds, with the end filled in from the venue grid."""
+    venue_id = str(slot.get("venue", ""))
+    venue = load_venues().get(venue_id)
+    if venue is None:
+        raise ValueError(f"Account {username}: unknown venue {venue_id!r}")
+    try:
+        start = SlotTime.parse(str(slot["start"]))
+        end = SlotTime.parse(str(slot["end"])) if slot.get("end") else SlotTime(venue.end_for(start))
+        key = SlotKey(parse_slot_date(str(slot["date"]).strip()), start, end)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Account {username}: slot needs a date as 'dd mm YYYY' and a valid start on venue {venue_id}: {slot}") from None
+    if not venue.is_start(key.start):
+        raise ValueError(f"Account {username}: {key.start} is not a valid start time for venue {venue_id}")
+    if not venue.is_slot(key.start, key.end):
+        raise ValueError(f"Account {username}: {key.start}-{key.end} runs past closing time or into the break at venue {venue_id}")
+    return {"day": key.date.strftime("%A"), "date": str(slot["date"]).strip(), "start_time": str(key.start),
+            "end_time": str(key.end), "venue_id": venue_id}
+
+
+def run_jobs(config, start_at=None):
+    """Start every account in a loaded config; returns the started threads."""
+    threads = []
+    for account in config["accounts"]:
+        threads += start_booking(account["username"], account["password"], account["slots"],
+                                 browser_choice=config["browser"], headless=config.get("headless", True),
+                                 http_polling=config.get("http_polling", False), parallel_venues=config.get("parallel_venues", False),
+                                 proxies=account.get("proxies", config.get("proxies") or []),
+                                 continuous=config.get("continuous", True), check_until_time=config.get("check_until"),
+                                 start_at=start_at, park_browser=config.get("park_browser", False))
+    return threads
+
+
+def schedule_jobs(config):
+    """Run the config daily at its schedule time on the LMS clock, starting engines `warmup` seconds early."""
+    schedule_time = config["schedule"]
+    warmup_seconds = int(config.get("warmup") or 0)
+    # Slots open on the LMS clock; the scheduler picks up the measured offset on its next wake-up
+    server_clock.measure_in_background()
+
+    def fire():
+        run_jobs(config, next_server_time(schedule_time, warmup_seconds) if warmup_seconds else None)
+        status_bus.publish("Scheduler", job.skew_report())
+
+    if warmup_seconds:
+        job = booking_scheduler.daily(schedule_time, fire, lead_seconds=warmup_seconds, name=f"warm-up for {schedule_time}")
+    else:
+        job = booking_scheduler.daily(schedule_time, fire, name=f"booking at {schedule_time}")
+    print(f"Scheduled booking daily at {schedule_time}; next run at {booking_scheduler.next_run().strftime('%Y-%m-%d %H:%M:%S')}")
+
+
+def print_status(stopped, frame_s=CONSOLE_FRAME_S):
+    """Console counterpart of statusview.render_status: print changed job lines and notices until `stopped` is set."""
+    shown = set()
+    while True:
+        finished = stopped.wait(frame_s)
+        lines, notices = status_bus.drain()
+        for line in lines or ():
+            if line not in shown:
+                print(line, flush=True)
+        shown = set(lines) if lines is not None else shown
+        for kind, title, message in notices:
+            print(f"[{kind}] {title}: {message}", flush=True)
+        if finished:
+            return
+
+
+def print_dashboard():
+    print(" | ".join(heading for _, heading in DASHBOARD_COLUMNS))
+    for metrics in job_metrics:
+        summary = metrics.summary()
+        print(" | ".join("-" if summary[key] is None else str(summary[key]) for key, _ in DASHBOARD_COLUMNS))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="slotbot", description="Book Moodle scheduler slots without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="book the slots in a job config")
+    run.add_argument("--config", required=True, help="YAML or JSON job config")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    stopped = threading.Event()
+    printer = threading.Thread(target=print_status, args=(stopped,), daemon=True)
+    printer.start()
+    try:
+        if config.get("schedule"):
+            schedule_jobs(config)
+            print(f"Ready in {(time.perf_counter() - LAUNCHED) * 1000:.0f} ms; Ctrl+C to stop")
+            while True:
+                time.sleep(3600)
+        threads = run_jobs(config)
+        print(f"Started {len(threads)} job thread(s) {(time.perf_counter() - LAUNCHED) * 1000:.0f} ms after launch")
+        for thread in threads:
+            # Short joins so Ctrl+C is handled promptly
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        print("Stopping...")
+        for job in booking_scheduler.jobs:
+            print(job.skew_report())
+        booking_scheduler.clear()
+        shut_down(active_coordinators[:])
+    finally:
+        stopped.set()
+        printer.join()
+    print_dashboard()
+    if config.get("schedule"):
+        # A daemon only ends when stopped
+        return 0
+    booked = [coordinator for coordinator in active_coordinators if coordinator.booked_by]
+    return 0 if len(booked) == len(config["accounts"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
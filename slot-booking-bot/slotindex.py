@@ -0,0 +1,16 @@
+from slottime import SlotKey
+
+
+def slot_key(date, start_time, end_time):
+    """Build the SlotKey (date_ordinal, start_minutes, end_minutes) for a slot entered as 'dd mm YYYY', '8:00 AM', '9:00 AM'."""
+    return SlotKey.parse(date, start_time, end_time)
+
+
+def build_slot_index(rows):
+    """Index a parsed page once by slot key; values are row positions so callers can find the matching button."""
+    index = {}
+    for position, row in enumerate(rows):
+        if row is not None:
+            index.setdefault((row.date_ordinal, row.start, row.end), position)
+    return index
+
@@ -0,0 +1,179 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+from enum import IntEnum
+from functools import lru_cache
+from html import unescape
+
+class SlotRow(namedtuple("SlotRow", ["date_ordinal", "start", "end", "state", "cell"])):
+    """Compact row model shared by every engine (Selenium, HTTP, replay).
+
+    date_ordinal is date.toordinal(), start/end are minutes since midnight.
+    cell is the raw HTML of the row's action cell ("" for rows read in the
+    browser); its booking form is only parsed when action or params is read,
+    which happens for the one row that gets booked.
+    """
+
+    __slots__ = ()
+
+    @property
+    def action(self):
+        form = _FORM_RE.search(self.cell)
+        return unescape(form.group(1)) if form else ""
+
+    @property
+    def params(self):
+        """The form's hidden inputs as a tuple of (name, value) pairs."""
+        return tuple((name, unescape(value)) for name, value in _HIDDEN_RE.findall(self.cell))
+
+
+class ButtonState(IntEnum):
+    NONE = 0
+    BOOKABLE = 1
+    DISABLED = 2
+    BOOKED = 3
+    OTHER = 4
+
+
+_TABLE_RE = re.compile(r"<table\b[^>]*\bid\s*=\s*[\"']slotbookertable[\"'][^>]*>", re.I)
+_TABLE_END_RE = re.compile(r"</table>", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_INPUT_RE = re.compile(r"<input\b[^>]*>", re.I)
+_FORM_RE = re.compile(r"<form\b[^>]*?\baction\s*=\s*[\"']([^\"']*)[\"']", re.I)
+# Moodle renders hidden inputs as type, name, value in that order
+_HIDDEN_RE = re.compile(r"<input\b[^>]*?\btype\s*=\s*[\"']hidden[\"'][^>]*?\bname\s*=\s*[\"']([^\"']*)[\"'][^>]*?\bvalue\s*=\s*[\"']([^\"']*)[\"']", re.I)
+_SUBMIT_VALUE_RE = re.compile(r"\btype\s*=\s*[\"']submit[\"'].*?\bvalue\s*=\s*[\"']([^\"']*)[\"']|\bvalue\s*=\s*[\"']([^\"']*)[\"'].*?\btype\s*=\s*[\"']submit[\"']", re.S | re.I)
+_DISABLED_RE = re.compile(r"\bdisabled\b", re.I)
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})\s*([AaPp])?")
+
+
+def _text(fragment):
+    return _SPACE_RE.sub(" ", unescape(_TAG_RE.sub(" ", fragment))).strip()
+
+
+@lru_cache(maxsize=256)
+def parse_minutes(time_str):
+    """Parse '8:00 AM', '08:00AM' or '14:00' into minutes since midnight, or None."""
+    match = _TIME_RE.search(time_str)
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem in "Pp" else 0)
+    return hour * 60 + minute
+
+
+def format_minutes(minutes):
+    """Format minutes since midnight the way the scheduler and the venue lists show times: '8:00 AM', '12:15 PM'."""
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+@lru_cache(maxsize=64)
+def parse_date_ordinal(date_str):
+    """Parse a scheduler date header like 'Monday, 16 June 2025' into a date ordinal, or None."""
+    try:
+        return datetime.strptime(date_str.strip(), "%A, %d %B %Y").toordinal()
+    except ValueError:
+        return None
+
+
+def button_state(label, enabled):
+    if not label:
+        return ButtonState.NONE
+    if "Book slot" in label:
+        return ButtonState.BOOKABLE if enabled else ButtonState.DISABLED
+    if "Cancel booking" in label:
+        return ButtonState.BOOKED
+    return ButtonState.OTHER
+
+
+def _cell(part):
+    open_end = part.find(">")
+    close = part.find("</td>", open_end)
+    return part[open_end + 1:close if close != -1 else len(part)]
+
+
+def _cell_text(fragment):
+    if "<" not in fragment and "&" not in fragment:
+        return " ".join(fragment.split())
+    return _text(fragment)
+
+
+def _parse_action_cell(cell, states):
+    """Return the ButtonState of the action cell's Book slot/Cancel booking button or submit input.
+
+    states caches the result per distinct button markup, which repeats on every row of a page.
+    """
+    button_at = cell.find("<button")
+    if button_at != -1:
+        label_end = cell.find("</button>", button_at)
+        button = cell[button_at:label_end if label_end != -1 else len(cell)]
+        state = states.get(button)
+        if state is None:
+            attrs_end = button.find(">")
+            state = states[button] = button_state(_cell_text(button[attrs_end + 1:]), "disabled" not in button[:attrs_end])
+        return state
+    for match in _INPUT_RE.finditer(cell):
+        submit = _SUBMIT_VALUE_RE.search(match.group(0))
+        if submit:
+            return button_state(unescape(submit.group(1) or submit.group(2)), not _DISABLED_RE.search(match.group(0)))
+    return ButtonState.NONE
+
+
+def parse_slot_table(html):
+    """Parse table#slotbookertable out of raw scheduler HTML (bytes or str) into SlotRow records.
+
+    Rows and cells are split with plain string searches on Moodle's lowercase
+    markup instead of a full HTML parser, and each distinct time or button is
+    parsed once per page, which keeps a 10k-row page fast.
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    table = _TABLE_RE.search(html)
+    if not table:
+        return []
+    table_end = _TABLE_END_RE.search(html, table.end())
+    table_html = html[table.end():table_end.start() if table_end else len(html)]
+    rows = []
+    date_ordinal = None
+    times = {}
+    states = {}
+    for row_html in table_html.split("<tr")[1:]:
+        cells = row_html.split("<td")
+        if len(cells) < 9:
+            continue
+        date_cell = _cell(cells[1])
+        if date_cell and not date_cell.isspace():
+            date_text = _cell_text(date_cell)
+            if date_text:
+                # The date is only printed on the first row of each day; later rows carry it forward
+                date_ordinal = parse_date_ordinal(date_text)
+        if date_ordinal is None:
+            continue
+        start_cell, end_cell = _cell(cells[2]), _cell(cells[3])
+        if start_cell not in times:
+            times[start_cell] = parse_minutes(_cell_text(start_cell))
+        if end_cell not in times:
+            times[end_cell] = parse_minutes(_cell_text(end_cell))
+        start, end = times[start_cell], times[end_cell]
+        if start is None or end is None:
+            continue
+        cell = _cell(cells[8])
+        rows.append(SlotRow(date_ordinal, start, end, _parse_action_cell(cell, states), cell))
+    return rows
+
+
+def rows_from_payload(payload_rows):
+    """Convert the rows tablescript.classify_page read in the browser into SlotRow records, keeping their positions."""
+    rows = []
+    for row_date, row_start, row_end, label, enabled in payload_rows:
+        date_ordinal = parse_date_ordinal(row_date)
+        start = parse_minutes(row_start)
+        end = parse_minutes(row_end)
+        if date_ordinal is None or start is None or end is None:
+            rows.append(None)
+            continue
+        rows.append(SlotRow(date_ordinal, start, end, button_state(label, enabled), ""))
+    return rows
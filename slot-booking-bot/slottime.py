@@ -0,0 +1,61 @@
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+from slotparser import parse_minutes, format_minutes
+
+
+class SlotTime(int):
+    """A time of day as minutes since midnight.
+
+    It is an int, so it compares and hashes exactly like the start/end
+    minutes on parsed SlotRows; str() gives the display form ('8:00 AM').
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def parse(text):
+        """Parse '8:00 AM', '08:00AM' or '14:00' once per distinct string; raises ValueError if unreadable."""
+        minutes = parse_minutes(text)
+        if minutes is None:
+            raise ValueError(f"Invalid time: {text!r}")
+        return SlotTime(minutes)
+
+    def __str__(self):
+        return format_minutes(self)
+
+    def __repr__(self):
+        return f"SlotTime({format_minutes(self)!r})"
+
+
+@lru_cache(maxsize=512)
+def parse_slot_date(text):
+    """Parse a slot date entered as 'dd mm YYYY' into a date ordinal; raises ValueError if unreadable."""
+    day, month, year = text.split()
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+class SlotKey(namedtuple("SlotKey", ["date_ordinal", "start", "end"])):
+    """The identity of one slot: date ordinal plus start and end SlotTimes.
+
+    Equal to, and hashed like, the (date_ordinal, start, end) tuple a parsed
+    row produces, so matching a request against a page is integer equality.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, slot_date, start_time, end_time):
+        return cls(parse_slot_date(slot_date.strip()), SlotTime.parse(start_time), SlotTime.parse(end_time))
+
+    @property
+    def date(self):
+        return date.fromordinal(self.date_ordinal)
+
+    def date_text(self):
+        """The date as the scheduler table prints it: 'Monday, 16 June 2025'."""
+        return self.date.strftime("%A, %d %B %Y")
+
+    def __str__(self):
+        return f"{self.date.strftime('%A, %d %m %Y')}, {self.start}-{self.end}"
@@ -0,0 +1,53 @@
+import threading
+from collections import deque
+
+
+class StatusBus:
+    """Thread-safe status channel between booking workers and whatever displays them.
+
+    publish() records the latest line for a job, replacing the previous one,
+    so a worker can report every poll without queueing anything for the GUI.
+    notify() queues a user-facing notice (kind "info", "warning" or "error").
+    The display calls drain() at its own frame rate and gets the current
+    lines only if something changed since its last call, plus the notices
+    queued in between. Job "" is the general status line.
+    """
+
+    def __init__(self):
+        self._lines = {}
+        self._notices = deque()
+        self._version = 0
+        self._drained = 0
+        self._lock = threading.Lock()
+
+    def publish(self, job, text):
+        with self._lock:
+            self._lines[job] = text
+            self._version += 1
+
+    def notify(self, kind, title, message):
+        self._notices.append((kind, title, message))
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            self._version += 1
+
+    def lines(self):
+        """One line per job, in the order jobs first reported."""
+        with self._lock:
+            return [f"{job}: {text}" if job else text for job, text in self._lines.items()]
+
+    def drain(self):
+        """Return (lines, notices): lines is None if nothing was published since the last drain."""
+        with self._lock:
+            changed = self._version != self._drained
+            self._drained = self._version
+        lines = self.lines() if changed else None
+        notices = []
+        while self._notices:
+            notices.append(self._notices.popleft())
+        return lines, notices
+
+
+status_bus = StatusBus()
@@ -0,0 +1,56 @@
+import tkinter as tk
+from tkinter import ttk
+from components import root, status_label, tree_jobs
+from statusbus import status_bus
+from metrics import job_metrics, DASHBOARD_COLUMNS
+
+# Redraw at 10 Hz however often workers publish
+FRAME_MS = 100
+
+ICONS = {"info": "::tk::icons::information", "warning": "::tk::icons::warning", "error": "::tk::icons::error"}
+
+
+def render_status():
+    """Draw the latest line per job and show queued notices; runs on the Tk thread.
+
+    The next frame is scheduled first, so neither a notice nor an error while
+    drawing can stop the loop.
+    """
+    root.after(FRAME_MS, render_status)
+    lines, notices = status_bus.drain()
+    if lines is not None:
+        status_label.config(text="\n".join(lines) or "Status: Idle")
+    render_dashboard()
+    for kind, title, message in notices:
+        show_notice(kind, title, message)
+
+
+def show_notice(kind, title, message):
+    """A non-modal message window: unlike messagebox it returns at once and leaves the main window live."""
+    window = tk.Toplevel(root)
+    window.title(title)
+    window.transient(root)
+    window.resizable(False, False)
+    frame = ttk.Frame(window, padding=12)
+    frame.pack(fill="both", expand=True)
+    ttk.Label(frame, image=ICONS.get(kind, ICONS["info"])).grid(row=0, column=0, padx=(0, 10), sticky="n")
+    ttk.Label(frame, text=message, wraplength=360, justify="left").grid(row=0, column=1, sticky="w")
+    ok = ttk.Button(frame, text="OK", command=window.destroy)
+    ok.grid(row=1, column=0, columnspan=2, pady=(12, 0))
+    ok.focus_set()
+    window.bind("<Return>", lambda event: window.destroy())
+    window.bind("<Escape>", lambda event: window.destroy())
+
+
+def render_dashboard():
+    """One Treeview row per job from its live metrics; rows of jobs no longer tracked are removed."""
+    rows = {metrics.name: metrics.summary() for metrics in job_metrics}
+    for item in tree_jobs.get_children():
+        if item not in rows:
+            tree_jobs.delete(item)
+    for name, summary in rows.items():
+        values = ["-" if summary[key] is None else summary[key] for key, _ in DASHBOARD_COLUMNS]
+        if tree_jobs.exists(name):
+            tree_jobs.item(name, values=values)
+        else:
+            tree_jobs.insert("", "end", iid=name, values=values)
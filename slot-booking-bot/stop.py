@@ -1,26 +1,27 @@
-from tkinter import messagebox
-import schedule
-from components import root, status_label
-from globals import active_drivers, active_threads, scheduled_time
+import threading
+from globals import active_drivers, active_threads, active_coordinators
+from scheduler import booking_scheduler
+from statusbus import status_bus
 
 def stop_process():
-    schedule.clear()
-    global scheduled_time
-    scheduled_time = None
+    booking_scheduler.clear()
     print("All scheduled jobs cleared.")
 
-    for driver in active_drivers[:]:
-        try:
-            driver.quit()
-            active_drivers.remove(driver)
-            print("Closed an active browser instance.")
-        except Exception as e:
-            print(f"Error closing driver: {e}")
-            active_drivers.remove(driver)
+    # Quitting a hung browser can block, so tear down off the GUI thread
+    coordinators = active_coordinators[:]
+    active_coordinators.clear()
+    threading.Thread(target=shut_down, args=(coordinators,), daemon=True).start()
 
     global active_threads
     active_threads = []
     print("Cleared tracked threads.")
 
-    root.after(0, lambda: messagebox.showinfo("Stopped", "All booking processes and schedules have been stopped."))
-    root.after(0, lambda: status_label.config(text="Status: Stopped"))
\ No newline at end of file
+    status_bus.clear()
+    status_bus.notify("info", "Stopped", "All booking processes and schedules have been stopped.")
+    status_bus.publish("", "Status: Stopped")
+
+def shut_down(coordinators):
+    for coordinator in coordinators:
+        coordinator.cancel_all("stopped")
+    active_drivers.quit_all()
+    print("All engines closed.")
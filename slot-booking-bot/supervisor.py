@@ -0,0 +1,182 @@
+import threading
+import time
+from watchdog import CommandTimeout, watchdog
+
+# Seconds an engine operation may block before the watchdog aborts the engine
+# ("start" covers a pool lease: waiting for a free browser, its health check and a cold start)
+COMMAND_TIMEOUTS = {"start": 60.0, "fetch": 20.0, "book": 30.0, "sign_in": 45.0}
+
+
+class SupervisedDriver:
+    """Keeps a job's booking engine alive, respawning it when the browser dies or hangs.
+
+    Every operation runs under a deadline from `timeouts` (COMMAND_TIMEOUTS
+    by default). If it overruns, the shared watchdog thread aborts the engine
+    (kills the browser, or closes it if it has no abort()) so the blocked
+    call fails at once, and "<op>_timeouts" is counted in `metrics`.
+    If an operation raises and the engine timed out or fails its is_alive()
+    check (browser crashed, window closed, session gone), the engine is
+    retired, spawn() starts a new one and sign_in() logs it in again, backing
+    off exponentially between failed attempts up to max_restarts. The job's
+    pollers, attempt counts and deadline live outside the engine, so they
+    carry on unchanged. Every recovery adds to the "crashes" count and the
+    "recovery" timing, whose mean is the time to recover. Each fetch also
+    records "polls" and its "fetch" latency, and each book the
+    "detect_to_click" time from the fetch that found the slot to the
+    click/POST the engine issued for it (the engine's clicked_at).
+
+    spawn(starting) runs under the "start" deadline too. It must call
+    starting(engine) before each blocking step on an engine (starting it,
+    health-checking a pooled one), so that engine is the one aborted if
+    the step hangs.
+
+    Other attributes (name, error, logged_in_as, ...) read through to the
+    current engine, so the wrapper can stand in for it anywhere.
+    """
+
+    def __init__(self, spawn, retire, sign_in, metrics=None, timeouts=None, max_restarts=5, backoff=1.0, max_backoff=30.0):
+        self.spawn = spawn
+        self.retire = retire
+        self.sign_in = sign_in
+        self.metrics = metrics
+        self.timeouts = dict(COMMAND_TIMEOUTS, **(timeouts or {}))
+        self.max_restarts = max_restarts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.engine = None
+        self._fetched_at = None
+        self._closed = threading.Event()
+
+    def __getattr__(self, name):
+        engine = self.__dict__.get("engine")
+        if engine is None:
+            raise AttributeError(name)
+        return getattr(engine, name)
+
+    def start(self):
+        self.engine = self._spawn()
+
+    def call(self, op, fn):
+        """Run fn(engine) under op's deadline; if the engine dies or hangs, recover and run it once more on the new one."""
+        try:
+            return self._guarded(op, fn)
+        except Exception as e:
+            self._recover(e)
+        return self._guarded(op, fn)
+
+    def fetch(self, scheduler_url):
+        started = time.monotonic()
+        result = self.call("fetch", lambda engine: engine.fetch(scheduler_url))
+        self._fetched_at = time.monotonic()
+        if self.metrics:
+            self.metrics.incr("polls")
+            self.metrics.observe("fetch", self._fetched_at - started)
+        return result
+
+    def book(self, row, handle, slot):
+        engine = self.engine
+        try:
+            return self._guarded("book", lambda engine: engine.book(row, handle, slot))
+        except Exception as e:
+            self._recover(e)
+        finally:
+            self._record_click(engine)
+        # The row's button belonged to the old browser; the next poll finds it again
+        return False, False
+
+    def _record_click(self, engine):
+        # An engine that never got to click leaves clicked_at from an earlier booking, before this fetch
+        clicked_at = getattr(engine, "clicked_at", None)
+        if self.metrics and self._fetched_at is not None and clicked_at is not None and clicked_at >= self._fetched_at:
+            self.metrics.observe("detect_to_click", clicked_at - self._fetched_at)
+
+    def quit(self):
+        """Stop supervising and quit the current engine; a cancelled job never respawns."""
+        self._closed.set()
+        if self.engine:
+            self.engine.quit()
+
+    def _spawn(self):
+        """Run spawn() under the "start" deadline; an engine it started is retired if the deadline passed."""
+        pending = []
+        try:
+            return self._guarded("start", lambda engine: self.spawn(pending.append), lambda: pending[-1] if pending else None)
+        except Exception:
+            if pending:
+                self._release(pending[-1])
+            raise
+
+    def _guarded(self, op, fn, target=None):
+        """Run fn(engine) with op's deadline armed; on overrun the watchdog aborts target() (default: the current engine)."""
+        engine = self.engine
+        timeout = self.timeouts.get(op)
+        if not timeout:
+            return fn(engine)
+        token = watchdog.arm(timeout, lambda: self._abort(target() if target else engine, op, timeout))
+        try:
+            result = fn(engine)
+        except Exception as e:
+            if watchdog.disarm(token):
+                raise
+            raise CommandTimeout(f"{op} took longer than {timeout:g}s") from e
+        if not watchdog.disarm(token):
+            # Finished just as the watchdog fired: the engine is gone either way
+            raise CommandTimeout(f"{op} took longer than {timeout:g}s")
+        return result
+
+    def _abort(self, engine, op, timeout):
+        # Runs on the watchdog thread while the job thread is still blocked in the engine
+        if engine is None:
+            print(f"Stuck in {op} for {timeout:g}s before any engine was started")
+            return
+        print(f"{engine.name} engine stuck in {op} for {timeout:g}s. Aborting it...")
+        if self.metrics:
+            self.metrics.incr(f"{op}_timeouts")
+        getattr(engine, "abort", engine.quit)()
+
+    def _alive(self):
+        is_alive = getattr(self.engine, "is_alive", None)
+        return is_alive() if is_alive else True
+
+    def _recover(self, error):
+        # Re-raise anything that isn't a dead or hung engine, and everything once the job is being torn down
+        if self._closed.is_set() or self.engine is None or (not isinstance(error, CommandTimeout) and self._alive()):
+            raise error
+        print(f"{self.engine.name} engine died ({type(error).__name__}: {error}). Restarting...")
+        started = time.monotonic()
+        if self.metrics:
+            self.metrics.incr("crashes")
+        for restart in range(self.max_restarts):
+            self._retire()
+            if restart and self._closed.wait(min(self.backoff * 2 ** (restart - 1), self.max_backoff)):
+                raise error
+            try:
+                self.engine = self._spawn()
+                if self._guarded("sign_in", self.sign_in):
+                    break
+                print(f"Sign-in after restart failed: {self.engine.error}")
+            except Exception as e:
+                print(f"Restart {restart + 1}/{self.max_restarts} failed: {type(e).__name__}: {e}")
+                self._retire()
+        else:
+            self._retire()
+            raise error
+        if self._closed.is_set():
+            self._retire()
+            raise error
+        recovered = time.monotonic() - started
+        if self.metrics:
+            self.metrics.incr("recoveries")
+            self.metrics.observe("recovery", recovered)
+        print(f"Recovered in {recovered:.1f}s")
+
+    def _retire(self):
+        engine, self.engine = self.engine, None
+        if engine is not None:
+            self._release(engine)
+
+    def _release(self, engine):
+        try:
+            self.retire(engine)
+        except Exception as e:
+            print(f"Error closing dead engine: {e}")
@@ -0,0 +1,58 @@
+from moodle import PageState, SERVER_ERROR_MARKERS
+
+# Injected helper that snapshots table#slotbookertable within the page classification call.
+# Each row is [date, start, end, button label, button enabled]; the date is carried
+# forward from the last row that had one, the same way the Python loop used to do it.
+# "buttons" is aligned with "rows" and only holds an element for bookable rows.
+_READ_TABLE_JS = """
+var readTable = function (table) {
+    var clean = function (node) { return node.textContent.replace(/\\s+/g, ' ').trim(); };
+    var rows = [], buttons = [], currentDate = '';
+    var trs = table.querySelectorAll('tbody tr');
+    for (var i = 0; i < trs.length; i++) {
+        var cells = trs[i].cells;
+        if (cells.length < 8) { continue; }
+        var dateText = clean(cells[0]);
+        if (dateText) { currentDate = dateText; }
+        var button = cells[7].querySelector('button');
+        var label = button ? clean(button) : '';
+        var enabled = !!button && !button.disabled;
+        rows.push([currentDate, clean(cells[1]), clean(cells[2]), label, enabled]);
+        buttons.push(enabled && label.indexOf('Book slot') !== -1 ? button : null);
+    }
+    return {rows: rows, buttons: buttons};
+};
+"""
+
+# Classifies the loaded page in the same call, in the order moodle.page_status uses.
+# arguments[0] is SERVER_ERROR_MARKERS.
+CLASSIFY_PAGE_JS = _READ_TABLE_JS + """
+var text = document.body ? document.body.textContent : '';
+var markers = arguments[0];
+for (var m = 0; m < markers.length; m++) {
+    if (text.indexOf(markers[m]) !== -1) { return {state: 'SERVER_ERROR'}; }
+}
+if (document.getElementById('loginbtn') || location.pathname.indexOf('/login/') !== -1) {
+    return {state: 'LOGIN_REQUIRED'};
+}
+var btns = document.querySelectorAll('button.btn');
+for (var b = 0; b < btns.length; b++) {
+    if (btns[b].textContent.indexOf('Cancel booking') !== -1) { return {state: 'HAS_BOOKING'}; }
+}
+var ths = document.querySelectorAll('th');
+for (var h = 0; h < ths.length; h++) {
+    if (ths[h].textContent.indexOf('Other participants') !== -1) { return {state: 'FROZEN'}; }
+}
+var table = document.querySelector('table#slotbookertable');
+if (!table) { return {state: 'EMPTY'}; }
+var snapshot = readTable(table);
+snapshot.state = 'TABLE_READY';
+return snapshot;
+"""
+
+
+def classify_page(driver):
+    """Return (PageState, rows, buttons) for the loaded page in one round trip; rows are only filled for TABLE_READY."""
+    payload = driver.execute_script(CLASSIFY_PAGE_JS, list(SERVER_ERROR_MARKERS))
+    state = PageState[payload["state"]]
+    return state, payload.get("rows", []), payload.get("buttons", [])
@@ -0,0 +1,14 @@
+import os
+import sys
+import pytest
+
+# The bot's modules are flat files in slot-booking-bot/ and import each other by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def moodle():
+    from mockmoodle import MockMoodle
+    server = MockMoodle()
+    yield server
+    server.close()
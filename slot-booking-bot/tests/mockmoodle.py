@@ -0,0 +1,142 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+USERNAME = "22BCE1234"
+PASSWORD = "s3cret&pass"
+LOGIN_TOKEN = "tok123"
+SESSKEY = "sk1"
+SLOT_ID = "501"
+
+LOGIN_PAGE = """<html><body><form action="{base}login/index.php" method="post" id="login">
+<input type="hidden" name="logintoken" value="{token}">
+<input type="text" name="username" id="username"><input type="password" name="password" id="password">
+<button type="submit" id="loginbtn">Log in</button></form></body></html>"""
+
+COURSE_PAGE = """<html><head><script>M.cfg = {{"sesskey":"{sesskey}"}};</script></head><body>Course</body></html>"""
+
+SCHEDULER_PAGE = """<html><head><script>M.cfg = {{"sesskey":"{sesskey}"}};</script></head><body>{notice}
+<table id="slotbookertable" class="generaltable"><tbody>
+<tr><td class="cell c0">Monday, 16 June 2025</td><td class="cell c1">{start}</td><td class="cell c2">{end}</td>
+<td class="cell c3">Lab 1611</td><td class="cell c4"></td><td class="cell c5">Staff</td><td class="cell c6"></td>
+<td class="cell c7">{action}</td></tr>
+</tbody></table></body></html>"""
+
+BOOK_BUTTON = """<form method="post" action="view.php?id={venue_id}">
+<input type="hidden" name="what" value="bookslot"><input type="hidden" name="slotid" value="{slot_id}">
+<button type="submit" class="btn btn-primary">Book slot</button></form>"""
+
+CANCEL_BUTTON = """<button type="submit" class="btn btn-secondary">Cancel booking</button>"""
+
+NOTE_FORM = """<html><body><form action="{base}mod/scheduler/view.php?id={venue_id}" method="post" class="mform">
+<input type="hidden" name="what" value="savebooking"><input type="hidden" name="slotid" value="{slot_id}">
+<input type="hidden" name="sesskey" value="{sesskey}">
+<textarea name="studentnote_editor[text]" id="id_studentnote_editor"></textarea>
+<input type="hidden" name="studentnote_editor[format]" value="1">
+<input type="submit" name="submitbutton" id="id_submitbutton" value="Book slot"></form></body></html>"""
+
+
+class MockMoodle:
+    """A local stand-in for the LMS: token login, the course page, one scheduler slot and its booking note form.
+
+    Every POST body is decoded strictly and kept in `posts`; saved bookings
+    go to `bookings`. `venues` maps each scheduler id to its one slot as
+    (start, end, slot id); every venue page shows Cancel booking once
+    anything is booked. Set error_status (e.g. 503) to answer every request
+    with a bare error page. Set accept_booking=False to have the note form submit
+    return the unchanged scheduler page, and booked_notice / refused_notice
+    to change what that page shows above the table.
+    """
+
+    def __init__(self):
+        self.sessions = set()
+        self.posts = []
+        self.bookings = []
+        self.accept_booking = True
+        self.booked_notice = '<div class="alert alert-success" role="alert">Slot booked</div>'
+        self.refused_notice = ""
+        self.venues = {"36137": ("8:00 AM", "9:00 AM", SLOT_ID)}
+        self.error_status = None
+        moodle = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                moodle.handle(self, "GET")
+
+            def do_POST(self):
+                moodle.handle(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.course_url = f"{self.base_url}course/view.php?id=302"
+        self.scheduler_url = self.venue_url("36137")
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def venue_url(self, venue_id):
+        return f"{self.base_url}mod/scheduler/view.php?id={venue_id}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, request, method):
+        if self.error_status:
+            return self.respond(request, self.error_status, "<html><body><h1>Overloaded</h1></body></html>")
+        path, query = urlsplit(request.path)[2:4]
+        venue_id = dict(parse_qsl(query)).get("id")
+        form = {}
+        if method == "POST":
+            if request.headers.get("Content-Type") != "application/x-www-form-urlencoded":
+                return self.respond(request, 415, "Expected a form post")
+            body = request.rfile.read(int(request.headers.get("Content-Length", 0))).decode("ascii")
+            form = dict(parse_qsl(body, keep_blank_values=True, strict_parsing=bool(body)))
+            self.posts.append(form)
+        cookie = request.headers.get("Cookie", "")
+        logged_in = any(part.strip() in self.sessions for part in cookie.split(";"))
+
+        if path == "/login/index.php":
+            if method == "POST" and form.get("logintoken") == LOGIN_TOKEN and form.get("username") == USERNAME and form.get("password") == PASSWORD:
+                session = f"MoodleSession=s{len(self.sessions) + 1}"
+                self.sessions.add(session)
+                return self.redirect(request, self.course_url, session)
+            return self.respond(request, 200, LOGIN_PAGE.format(base=self.base_url, token=LOGIN_TOKEN))
+        if not logged_in:
+            return self.redirect(request, f"{self.base_url}login/index.php")
+        if path == "/course/view.php":
+            return self.respond(request, 200, COURSE_PAGE.format(sesskey=SESSKEY))
+        if path == "/mod/scheduler/view.php":
+            if method == "POST" and form.get("what") == "bookslot" and form.get("sesskey") == SESSKEY:
+                return self.respond(request, 200, NOTE_FORM.format(base=self.base_url, venue_id=venue_id, slot_id=form["slotid"], sesskey=SESSKEY))
+            if method == "POST" and form.get("what") == "savebooking" and form.get("sesskey") == SESSKEY:
+                if not self.accept_booking:
+                    return self.respond(request, 200, self.scheduler_page(venue_id, self.refused_notice))
+                self.bookings.append(form)
+                return self.respond(request, 200, self.scheduler_page(venue_id, self.booked_notice))
+            if venue_id not in self.venues:
+                return self.respond(request, 404, "Not found")
+            return self.respond(request, 200, self.scheduler_page(venue_id))
+        return self.respond(request, 404, "Not found")
+
+    def scheduler_page(self, venue_id, notice=""):
+        start, end, slot_id = self.venues[venue_id]
+        action = CANCEL_BUTTON if self.bookings else BOOK_BUTTON.format(venue_id=venue_id, slot_id=slot_id)
+        return SCHEDULER_PAGE.format(sesskey=SESSKEY, notice=notice, start=start, end=end, action=action)
+
+    def respond(self, request, status, html):
+        body = html.encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def redirect(self, request, location, cookie=None):
+        request.send_response(303)
+        request.send_header("Location", location)
+        if cookie:
+            request.send_header("Set-Cookie", f"{cookie}; Path=/")
+        request.send_header("Content-Length", "0")
+        request.end_headers()
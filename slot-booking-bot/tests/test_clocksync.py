@@ -0,0 +1,50 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from clocksync import ClockSync
+
+SKEW = 7.3
+
+
+@pytest.fixture
+def skewed_server():
+    """A local server whose Date header runs SKEW seconds ahead of this machine's clock."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def date_time_string(self, timestamp=None):
+            return formatdate(time.time() + SKEW, usegmt=True)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_offset_of_a_skewed_server_clock(skewed_server):
+    clock = ClockSync(url=skewed_server, samples=8, spacing=0.13)
+    estimate = clock.measure()
+    # Second-resolution Date headers, but staggered samples narrow the bound well below a second
+    assert estimate.uncertainty < 0.15
+    assert abs(estimate.offset - SKEW) <= estimate.uncertainty + 0.01
+    assert clock.offset == estimate.offset
+    server_now = clock.now()
+    assert (server_now - clock.to_local(server_now)).total_seconds() == pytest.approx(estimate.offset)
+
+
+def test_background_failure_keeps_the_previous_offset():
+    clock = ClockSync(url="http://127.0.0.1:9/", samples=1, timeout=0.5)
+    clock.offset = 1.5
+    clock.measure_in_background().join(5)
+    assert clock.offset == 1.5
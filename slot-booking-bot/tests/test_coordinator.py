@@ -0,0 +1,37 @@
+from coordinator import BookingCoordinator
+
+
+def test_first_claim_blocks_siblings_until_released():
+    coordinator = BookingCoordinator("22BCE1234")
+    first, second = coordinator.add_job("venue 1731"), coordinator.add_job("venue 1851")
+    assert first.claim()
+    assert not second.claim()
+    first.release()
+    assert second.claim()
+
+
+def test_a_job_that_ends_without_confirming_frees_its_claim():
+    coordinator = BookingCoordinator("22BCE1234")
+    crashed, sibling = coordinator.add_job("venue 1731"), coordinator.add_job("venue 1851")
+    assert crashed.claim()
+    crashed.finish()
+    assert sibling.claim()
+
+
+def test_cancelling_a_job_frees_its_claim():
+    coordinator = BookingCoordinator("22BCE1234")
+    stopped, sibling = coordinator.add_job("venue 1731"), coordinator.add_job("venue 1851")
+    assert stopped.claim()
+    stopped.cancel("stopped")
+    assert sibling.claim()
+
+
+def test_confirm_cancels_siblings_and_blocks_further_claims():
+    coordinator = BookingCoordinator("22BCE1234")
+    winner, sibling = coordinator.add_job("venue 1731"), coordinator.add_job("venue 1851")
+    assert winner.claim()
+    winner.confirm()
+    winner.finish()
+    assert sibling.cancelled and sibling.cancel_reason == "booked by venue 1731"
+    assert not sibling.claim()
+    assert coordinator.booked_by is winner
@@ -0,0 +1,58 @@
+import threading
+import seleniumengine
+from driverpool import DriverPool
+
+
+class FakeSelenium:
+    """Stands in for SeleniumEngine; is_alive() blocks until `healthy` is set."""
+
+    healthy = threading.Event()
+
+    def __init__(self, browser_choice, headless, proxy, gpu_arg):
+        self.browser_choice = browser_choice
+        self.headless = headless
+        self.proxy = proxy
+        self.driver = None
+        self.quits = 0
+
+    def start(self):
+        self.driver = True
+
+    def is_alive(self):
+        return self.healthy.wait(5)
+
+    def service_pid(self):
+        return None
+
+    def quit(self):
+        self.quits += 1
+        self.driver = None
+
+
+def test_health_check_runs_without_holding_the_pool_lock(monkeypatch):
+    monkeypatch.setattr(seleniumengine, "SeleniumEngine", FakeSelenium)
+    FakeSelenium.healthy.clear()
+    pool = DriverPool(max_size=2)
+    engine = pool.lease("22BCE1234", "Chrome")
+    pool.give_back(engine)
+
+    checking, leased = [], []
+    thread = threading.Thread(target=lambda: leased.append(pool.lease("22BCE1234", "Chrome", starting=checking.append)))
+    thread.start()
+    while not checking:
+        thread.join(0.01)
+    # The lease is blocked in the health check; the pool must still answer
+    assert len(pool) == 1
+    assert pool.lease("22BCE1234", "Chrome") is not engine
+    FakeSelenium.healthy.set()
+    thread.join(5)
+    assert leased == [engine]
+
+
+def test_worn_out_engine_is_quit_when_given_back(monkeypatch):
+    monkeypatch.setattr(seleniumengine, "SeleniumEngine", FakeSelenium)
+    pool = DriverPool(max_size=1, max_uses=1)
+    engine = pool.lease("22BCE1234", "Chrome")
+    pool.give_back(engine)
+    assert engine.quits == 1
+    assert len(pool) == 0
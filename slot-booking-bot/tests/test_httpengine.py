@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+import asyncengine
+import httpengine
+from moodle import BOOKING_NOTE, PageState
+from mockmoodle import USERNAME, PASSWORD, SLOT_ID
+from slotparser import ButtonState
+
+httpx = pytest.importorskip("httpx")
+
+SLOT = {"day": "Monday", "date": "16 06 2025", "start_time": "8:00 AM", "end_time": "9:00 AM"}
+
+
+@pytest.fixture
+def engine(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    engine = httpengine.HttpEngine()
+    engine.start()
+    yield engine
+    engine.quit()
+
+
+def test_login_fetch_and_book(engine, moodle):
+    assert engine.login(USERNAME, PASSWORD)
+    assert engine.logged_in_as == USERNAME
+    login = moodle.posts[0]
+    assert (login["username"], login["password"], login["logintoken"]) == (USERNAME, PASSWORD, "tok123")
+
+    state, rows, handles = engine.fetch(moodle.scheduler_url)
+    assert state == PageState.TABLE_READY
+    assert [row.state for row in rows] == [ButtonState.BOOKABLE]
+
+    assert engine.clicked_at is None
+    assert engine.book(rows[0], handles[0], SLOT) == (True, True)
+    assert engine.clicked_at is not None
+    assert moodle.bookings == [{"what": "savebooking", "slotid": SLOT_ID, "sesskey": "sk1", "studentnote_editor[text]": BOOKING_NOTE,
+                                "studentnote_editor[format]": "1", "submitbutton": "Book slot"}]
+    assert engine.fetch(moodle.scheduler_url)[0] == PageState.HAS_BOOKING
+
+
+def test_wrong_password_is_reported(engine, moodle):
+    assert not engine.login(USERNAME, "wrong")
+    assert engine.error == "Login failed: Invalid username or password."
+    assert engine.fetch(moodle.scheduler_url)[0] == PageState.LOGIN_REQUIRED
+
+
+def test_adopted_session_skips_the_login_form(engine, moodle, monkeypatch):
+    assert engine.login(USERNAME, PASSWORD)
+    other = httpengine.HttpEngine()
+    other.start()
+    try:
+        other.adopt_session(engine.export_cookies(), USERNAME)
+        assert other.login(USERNAME, PASSWORD)
+        assert len(moodle.posts) == 1
+        assert other.fetch(moodle.scheduler_url)[0] == PageState.TABLE_READY
+    finally:
+        other.quit()
+
+
+def test_async_engine_login_fetch_and_book(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+
+    async def run():
+        transport = httpx.AsyncHTTPTransport()
+        engine = asyncengine.AsyncHttpEngine(transport)
+        try:
+            assert await engine.login(USERNAME, PASSWORD)
+            state, rows, handles = await engine.fetch(moodle.scheduler_url)
+            assert state == PageState.TABLE_READY
+            return await engine.book(rows[0], handles[0], SLOT)
+        finally:
+            await engine.client.aclose()
+
+    assert asyncio.run(run()) == (True, True)
+    assert len(moodle.bookings) == 1
+
+
+def test_unconfirmed_submit_is_not_reported_as_booked(engine, moodle):
+    moodle.accept_booking = False
+    # Class names and scripts that mention success are not a confirmation; the row is still bookable
+    moodle.refused_notice = '<div class="alert alert-danger" role="alert">Booking failed</div><script>toast("alert-success")</script>'
+    assert engine.login(USERNAME, PASSWORD)
+    state, rows, handles = engine.fetch(moodle.scheduler_url)
+    assert engine.book(rows[0], handles[0], SLOT) == (False, False)
+    assert moodle.bookings == []
+
+
+def test_sync_and_async_engines_share_one_broker_login(engine, moodle, monkeypatch):
+    from sessionbroker import SessionBroker
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    broker = SessionBroker()
+    assert broker.sign_in(engine, USERNAME, PASSWORD)
+
+    async def run():
+        other = asyncengine.AsyncHttpEngine(httpx.AsyncHTTPTransport())
+        try:
+            assert await broker.sign_in_async(other, USERNAME, PASSWORD)
+            assert other.session_generation == engine.session_generation == 1
+            return (await other.fetch(moodle.scheduler_url))[0]
+        finally:
+            await other.client.aclose()
+
+    assert asyncio.run(run()) == PageState.TABLE_READY
+    assert len(moodle.posts) == 1
+
+
+def test_server_error_during_login_is_not_a_session(engine, moodle):
+    from sessionbroker import SessionBroker
+    moodle.error_status = 503
+    broker = SessionBroker()
+    assert not broker.sign_in(engine, USERNAME, PASSWORD)
+    assert engine.logged_in_as is None
+    assert engine.error == "Login failed: the LMS returned a server error (HTTP 503)."
+    assert engine.fetch(moodle.scheduler_url)[0] == PageState.SERVER_ERROR
+
+    # Once the LMS recovers, the next sign-in logs in for real instead of adopting a cached empty session
+    moodle.error_status = None
+    assert broker.sign_in(engine, USERNAME, PASSWORD)
+    assert len(moodle.posts) == 1
+
+
+def test_unreachable_lms_is_a_failed_login(monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", "http://127.0.0.1:9/course/view.php?id=302")
+    engine = httpengine.HttpEngine(timeout=1.0)
+    engine.start()
+    try:
+        assert not engine.login(USERNAME, PASSWORD)
+        assert engine.error.startswith("Login failed: ConnectError")
+    finally:
+        engine.quit()
+
+
+def test_async_engine_rejects_a_server_error_login(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    moodle.error_status = 503
+
+    async def run():
+        engine = asyncengine.AsyncHttpEngine(httpx.AsyncHTTPTransport())
+        try:
+            return await engine.login(USERNAME, PASSWORD), engine.logged_in_as
+        finally:
+            await engine.client.aclose()
+
+    assert asyncio.run(run()) == (False, None)
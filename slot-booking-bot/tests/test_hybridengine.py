@@ -0,0 +1,84 @@
+import pytest
+import httpengine
+from hybridengine import HybridEngine
+from mockmoodle import USERNAME, PASSWORD
+from moodle import PageState
+from slotparser import ButtonState
+
+pytest.importorskip("httpx")
+
+SLOT = {"day": "Monday", "date": "16 06 2025", "start_time": "8:00 AM", "end_time": "9:00 AM"}
+
+
+class FakeDriver:
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def get_cookies(self):
+        return self.cookies
+
+    def execute_script(self, script):
+        return "FakeBrowser/1.0"
+
+
+class FakeBrowser:
+    """Stands in for SeleniumEngine: logs in through an HttpEngine and books whatever row it is handed."""
+
+    def __init__(self, moodle):
+        self.moodle = moodle
+        self.driver = None
+        self.booked = []
+        self.error = None
+
+    def start(self):
+        self.http = httpengine.HttpEngine()
+        self.http.start()
+        self.driver = True
+
+    def login(self, username, password):
+        ok = self.http.login(username, password)
+        self.driver = FakeDriver(self.http.export_cookies())
+        return ok
+
+    def fetch(self, scheduler_url):
+        return self.http.fetch(scheduler_url)
+
+    def book(self, row, handle, slot):
+        self.booked.append(row)
+        return True, True
+
+    def quit(self):
+        self.driver = None
+        self.http.quit()
+
+
+@pytest.fixture
+def hybrid(moodle, monkeypatch, request):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    engine = HybridEngine(FakeBrowser(moodle), httpengine.HttpEngine(), park_browser=request.param)
+    engine.start()
+    yield engine
+    engine.quit()
+
+
+@pytest.mark.parametrize("hybrid", [False], indirect=True)
+def test_browser_logs_in_then_closes_and_http_polls(hybrid, moodle):
+    assert hybrid.login(USERNAME, PASSWORD)
+    assert hybrid.browser.driver is None
+    assert hybrid.logged_in_as == USERNAME
+    # Only the browser posted the login form; the HTTP client reused its session
+    assert [post.get("logintoken") for post in moodle.posts] == ["tok123"]
+    state, rows, handles = hybrid.fetch(moodle.scheduler_url)
+    assert state == PageState.TABLE_READY
+    moodle.accept_booking = False
+    assert hybrid.book(rows[0], handles[0], SLOT) == (False, False)
+
+
+@pytest.mark.parametrize("hybrid", [True], indirect=True)
+def test_parked_browser_retries_a_failed_http_booking(hybrid, moodle):
+    assert hybrid.login(USERNAME, PASSWORD)
+    assert hybrid.browser.driver is not None
+    state, rows, handles = hybrid.fetch(moodle.scheduler_url)
+    moodle.accept_booking = False
+    assert hybrid.book(rows[0], handles[0], SLOT) == (True, True)
+    assert [(row.start, row.state) for row in hybrid.browser.booked] == [(480, ButtonState.BOOKABLE)]
@@ -0,0 +1,37 @@
+from urllib.parse import parse_qsl
+from moodle import PageState, booking_confirmed, form_request, notice_text, page_status
+from slotparser import ButtonState, SlotRow
+
+ROW = SlotRow(739418, 480, 540, ButtonState.BOOKABLE, "")
+TABLE = ('<table id="slotbookertable"><tr><td>Monday, 16 June 2025</td><td>8:00 AM</td><td>9:00 AM</td>'
+         '<td></td><td></td><td></td><td></td><td>{button}</td></tr></table>')
+
+
+def test_form_request_keeps_order_and_repeated_names():
+    request = form_request([("b", "2"), ("a", "x&y z"), ("b", "3")])
+    assert request["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
+    assert parse_qsl(request["content"]) == [("b", "2"), ("a", "x&y z"), ("b", "3")]
+
+
+def test_the_rows_button_decides_a_booking():
+    booked = TABLE.format(button="<button>Cancel booking</button>")
+    still_open = '<div class="alert alert-success">Booking confirmed</div>' + TABLE.format(button="<button>Book slot</button>")
+    assert booking_confirmed(booked, ROW)
+    assert not booking_confirmed(still_open, ROW)
+
+
+def test_without_the_row_only_notification_text_counts():
+    assert booking_confirmed('<div class="alert alert-success" role="alert">Your booking is confirmed</div>', ROW)
+    assert not booking_confirmed('<div class="alert alert-success"></div><script>var state = "success";</script><p>confirmed</p>', ROW)
+    assert not booking_confirmed('<div class="notalert">confirmed</div>', ROW)
+
+
+def test_notice_text_is_the_visible_text():
+    assert notice_text('<div role="alert"><b>Slot</b>&nbsp;booked</div><div class="x">hidden</div>') == "slot booked"
+
+
+def test_page_status():
+    assert page_status(TABLE.format(button="")) == PageState.TABLE_READY
+    assert page_status("<html></html>", "https://lms/login/index.php") == PageState.LOGIN_REQUIRED
+    assert page_status("503 Service Unavailable") == PageState.SERVER_ERROR
+    assert page_status("<button>Cancel booking</button>") == PageState.HAS_BOOKING
@@ -0,0 +1,59 @@
+from poller import SlotWatcher, VenuePoller, run_round_robin
+from slotparser import ButtonState, SlotRow
+
+DAY = 739418
+
+
+def bookable(start, state=ButtonState.BOOKABLE):
+    return SlotRow(DAY, start, start + 60, state, "")
+
+
+def venue(rows, booked, ranked, accept=True):
+    """A poller over a fixed page whose watchers record the order they were offered rows in."""
+    poller = VenuePoller(lambda: (rows, [f"button {row.start}" for row in rows]))
+
+    def watcher(start, rank):
+        def on_row(row, handle):
+            booked.append((rank, handle))
+            return accept
+        return SlotWatcher((DAY, start, start + 60), f"{start}", on_row, rank)
+
+    for start, rank in ranked:
+        poller.register(watcher(start, rank))
+    return poller
+
+
+def test_best_match_is_the_highest_ranked_bookable_row():
+    booked = []
+    poller = venue([bookable(480), bookable(540, ButtonState.DISABLED), bookable(600)], booked, [(600, 2), (540, 0), (480, 1)])
+    watcher, position = poller.best_match(poller.fetch()[0])
+    assert (watcher.rank, position) == (1, 0)
+
+
+def test_round_robin_books_the_best_match_across_venues():
+    booked = []
+    first = venue([bookable(480)], booked, [(480, 3)])
+    second = venue([bookable(540)], booked, [(540, 1)])
+    remaining = run_round_robin([first, second], continuous=False)
+    # Both venues are fetched before booking, and the preferred slot on the later venue wins
+    assert booked == [(1, "button 540")]
+    assert first.attempt == second.attempt == 1
+    assert remaining[second] == [] and len(remaining[first]) == 1
+
+
+def test_a_match_that_is_not_booked_falls_through_to_the_next_rank():
+    booked = []
+    first = venue([bookable(480)], booked, [(480, 0)], accept=False)
+    second = venue([bookable(540)], booked, [(540, 1)])
+    run_round_robin([first, second], continuous=False)
+    assert booked == [(0, "button 480"), (1, "button 540")]
+
+
+def test_stopped_pollers_are_not_offered_their_matches():
+    booked = []
+    first = venue([bookable(480)], booked, [(480, 0)])
+    second = venue([bookable(540)], booked, [(540, 1)])
+    # The first venue's booking stops every poller for the account
+    first.watchers[0].on_row = lambda row, handle: booked.append(0) or second.stop("booked") or True
+    run_round_robin([first, second], continuous=False)
+    assert booked == [0]
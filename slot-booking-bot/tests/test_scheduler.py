@@ -0,0 +1,56 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from scheduler import DAY, Scheduler
+
+
+def shifted_clock(start):
+    """A wall clock that reads `start` now and runs at real speed."""
+    origin = time.monotonic()
+    return lambda: start + timedelta(seconds=time.monotonic() - origin)
+
+
+def test_one_shot_job_fires_on_time_and_is_removed():
+    scheduler = Scheduler()
+    fired = threading.Event()
+    job = scheduler.at(datetime.now() + timedelta(seconds=0.15), fired.set, name="once")
+    assert fired.wait(2)
+    assert len(job.skews) == 1 and abs(job.skews[0]) < 0.03
+    assert scheduler.jobs == []
+    assert job.skew_report().startswith("once: 1 run(s), mean skew")
+    scheduler.stop()
+
+
+def test_daily_job_fires_at_the_time_on_its_clock_and_recurs():
+    scheduler = Scheduler(now=shifted_clock(datetime(2025, 6, 16, 20, 59, 59, 800000)))
+    fired = threading.Event()
+    job = scheduler.daily("21:00", fired.set, name="booking")
+    assert job.next_run == datetime(2025, 6, 16, 21, 0)
+    assert fired.wait(2)
+    assert abs(job.skews[0]) < 0.03
+    assert job.next_run == datetime(2025, 6, 17, 21, 0)
+    assert scheduler.jobs == [job]
+    scheduler.stop()
+
+
+def test_daily_time_already_passed_today_with_lead():
+    scheduler = Scheduler(now=lambda: datetime(2025, 6, 16, 21, 0, 30))
+    job = scheduler.daily("21:00", lambda: None, lead_seconds=60)
+    assert job.next_run == datetime(2025, 6, 17, 20, 59)
+    assert job.interval == DAY
+    assert job.skew_report().endswith("not fired yet")
+    scheduler.stop()
+
+
+def test_cancelled_and_cleared_jobs_never_fire():
+    scheduler = Scheduler()
+    fired = threading.Event()
+    soon = datetime.now() + timedelta(seconds=0.1)
+    cancelled = scheduler.at(soon, fired.set)
+    scheduler.at(soon, fired.set)
+    scheduler.cancel(cancelled)
+    assert len(scheduler.jobs) == 1
+    scheduler.clear()
+    assert scheduler.next_run() is None
+    assert not fired.wait(0.3)
+    scheduler.stop()
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+import pytest
+import httpengine
+from mockmoodle import USERNAME, PASSWORD
+from sessionbroker import SessionBroker
+import asyncrunner
+import slot_booking
+from coordinator import BookingCoordinator
+from metrics import job_metrics
+from slot_booking import warm_up
+
+pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def broker_engine(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    broker = SessionBroker()
+    engine = httpengine.HttpEngine()
+    engine.start()
+    yield broker, engine
+    engine.quit()
+
+
+def test_warm_up_replaces_a_session_that_expired_since_the_last_run(broker_engine, moodle):
+    broker, engine = broker_engine
+    assert broker.sign_in(engine, USERNAME, PASSWORD)
+    moodle.sessions.clear()
+    start_at = datetime.now() + timedelta(seconds=30)
+
+    lead = warm_up(engine, moodle.scheduler_url, start_at, relogin=lambda started: broker.refresh(engine, USERNAME, PASSWORD))
+    assert lead is not None and lead > 0
+    assert len(moodle.posts) == 2
+    assert engine.session_generation == 2
+
+
+def test_warm_up_logs_in_when_the_cached_session_is_stale_too(broker_engine, moodle):
+    broker, engine = broker_engine
+    assert broker.sign_in(engine, USERNAME, PASSWORD)
+    # A pooled browser from an earlier generation: the first refresh only adopts the broker's cookies, which expired as well
+    engine.session_generation = 0
+    moodle.sessions.clear()
+    start_at = datetime.now() + timedelta(seconds=30)
+
+    lead = warm_up(engine, moodle.scheduler_url, start_at, relogin=lambda started: broker.refresh(engine, USERNAME, PASSWORD))
+    assert lead is not None
+    assert len(moodle.posts) == 2
+    assert engine.session_generation == 2
+
+
+def test_warm_up_without_relogin_reports_the_expired_session(broker_engine, moodle):
+    broker, engine = broker_engine
+    assert broker.sign_in(engine, USERNAME, PASSWORD)
+    moodle.sessions.clear()
+    assert warm_up(engine, moodle.scheduler_url, datetime.now() + timedelta(seconds=30)) is None
+
+
+def two_venues(moodle):
+    """Venue 36137 lists the less preferred slot first; venue 36138 has the preferred one."""
+    moodle.venues["36138"] = ("10:00 AM", "11:00 AM", "502")
+    second = {"day": "Monday", "date": "16 06 2025", "start_time": "8:00 AM", "end_time": "9:00 AM", "rank": 1}
+    first = {"day": "Monday", "date": "16 06 2025", "start_time": "10:00 AM", "end_time": "11:00 AM", "rank": 0}
+    return [(moodle.venue_url("36137"), [second]), (moodle.venue_url("36138"), [first])]
+
+
+def test_round_robin_books_the_preferred_slot_across_venues_over_http(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    monkeypatch.setattr(slot_booking, "session_broker", SessionBroker())
+    job = BookingCoordinator(USERNAME).add_job(f"{USERNAME} @ all venues")
+    slot_booking.multi_venue_booking_process(USERNAME, PASSWORD, two_venues(moodle), None, True, "HTTP", job=job)
+    assert [booking["slotid"] for booking in moodle.bookings] == ["502"]
+    assert job.coordinator.booked_by is job
+
+
+def test_async_runner_books_the_preferred_slot_across_venues(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    monkeypatch.setattr(asyncrunner, "session_broker", SessionBroker())
+    runner = asyncrunner.AsyncBookingRunner()
+    runner.add_job(USERNAME, PASSWORD, two_venues(moodle), continuous=False)
+    runner.run()
+    assert [booking["slotid"] for booking in moodle.bookings] == ["502"]
+
+
+def test_async_warm_up_replaces_an_expired_session(moodle, monkeypatch):
+    monkeypatch.setattr(httpengine, "COURSE_URL", moodle.course_url)
+    broker = SessionBroker()
+    monkeypatch.setattr(asyncrunner, "session_broker", broker)
+    runner = asyncrunner.AsyncBookingRunner()
+    slot = {"day": "Monday", "date": "16 06 2025", "start_time": "8:00 AM", "end_time": "9:00 AM"}
+    runner.add_job(USERNAME, PASSWORD, [(moodle.scheduler_url, [slot])], continuous=False, start_at=datetime.now() + timedelta(seconds=0.3))
+
+    # Yesterday's run left cookies in the broker that the LMS no longer accepts
+    engine = httpengine.HttpEngine()
+    engine.start()
+    try:
+        assert broker.sign_in(engine, USERNAME, PASSWORD)
+    finally:
+        engine.quit()
+    moodle.sessions.clear()
+
+    runner.run()
+    # The stale login, the warm-up re-login, then the two booking posts
+    assert len(moodle.posts) == 4
+    assert len(moodle.bookings) == 1
+    metrics = job_metrics.get(f"{USERNAME} @ {moodle.scheduler_url}")
+    # Replaced during warm-up: the first poll after T-0 already found the table
+    assert metrics.count("relogins") == 1 and metrics.count("polls") == 1
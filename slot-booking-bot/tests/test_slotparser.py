@@ -0,0 +1,89 @@
+from datetime import date
+from benchmark import synthetic_table_html
+from slotparser import ButtonState, parse_slot_table, rows_from_payload
+
+
+def cells(*values):
+    return "".join(f'<td class="cell c{i}">{value}</td>' for i, value in enumerate(values))
+
+
+def row(day, start, end, action):
+    return f"<tr>{cells(day, start, end, 'Lab 1611', '', 'Staff', '', action)}</tr>"
+
+
+def page(*rows):
+    return f'<html><body><p>Book slot</p><table id="slotbookertable"><tbody>{"".join(rows)}</tbody></table></body></html>'
+
+
+BOOK_FORM = (
+    '<form method="post" action="view.php?id=36137&amp;what=bookslot">'
+    '<input type="hidden" name="slotid" value="501"><input type="hidden" name="note" value="a&amp;b">'
+    '<button type="submit" class="btn btn-primary">Book slot</button></form>'
+)
+MONDAY = date(2025, 6, 16).toordinal()
+
+
+def test_date_carries_forward_until_the_next_header():
+    rows = parse_slot_table(page(
+        row("Monday, 16 June 2025", "8:00 AM", "9:00 AM", BOOK_FORM),
+        row("", "9:00 AM", "10:00 AM", BOOK_FORM),
+        row("Tuesday, 17 June 2025", "1:00 PM", "2:00 PM", BOOK_FORM),
+        row(" ", "2:00 PM", "3:00 PM", BOOK_FORM),
+    ))
+    assert [(r.date_ordinal, r.start, r.end) for r in rows] == [
+        (MONDAY, 480, 540), (MONDAY, 540, 600), (MONDAY + 1, 780, 840), (MONDAY + 1, 840, 900),
+    ]
+
+
+def test_rows_before_the_first_date_are_skipped():
+    rows = parse_slot_table(page(row("", "8:00 AM", "9:00 AM", BOOK_FORM), row("Monday, 16 June 2025", "9:00 AM", "10:00 AM", BOOK_FORM)))
+    assert [(r.date_ordinal, r.start) for r in rows] == [(MONDAY, 540)]
+
+
+def test_entities_in_cells_and_form_are_decoded():
+    rows = parse_slot_table(page(row("Monday,&nbsp;16 June 2025", "<span>8:00&nbsp;AM</span>", "9:00 AM",
+                                     BOOK_FORM.replace("Book slot", "Book&nbsp;slot"))))
+    assert len(rows) == 1
+    assert rows[0].state == ButtonState.BOOKABLE
+    assert rows[0].action == "view.php?id=36137&what=bookslot"
+    assert rows[0].params == (("slotid", "501"), ("note", "a&b"))
+
+
+def test_button_states():
+    rows = parse_slot_table(page(
+        row("Monday, 16 June 2025", "8:00 AM", "9:00 AM", '<button type="submit" disabled>Book slot</button>'),
+        row("", "9:00 AM", "10:00 AM", '<button type="submit">Cancel booking</button>'),
+        row("", "10:00 AM", "11:00 AM", '<button type="submit">Revoke</button>'),
+        row("", "11:00 AM", "12:00 PM", ""),
+        row("", "1:00 PM", "2:00 PM", BOOK_FORM),
+    ))
+    assert [r.state for r in rows] == [ButtonState.DISABLED, ButtonState.BOOKED, ButtonState.OTHER, ButtonState.NONE, ButtonState.BOOKABLE]
+
+
+def test_input_style_submits():
+    rows = parse_slot_table(page(
+        row("Monday, 16 June 2025", "8:00 AM", "9:00 AM", '<input type="submit" value="Book slot">'),
+        row("", "9:00 AM", "10:00 AM", '<input value="Book slot" class="btn" type="submit">'),
+        row("", "10:00 AM", "11:00 AM", '<input type="submit" value="Book slot" disabled="disabled">'),
+        row("", "11:00 AM", "12:00 PM", '<input type="hidden" name="x" value="1"><input type="submit" value="Cancel booking">'),
+    ))
+    assert [r.state for r in rows] == [ButtonState.BOOKABLE, ButtonState.BOOKABLE, ButtonState.DISABLED, ButtonState.BOOKED]
+
+
+def test_bytes_and_missing_table():
+    assert len(parse_slot_table(page(row("Monday, 16 June 2025", "8:00 AM", "9:00 AM", BOOK_FORM)).encode())) == 1
+    assert parse_slot_table("<html><body>No slots</body></html>") == []
+
+
+def test_synthetic_page_parses_every_row():
+    rows = parse_slot_table(synthetic_table_html(100))
+    assert len(rows) == 100
+    assert rows[32].date_ordinal == MONDAY + 1 and rows[32].start == 480
+    assert rows[99].params[-2:] == (("slotid", "1099"), ("sesskey", "abc123"))
+
+
+def test_rows_from_payload_keep_positions():
+    rows = rows_from_payload([["Monday, 16 June 2025", "8:00 AM", "9:00 AM", "Book slot", True], ["", "bad", "", "", False]])
+    assert rows[0][:4] == (MONDAY, 480, 540, ButtonState.BOOKABLE)
+    assert rows[0].params == () and rows[0].action == ""
+    assert rows[1] is None
@@ -0,0 +1,62 @@
+import pytest
+from datetime import date
+from slotparser import format_minutes, parse_minutes
+from slottime import SlotKey, SlotTime, parse_slot_date
+
+
+def test_parse_minutes_formats():
+    assert parse_minutes("8:00 AM") == 480
+    assert parse_minutes("08:00AM") == 480
+    assert parse_minutes("2:15 pm") == 855
+    assert parse_minutes(" 9:30 AM ") == 570
+    assert parse_minutes("nine") is None
+
+
+def test_midnight_and_noon():
+    assert parse_minutes("12:00 AM") == 0
+    assert parse_minutes("12:30 AM") == 30
+    assert parse_minutes("12:00 PM") == 720
+    assert parse_minutes("12:45 PM") == 765
+    assert format_minutes(0) == "12:00 AM"
+    assert format_minutes(720) == "12:00 PM"
+
+
+def test_missing_meridiem_reads_as_24_hour():
+    assert parse_minutes("14:00") == 840
+    assert parse_minutes("8:00") == 480
+    assert parse_minutes("00:15") == 15
+    assert parse_minutes("12:00") == 720
+
+
+def test_every_quarter_hour_round_trips():
+    for minutes in range(0, 24 * 60, 15):
+        text = format_minutes(minutes)
+        assert parse_minutes(text) == minutes
+        assert str(SlotTime.parse(text)) == text
+
+
+def test_slot_time_is_an_int():
+    start = SlotTime.parse("08:00AM")
+    assert start == 480 and hash(start) == hash(480)
+    assert str(start) == "8:00 AM"
+    assert repr(start) == "SlotTime('8:00 AM')"
+    assert SlotTime.parse("2:00 PM") > start
+    with pytest.raises(ValueError):
+        SlotTime.parse("soon")
+
+
+def test_slot_key_matches_the_parsed_row_tuple():
+    key = SlotKey.parse(" 16 06 2025", "8:00 AM", "9:00 AM")
+    ordinal = date(2025, 6, 16).toordinal()
+    assert key == (ordinal, 480, 540)
+    assert hash(key) == hash((ordinal, 480, 540))
+    assert key.date == date(2025, 6, 16)
+    assert key.date_text() == "Monday, 16 June 2025"
+    assert str(key) == "Monday, 16 06 2025, 8:00 AM-9:00 AM"
+
+
+def test_unreadable_slot_date():
+    with pytest.raises(ValueError):
+        parse_slot_date("2025-06-16")
+    with pytest.raises(ValueError):
+        SlotKey.parse("31 02 2025", "8:00 AM", "9:00 AM")
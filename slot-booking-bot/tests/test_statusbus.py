@@ -0,0 +1,112 @@
+import importlib
+import sys
+import threading
+import types
+import pytest
+from statusbus import StatusBus
+
+
+def test_publish_keeps_only_the_latest_line_per_job():
+    bus = StatusBus()
+    bus.publish("", "Status: Running")
+    bus.publish("alice @ all venues", "poll 1")
+    bus.publish("bob @ all venues", "poll 1")
+    bus.publish("alice @ all venues", "poll 2")
+    lines, notices = bus.drain()
+    assert lines == ["Status: Running", "alice @ all venues: poll 2", "bob @ all venues: poll 1"]
+    assert notices == []
+
+
+def test_drain_returns_lines_only_after_a_change():
+    bus = StatusBus()
+    assert bus.drain() == (None, [])
+    bus.publish("job", "a")
+    assert bus.drain()[0] == ["job: a"]
+    assert bus.drain()[0] is None
+    bus.publish("job", "a")
+    assert bus.drain()[0] == ["job: a"]
+    bus.clear()
+    assert bus.drain()[0] == []
+
+
+def test_notices_are_queued_in_order_and_drained_once():
+    bus = StatusBus()
+    bus.notify("info", "Booked", "first")
+    bus.notify("error", "Failed", "second")
+    assert bus.drain() == (None, [("info", "Booked", "first"), ("error", "Failed", "second")])
+    assert bus.drain() == (None, [])
+
+
+def test_concurrent_publishers_coalesce():
+    bus = StatusBus()
+
+    def worker(job):
+        for attempt in range(500):
+            bus.publish(job, f"poll {attempt}")
+
+    threads = [threading.Thread(target=worker, args=(f"job {n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(bus.drain()[0]) == [f"job {n}: poll 499" for n in range(4)]
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+
+class FakeLabel:
+    text = None
+
+    def config(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def statusview(monkeypatch):
+    """statusview with a Tk-free stand-in for the components module and a fresh bus."""
+    components = types.ModuleType("components")
+    components.root, components.status_label, components.tree_jobs = FakeRoot(), FakeLabel(), None
+    monkeypatch.setitem(sys.modules, "components", components)
+    monkeypatch.delitem(sys.modules, "statusview", raising=False)
+    module = importlib.import_module("statusview")
+    monkeypatch.setattr(module, "status_bus", StatusBus())
+    monkeypatch.setattr(module, "render_dashboard", lambda: None)
+    yield module
+    sys.modules.pop("statusview", None)
+
+
+def test_render_loop_survives_a_failing_notice(statusview):
+    shown = []
+
+    def show_notice(kind, title, message):
+        if kind == "error":
+            raise RuntimeError("window failed")
+        shown.append(message)
+
+    statusview.show_notice = show_notice
+    bus = statusview.status_bus
+    bus.publish("job", "polling")
+    bus.notify("error", "Failed", "boom")
+    with pytest.raises(RuntimeError):
+        statusview.render_status()
+    assert statusview.root.scheduled == [(statusview.FRAME_MS, statusview.render_status)]
+    assert statusview.status_label.text == "job: polling"
+
+    bus.publish("job", "booked")
+    bus.notify("info", "Booked", "done")
+    statusview.render_status()
+    assert len(statusview.root.scheduled) == 2
+    assert statusview.status_label.text == "job: booked"
+    assert shown == ["done"]
+
+
+def test_render_shows_idle_when_cleared(statusview):
+    statusview.status_bus.clear()
+    statusview.render_status()
+    assert statusview.status_label.text == "Status: Idle"
@@ -0,0 +1,188 @@
+import threading
+import time
+import pytest
+from selenium.common.exceptions import WebDriverException
+from metrics import Metrics
+from supervisor import SupervisedDriver
+from watchdog import CommandTimeout
+
+
+class HangingEngine:
+    """An engine whose start() blocks until abort() is called, like a browser that never comes up."""
+
+    name = "Hanging"
+
+    def __init__(self):
+        self.aborted = threading.Event()
+        self.error = None
+
+    def start(self):
+        self.aborted.wait(5)
+
+    def abort(self):
+        self.aborted.set()
+
+    def quit(self):
+        pass
+
+
+def test_a_start_that_hangs_is_aborted_and_the_engine_released():
+    engine, released = HangingEngine(), []
+
+    def spawn(starting):
+        starting(engine)
+        engine.start()
+        return engine
+
+    supervisor = SupervisedDriver(spawn, released.append, lambda engine: True, timeouts={"start": 0.2})
+    with pytest.raises(CommandTimeout):
+        supervisor.start()
+    assert engine.aborted.is_set()
+    assert released == [engine]
+    assert supervisor.engine is None
+
+
+def test_a_start_within_its_deadline_becomes_the_engine():
+    engine = HangingEngine()
+    engine.aborted.set()
+
+    def spawn(starting):
+        starting(engine)
+        engine.start()
+        return engine
+
+    supervisor = SupervisedDriver(spawn, lambda engine: None, lambda engine: True, timeouts={"start": 1.0})
+    supervisor.start()
+    assert supervisor.engine is engine
+
+
+class ClickingEngine(HangingEngine):
+    """Books after `delay` seconds of work that happens after the click, stamping clicked_at when it clicks."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.clicked_at = None
+
+    def fetch(self, scheduler_url):
+        return "TABLE_READY", [], []
+
+    def book(self, row, handle, slot):
+        self.clicked_at = time.monotonic()
+        time.sleep(self.delay)
+        return True, True
+
+
+def test_detect_to_click_ends_at_the_click_not_after_the_booking():
+    metrics = Metrics("22BCE1234")
+    engine = ClickingEngine(0.2)
+    supervisor = SupervisedDriver(lambda starting: engine, lambda engine: None, lambda engine: True, metrics)
+    supervisor.start()
+    supervisor.fetch("scheduler")
+    assert supervisor.book(None, None, {}) == (True, True)
+    assert metrics.percentile("detect_to_click", 50) < 0.1
+
+
+class CrashingEngine:
+    """Fetches fine until crash() is called, then raises WebDriverException like a browser that died."""
+
+    name = "Crashing"
+
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.signed_in = False
+        self.error = None
+
+    def fetch(self, scheduler_url):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return "TABLE_READY", [self.number], [None]
+
+    def is_alive(self):
+        return self.alive
+
+    def quit(self):
+        self.alive = False
+
+
+class Spawner:
+    """spawn() for the supervisor: numbered CrashingEngines, or an exception for the first `failures` restarts."""
+
+    def __init__(self, failures=0):
+        self.engines = []
+        self.failures = failures
+
+    def __call__(self, starting):
+        if self.engines and self.failures:
+            self.failures -= 1
+            self.engines.append(None)
+            raise WebDriverException("session not created")
+        engine = CrashingEngine(len(self.engines))
+        self.engines.append(engine)
+        starting(engine)
+        return engine
+
+
+def sign_in(engine):
+    engine.signed_in = True
+    return True
+
+
+def test_a_crashed_engine_is_replaced_signed_in_and_the_call_repeated():
+    spawner, retired, metrics = Spawner(), [], Metrics("22BCE1234")
+    supervisor = SupervisedDriver(spawner, retired.append, sign_in, metrics, backoff=0.01)
+    supervisor.start()
+    assert supervisor.fetch("scheduler")[1] == [0]
+    first = supervisor.engine
+    first.alive = False
+
+    assert supervisor.fetch("scheduler")[1] == [1]
+    assert retired == [first]
+    assert supervisor.engine.signed_in
+    # Job state lives outside the engine and carries on counting
+    assert metrics.count("polls") == 2
+    assert metrics.count("crashes") == 1 and metrics.count("recoveries") == 1
+
+
+def test_failed_restarts_back_off_until_one_succeeds():
+    spawner = Spawner(failures=2)
+    supervisor = SupervisedDriver(spawner, lambda engine: None, sign_in, backoff=0.05, max_restarts=4)
+    supervisor.start()
+    supervisor.engine.alive = False
+    started = time.monotonic()
+    assert supervisor.fetch("scheduler")[1] == [3]
+    # No wait before the first restart, then 0.05 s and 0.1 s
+    assert time.monotonic() - started >= 0.14
+    assert spawner.engines[1:3] == [None, None]
+
+
+def test_recovery_gives_up_after_max_restarts_and_reraises():
+    spawner, metrics = Spawner(failures=10), Metrics("22BCE1234")
+    supervisor = SupervisedDriver(spawner, lambda engine: None, sign_in, metrics, backoff=0.01, max_restarts=3)
+    supervisor.start()
+    supervisor.engine.alive = False
+    with pytest.raises(WebDriverException, match="chrome not reachable"):
+        supervisor.fetch("scheduler")
+    assert len(spawner.engines) == 1 + 3
+    assert supervisor.engine is None
+    assert metrics.count("crashes") == 1 and metrics.count("recoveries") == 0
+
+
+def test_errors_from_a_live_engine_are_not_recovered():
+    spawner = Spawner()
+    supervisor = SupervisedDriver(spawner, lambda engine: None, sign_in)
+    supervisor.start()
+    with pytest.raises(ValueError):
+        supervisor.call("fetch", lambda engine: int("not a number"))
+    assert len(spawner.engines) == 1
+
+
+def test_a_closed_supervisor_never_respawns():
+    spawner = Spawner()
+    supervisor = SupervisedDriver(spawner, lambda engine: None, sign_in)
+    supervisor.start()
+    supervisor.quit()
+    with pytest.raises(WebDriverException):
+        supervisor.fetch("scheduler")
+    assert len(spawner.engines) == 1
@@ -0,0 +1,71 @@
+import json
+from slottime import SlotTime
+from venues import compile_venue, load_venues
+
+T = SlotTime.parse
+
+
+def test_registry_compiles_every_venue():
+    venues = load_venues()
+    assert set(venues) == {"1731", "1851", "1852", "1611"}
+    venue = venues["1731"]
+    assert venue.scheduler_url.endswith("id=36638")
+    assert (venue.opens, venue.closes, venue.slot_minutes) == (T("8:00 AM"), T("4:30 PM"), 60)
+    assert venue.labels[0] == "8:00 AM" and venue.labels[-1] == "3:00 PM"
+    assert load_venues() is venues
+
+
+def test_fixed_grid_lookups():
+    venue = load_venues()["1731"]
+    assert venue.is_start(T("9:00 AM"))
+    assert not venue.is_start(T("9:30 AM"))
+    assert not venue.is_start(T("12:00 PM"))
+    assert not venue.is_start(None)
+    assert venue.end_for(T("3:00 PM")) == T("4:00 PM")
+    assert venue.end_for(T("9:30 AM")) is None
+
+
+def test_generated_grid_skips_the_break():
+    venue = load_venues()["1611"]
+    assert venue.starts[:2] == (T("8:00 AM"), T("8:15 AM"))
+    assert T("11:45 AM") in venue.starts and T("2:00 PM") in venue.starts
+    assert not any(T("12:00 PM") <= start < T("2:00 PM") for start in venue.starts)
+    assert venue.starts[-1] == T("4:15 PM")
+    assert venue.end_for(T("4:15 PM")) == T("4:30 PM")
+
+
+def test_every_configured_slot_is_valid():
+    for venue in load_venues().values():
+        assert all(venue.is_slot(start) for start in venue.starts), venue.venue_id
+
+
+def test_slot_validation_uses_hours_and_break():
+    venue = load_venues()["1731"]
+    assert venue.is_slot(T("11:00 AM"), T("12:00 PM"))
+    assert not venue.overlaps_break(T("11:00 AM"), T("12:00 PM"))
+    assert venue.overlaps_break(T("11:00 AM"), T("12:01 PM"))
+    assert not venue.is_slot(T("11:00 AM"), T("1:00 PM"))
+    assert venue.is_slot(T("1:00 PM"), T("2:00 PM"))
+    assert not venue.is_slot(T("3:00 PM"), T("5:00 PM"))
+    assert not venue.is_slot(T("9:00 AM"), T("9:00 AM"))
+    assert not venue.is_slot(T("9:30 AM"), T("10:30 AM"))
+
+
+def test_venue_without_break():
+    venue = compile_venue("1", {"scheduler_url": "u", "overall_start_time": "9:00 AM",
+                                "overall_end_time": "10:00 AM", "slot_duration_minutes": 45,
+                                "generate_all_intervals": True})
+    assert venue.break_bits == 0
+    assert venue.starts == (T("9:00 AM"), T("9:45 AM"))
+    assert venue.end_for(T("9:45 AM")) == T("10:00 AM")
+    assert venue.is_slot(T("9:00 AM"), T("9:45 AM"))
+
+
+def test_load_venues_from_another_file(tmp_path):
+    path = tmp_path / "venues.json"
+    path.write_text(json.dumps({"7": {"scheduler_url": "u", "overall_start_time": "14:00",
+                                      "overall_end_time": "16:00", "slot_duration_minutes": 60,
+                                      "fixed_start_times": ["14:00", "3:00 PM"]}}))
+    venue = load_venues(str(path))["7"]
+    assert venue.labels == ("2:00 PM", "3:00 PM")
+    assert venue.end_for(T("3:00 PM")) == T("4:00 PM")
@@ -0,0 +1,85 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from slotparser import parse_minutes, format_minutes
+
+VENUES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "venues.json")
+
+
+class Venue(namedtuple("Venue", ["venue_id", "scheduler_url", "opens", "closes", "slot_minutes",
+                                  "starts", "ends", "labels", "start_bits", "break_bits"])):
+    """One venue's slot grid, compiled once from venues.json.
+
+    Times are minutes since midnight. start_bits and break_bits have bit m
+    set for every minute m that is a valid slot start or falls inside the
+    break, so checks are a shift and a mask; is_slot() checks a whole
+    requested slot against both. ends maps each start to its end
+    (capped at closing time) and labels are the starts formatted for display.
+    """
+
+    __slots__ = ()
+
+    def is_start(self, minutes):
+        return minutes is not None and self.start_bits >> minutes & 1 == 1
+
+    def overlaps_break(self, start, end):
+        """True if any minute in [start, end) falls inside the break."""
+        return self.break_bits >> start & ((1 << (end - start)) - 1) != 0
+
+    def is_slot(self, start, end=None):
+        """True if start is on the grid and the slot ends by closing time, clear of the break."""
+        if not self.is_start(start):
+            return False
+        end = self.end_for(start) if end is None else end
+        return start < end <= self.closes and not self.overlaps_break(start, end)
+
+    def end_for(self, minutes):
+        """End minute of the slot starting at `minutes`, or None if it is not a start on this grid."""
+        return self.ends.get(minutes)
+
+
+def interval_starts(opens, closes, slot_minutes, break_start=None, break_end=None):
+    """Every slot start from opening to closing time at slot_minutes steps, skipping the break."""
+    starts = []
+    current = opens
+    while current < closes:
+        if break_start is None or not break_start <= current < break_end:
+            starts.append(current)
+        current += slot_minutes
+        if break_start is not None and break_start <= current < break_end:
+            current = break_end
+    return starts
+
+
+def compile_venue(venue_id, spec):
+    opens = parse_minutes(spec["overall_start_time"])
+    closes = parse_minutes(spec["overall_end_time"])
+    slot_minutes = spec["slot_duration_minutes"]
+    break_start = break_end = None
+    if spec.get("break_time"):
+        break_start, break_end = (parse_minutes(t) for t in spec["break_time"])
+    if "fixed_start_times" in spec:
+        starts = [parse_minutes(t) for t in spec["fixed_start_times"]]
+    elif spec.get("generate_all_intervals"):
+        starts = interval_starts(opens, closes, slot_minutes, break_start, break_end)
+    else:
+        starts = []
+    if None in starts or opens is None or closes is None:
+        raise ValueError(f"Venue {venue_id}: unreadable time in venues.json")
+    start_bits = 0
+    for start in starts:
+        start_bits |= 1 << start
+    break_bits = ((1 << (break_end - break_start)) - 1) << break_start if break_start is not None else 0
+    return Venue(venue_id, spec["scheduler_url"], opens, closes, slot_minutes, tuple(starts),
+                 MappingProxyType({start: min(start + slot_minutes, closes) for start in starts}),
+                 tuple(format_minutes(start) for start in starts), start_bits, break_bits)
+
+
+@lru_cache(maxsize=None)
+def load_venues(path=VENUES_PATH):
+    """Read and compile venues.json once per process (Streamlit reruns reuse the imported module, so the cache too)."""
+    with open(path, encoding="utf-8") as f:
+        specs = json.load(f)
+    return MappingProxyType({venue_id: compile_venue(venue_id, spec) for venue_id, spec in specs.items()})
@@ -0,0 +1,63 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class CommandTimeout(RuntimeError):
+    """An engine call ran past its deadline and the watchdog aborted the engine."""
+
+
+class Watchdog:
+    """One background thread that enforces deadlines on blocking engine calls.
+
+    arm() schedules a callback to run if the call hasn't been disarmed within
+    `timeout` seconds. The callback runs on the watchdog thread, so it must
+    unblock the stuck call (kill the browser, close the client) rather than
+    wait for it. Disarmed entries are dropped lazily when their deadline
+    comes up, so arming and disarming never touch the heap order.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._armed = {}
+        self._ids = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def arm(self, timeout, callback):
+        with self._condition:
+            token = next(self._ids)
+            self._armed[token] = callback
+            heapq.heappush(self._heap, (time.monotonic() + timeout, token))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return token
+
+    def disarm(self, token):
+        """Cancel a deadline; False if the watchdog already fired it."""
+        with self._condition:
+            return self._armed.pop(token, None) is not None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                deadline, token = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                callback = self._armed.pop(token, None)
+            if callback:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Watchdog callback failed: {type(e).__name__}: {e}")
+
+
+watchdog = Watchdog()
@@ -1,60 +1,37 @@
 import streamlit as st
+import os
+import sys
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import re
-import schedule
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, TimeoutException, ElementClickInterceptedException
 import requests
 from webdriver_manager.chrome import ChromeDriverManager
-from dateutil import parser
+
+# Reuse the browser-independent helpers from the desktop bot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "slot-booking-bot"))
+from moodle import PageState
+from tablescript import classify_page
+from domready import wait_for
+from slotparser import format_minutes, rows_from_payload
+from slotindex import build_slot_index
+from scheduler import booking_scheduler
+from venues import load_venues
+from slottime import SlotKey, SlotTime
+from gti import check_until_deadline
+from metrics import job_metrics, DASHBOARD_COLUMNS
 
 # Global for scheduled time and scheduler thread control
 scheduled_time = None
-scheduler_thread = None
 scheduler_stop_event = threading.Event()
 
-# Venue time slot configurations
-venue_details = {
-    "1731": {
-        "slot_duration_minutes": 120,
-        "overall_start_time_str": "8:00 AM", "overall_end_time_str": "4:30 PM",
-        "break_time_str": ("12:00 PM", "1:00 PM"),
-        "fixed_start_times_str": ["8:00 AM", "10:00 AM", "1:00 PM", "3:00 PM"]
-    },
-    "1851": {
-        "slot_duration_minutes": 120,
-        "overall_start_time_str": "8:00 AM", "overall_end_time_str": "4:30 PM",
-        "break_time_str": ("12:00 PM", "1:00 PM"),
-        "fixed_start_times_str": ["8:00 AM", "10:00 AM", "1:00 PM", "3:00 PM"]
-    },
-    "1852": {
-        "slot_duration_minutes": 60,
-        "overall_start_time_str": "8:00 AM", "overall_end_time_str": "4:00 PM",
-        "break_time_str": ("12:00 PM", "1:00 PM"),
-        "fixed_start_times_str": ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "1:00 PM", "2:00 PM", "3:00 PM"]
-    },
-    "1611": {
-        "slot_duration_minutes": 15,
-        "overall_start_time_str": "8:00 AM", "overall_end_time_str": "4:30 PM",
-        "break_time_str": ("12:00 PM", "1:00 PM"),
-        "generate_all_intervals": True
-    }
-}
-
-# URLs for scheduling
-urls = {
-    "1731": "https://lms2.ai.saveetha.in/mod/scheduler/view.php?id=36638",
-    "1851": "https://lms2.ai.saveetha.in/mod/scheduler/view.php?id=36298",
-    "1852": "https://lms2.ai.saveetha.in/mod/scheduler/view.php?id=37641",
-    "1611": "https://lms2.ai.saveetha.in/mod/scheduler/view.php?id=36137"
-}
+# Venue grids and scheduler URLs, shared with the desktop bot and compiled once per process
+venues = load_venues()
 
 def check_lms_connectivity(max_retries=3, delay=2):
     lms_url = "https://lms2.ai.saveetha.in/"
@@ -76,33 +53,8 @@ def check_lms_connectivity(max_retries=3, delay=2):
     st.session_state.status = "LMS URL is not accessible after maximum retries."
     return False
 
-def normalize_time(time_str):
-    try:
-        dt = parser.parse(time_str, fuzzy=True)
-        return dt.strftime("%I:%M %p").lstrip('0').replace(' 0', ' ').replace(':00 ', ':00').replace('AM', ' AM').replace('PM', ' PM')
-    except ValueError:
-        return time_str
-
-def _generate_interval_start_times(overall_start_dt, overall_end_dt, interval_m, break_start_dt, break_end_dt):
-    times = []
-    current_time = overall_start_dt
-    while current_time < overall_end_dt:
-        is_during_break = False
-        if break_start_dt and break_end_dt:
-            if break_start_dt <= current_time < break_end_dt:
-                is_during_break = True
-        
-        if not is_during_break:
-            times.append(current_time.strftime("%I:%M %p").lstrip('0').replace(' 0', ' ').replace(':00 ', ':00').replace('AM', ' AM').replace('PM', ' PM'))
-        
-        current_time += timedelta(minutes=interval_m)
-        
-        if break_start_dt and break_end_dt and break_start_dt <= current_time < break_end_dt:
-            current_time = break_end_dt
-            
-    return times
-
 def slot_booking_process(username, password, day, date, start_time, end_time, scheduler_url, proxy, headless, continuous=False, check_until_time=None):
+    metrics = job_metrics.start(f"{date} {start_time}-{end_time}")
     try:
         st.session_state.status = "Initializing browser..."
 
@@ -127,7 +79,7 @@ def slot_booking_process(username, password, day, date, start_time, end_time, sc
             st.session_state.status = "Logging in..."
             driver.get("https://lms2.ai.saveetha.in/course/view.php?id=302")
             try:
-                username_field = WebDriverWait(driver, 5, poll_frequency=0.1).until(EC.presence_of_element_located((By.NAME, 'username')))
+                username_field = wait_for(driver, "input[name='username']", 5)
                 username_field.send_keys(username)
                 driver.find_element(By.NAME, 'password').send_keys(password)
                 driver.find_element(By.ID, 'loginbtn').click()
@@ -140,15 +92,13 @@ def slot_booking_process(username, password, day, date, start_time, end_time, sc
                 st.session_state.status = "Already logged in or login elements not present. Continuing..."
 
             try:
-                date_obj = datetime.strptime(date.strip(), "%d %m %Y")
-                formatted_date_for_comparison = date_obj.strftime("%A, %d %B %Y")
+                target_key = SlotKey.parse(date, start_time, end_time)
             except ValueError:
-                st.error(f"Invalid date format: {date}. Expected format: DD MM YYYY")
+                st.error(f"Invalid date or time: {date}, {start_time}-{end_time}. Expected format: DD MM YYYY, H:MM AM")
                 st.session_state.status = f"Error: Invalid date format provided."
                 return
-
-            normalized_start_time = normalize_time(start_time)
-            normalized_end_time = normalize_time(end_time)
+            formatted_date_for_comparison = target_key.date_text()
+            normalized_start_time, normalized_end_time = str(target_key.start), str(target_key.end)
             st.session_state.status = f"Looking for slot: {formatted_date_for_comparison}, {normalized_start_time}-{normalized_end_time}"
 
             found_slot = False
@@ -158,16 +108,14 @@ def slot_booking_process(username, password, day, date, start_time, end_time, sc
             deadline = None
             if check_until_time and continuous:
                 try:
-                    deadline_dt = parser.parse(check_until_time)
-                    deadline = datetime.now().replace(hour=deadline_dt.hour, minute=deadline_dt.minute, second=0, microsecond=0)
-                    if deadline < datetime.now():
-                        deadline = deadline + timedelta(days=1)
+                    deadline = check_until_deadline(check_until_time.strip())
                     st.session_state.status = f"Will check until {deadline.strftime('%H:%M:%S')}"
                 except ValueError:
                     st.error(f"Invalid time format for 'Check Until Time': {check_until_time}. Use HH:MM (e.g., 21:30).")
                     st.session_state.status = f"Error: Invalid 'Check Until Time' format."
                     return
 
+            metrics.set_state("polling")
             while not found_slot and not scheduler_stop_event.is_set():
                 attempt += 1
                 st.session_state.status = f"Attempt {attempt}: Checking slot..."
@@ -177,106 +125,81 @@ def slot_booking_process(username, password, day, date, start_time, end_time, sc
                     st.session_state.status = f"Deadline reached. Stopping."
                     return
 
+                fetch_started = time.monotonic()
                 driver.get(scheduler_url)
-                page_source = driver.page_source
-                if any(error in page_source for error in ["503 Service Unavailable", "Service Temporarily Unavailable", "ERR_CONNECTION_REFUSED"]):
+                # One injected script classifies the page and reads the table, with no fixed waits
+                state, rows, buttons = classify_page(driver)
+                if state == PageState.SERVER_ERROR:
                     st.session_state.status = f"Server error detected. Retrying... (Attempt {attempt})"
                     time.sleep(refresh_interval)
                     continue
-
-                try:
-                    WebDriverWait(driver, 2).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table#slotbookertable, table.generaltable")))
-                except TimeoutException:
-                    st.session_state.status = f"Table not loaded within 2 seconds. Retrying... (Attempt {attempt})"
-                    time.sleep(refresh_interval)
-                    continue
-
-                try:
-                    WebDriverWait(driver, 0.5).until(EC.presence_of_element_located((By.XPATH, "//button[contains(@class, 'btn') and contains(text(), 'Cancel booking')]")))
+                if state == PageState.LOGIN_REQUIRED:
+                    st.error("Session expired: the LMS is asking to log in again.")
+                    st.session_state.status = "Error: Session expired."
+                    return
+                if state == PageState.HAS_BOOKING:
                     st.warning("Existing booking found. Please cancel it manually to book a new slot.")
                     st.session_state.status = "Existing booking found."
                     return
-                except TimeoutException:
-                    pass
-
-                try:
-                    WebDriverWait(driver, 0.5).until(EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'Other participants')]")))
+                if state == PageState.FROZEN:
                     st.warning("Frozen slot detected. Please resolve this manually to book a new slot.")
                     st.session_state.status = "Frozen slot detected."
                     return
-                except TimeoutException:
-                    pass
-
-                all_rows = WebDriverWait(driver, 1, poll_frequency=0.1).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table#slotbookertable tbody tr")))
-                current_date_in_table = ""
-
-                for row in all_rows:
-                    try:
-                        cells = row.find_elements(By.TAG_NAME, 'td')
-                        if len(cells) < 8:
-                            continue
-
-                        date_cell_text = cells[0].text.strip()
-                        if date_cell_text:
-                            current_date_in_table = date_cell_text
+                if state == PageState.EMPTY:
+                    st.session_state.status = f"Slot table not on the page. Retrying... (Attempt {attempt})"
+                    time.sleep(refresh_interval)
+                    continue
 
+                fetched_at = time.monotonic()
+                metrics.incr("polls")
+                metrics.observe("fetch", fetched_at - fetch_started)
+                target_index = build_slot_index(rows_from_payload(rows)).get(target_key)
+
+                if target_index is not None:
+                    st.session_state.status = f"Found target slot: {normalized_start_time}-{normalized_end_time}"
+                    book_button = buttons[target_index]
+                    if book_button is None:
+                        st.session_state.status = "Book slot button is disabled. Retrying..."
+                    else:
                         try:
-                            parsed_table_date = parser.parse(current_date_in_table)
-                        except ValueError:
-                            continue
+                            metrics.set_state("booking")
+                            ActionChains(driver).move_to_element(book_button).click().perform()
+                            metrics.observe("detect_to_click", time.monotonic() - fetched_at)
+                            found_slot = True
+                            st.session_state.status = "Book slot button clicked."
+                            try:
+                                note_field = wait_for(driver, "#id_studentnote_editoreditable", 3, ready=True)
+                                note_field.send_keys("Booking for project work (automated)")
+                                submit_button = wait_for(driver, "#id_submitbutton", 1, ready=True)
+                                submit_button.click()
+                                st.session_state.status = "Note added and submit button clicked."
 
-                        if parsed_table_date.date() == date_obj.date():
-                            table_start_time = normalize_time(cells[1].text.strip())
-                            table_end_time = normalize_time(cells[2].text.strip())
-
-                            if normalized_start_time == table_start_time and normalized_end_time == table_end_time:
-                                st.session_state.status = f"Found target slot: {table_start_time}-{table_end_time}"
                                 try:
-                                    book_button = cells[7].find_element(By.XPATH, ".//button[contains(text(), 'Book slot')]")
-                                    if book_button.is_enabled():
-                                        ActionChains(driver).move_to_element(book_button).click().perform()
-                                        found_slot = True
-                                        st.session_state.status = "Book slot button clicked."
-                                        try:
-                                            note_field = WebDriverWait(driver, 3, poll_frequency=0.1).until(EC.visibility_of_element_located((By.ID, "id_studentnote_editoreditable")))
-                                            note_field.send_keys("Booking for project work (automated)")
-                                            submit_button = WebDriverWait(driver, 1, poll_frequency=0.1).until(EC.element_to_be_clickable((By.ID, "id_submitbutton")))
-                                            submit_button.click()
-                                            st.session_state.status = "Note added and submit button clicked."
-                                            
-                                            try:
-                                                WebDriverWait(driver, 5, poll_frequency=0.1).until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'confirmed') or contains(text(), 'success') or contains(text(), 'Your booking is confirmed')]")))
-                                                st.success(f"Slot booked successfully: {day}, {date}, {start_time}-{end_time}")
-                                                st.session_state.status = f"Slot booked successfully: {day}, {date}, {start_time}-{end_time}"
-                                                return
-                                            except TimeoutException:
-                                                try:
-                                                    WebDriverWait(driver, 2, poll_frequency=0.1).until(EC.presence_of_element_located((By.XPATH, f"//tr[td[contains(text(), '{formatted_date_for_comparison}')]][td[contains(text(), '{normalized_start_time}')] and td[contains(text(), '{normalized_end_time}')]]//button[contains(text(), 'Cancel booking')]")))
-                                                    st.success(f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verified by 'Cancel booking' button)")
-                                                    st.session_state.status = f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verified)"
-                                                    return
-                                                except TimeoutException:
-                                                    st.warning(f"Slot booked, but confirmation message not found. Please verify manually for: {day}, {date}, {start_time}-{end_time}")
-                                                    st.session_state.status = f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verify manually)"
-                                                    return
-                                        except TimeoutException as te:
-                                            st.error(f"Failed to interact with note field or submit button: {te}")
-                                            st.session_state.status = f"Error: Booking form interaction failed."
-                                            return
-                                    else:
-                                        st.session_state.status = "Book slot button is disabled. Retrying..."
-                                        break
-                                except (NoSuchElementException, ElementClickInterceptedException) as e:
-                                    st.error(f"Button interaction error: {e}. Retrying...")
-                                    st.session_state.status = f"Error: Button interaction failed. Retrying..."
-                                    break
-                    except StaleElementReferenceException:
-                        st.session_state.status = "Stale element detected, refreshing page and retrying..."
-                        break
-                    except Exception as e:
-                        st.error(f"Error processing row: {e}")
-                        st.session_state.status = f"Error: Row processing failed. Retrying..."
-                        continue
+                                    wait_for(driver, "//*[contains(text(), 'confirmed') or contains(text(), 'success') or contains(text(), 'Your booking is confirmed')]", 5, kind="xpath")
+                                    st.success(f"Slot booked successfully: {day}, {date}, {start_time}-{end_time}")
+                                    metrics.set_state("booked")
+                                    st.session_state.status = f"Slot booked successfully: {day}, {date}, {start_time}-{end_time}"
+                                    return
+                                except TimeoutException:
+                                    try:
+                                        wait_for(driver, f"//tr[td[contains(text(), '{formatted_date_for_comparison}')]][td[contains(text(), '{normalized_start_time}')] and td[contains(text(), '{normalized_end_time}')]]//button[contains(text(), 'Cancel booking')]", 2, kind="xpath")
+                                        st.success(f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verified by 'Cancel booking' button)")
+                                        metrics.set_state("booked")
+                                        st.session_state.status = f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verified)"
+                                        return
+                                    except TimeoutException:
+                                        st.warning(f"Slot booked, but confirmation message not found. Please verify manually for: {day}, {date}, {start_time}-{end_time}")
+                                        metrics.set_state("booked (verify)")
+                                        st.session_state.status = f"Slot booked: {day}, {date}, {start_time}-{end_time} (Verify manually)"
+                                        return
+                            except TimeoutException as te:
+                                st.error(f"Failed to interact with note field or submit button: {te}")
+                                st.session_state.status = f"Error: Booking form interaction failed."
+                                return
+                        except (NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException) as e:
+                            found_slot = False
+                            st.error(f"Button interaction error: {e}. Retrying...")
+                            st.session_state.status = f"Error: Button interaction failed. Retrying..."
 
                 if not found_slot and not continuous:
                     st.error(f"Slot not found for {day}, {date}, {normalized_start_time}-{normalized_end_time}.")
@@ -287,8 +210,12 @@ def slot_booking_process(username, password, day, date, start_time, end_time, sc
                     time.sleep(refresh_interval)
 
     except Exception as e:
+        metrics.set_state("error")
         st.error(f"An unexpected error occurred during the booking process: {e}")
         st.session_state.status = f"Unexpected error: {e}"
+    finally:
+        if metrics.state in ("starting", "polling", "booking"):
+            metrics.set_state("finished")
 
 def add_slot(date_input_str, start_time, schedule_id):
     try:
@@ -305,28 +232,13 @@ def add_slot(date_input_str, start_time, schedule_id):
         return
 
     selected_venue_id = schedule_id
-    if selected_venue_id in venue_details:
-        config = venue_details[selected_venue_id]
-        
-        expected_start_times = []
-        if "fixed_start_times_str" in config:
-            expected_start_times = config["fixed_start_times_str"]
-        elif "generate_all_intervals" in config and config["generate_all_intervals"]:
-            overall_start_dt = parser.parse(config["overall_start_time_str"])
-            overall_end_dt = parser.parse(config["overall_end_time_str"])
-            break_start_dt = parser.parse(config["break_time_str"][0]) if config["break_time_str"] else None
-            break_end_dt = parser.parse(config["break_time_str"][1]) if config["break_time_str"] else None
-
-            expected_start_times = _generate_interval_start_times(
-                overall_start_dt, overall_end_dt, config["slot_duration_minutes"],
-                break_start_dt, break_end_dt
-            )
-        
-        normalized_selected_start_time = normalize_time(start_time)
-
-        if normalized_selected_start_time not in [normalize_time(t) for t in expected_start_times]:
+    if selected_venue_id in venues:
+        if not venues[selected_venue_id].is_start(SlotTime.parse(start_time)):
             st.error(f"The selected start time '{start_time}' is not valid for venue {selected_venue_id}.")
             return
+        if not venues[selected_venue_id].is_slot(SlotTime.parse(start_time), SlotTime.parse(end_time)):
+            st.error(f"{start_time}-{end_time} runs past closing time or into the break at venue {selected_venue_id}.")
+            return
 
     slot = {"day": day, "date": date_obj.strftime("%d %m %Y"), "start_time": start_time, "end_time": end_time, "venue_id": selected_venue_id}
     st.session_state.slot_details.append(slot)
@@ -340,8 +252,8 @@ def remove_slot(index):
         st.rerun()
 
 def stop_process():
-    global scheduled_time, scheduler_thread
-    schedule.clear()
+    global scheduled_time
+    booking_scheduler.clear()
     scheduler_stop_event.set()
     scheduled_time = None
     st.session_state.status = "Stopping all processes..."
@@ -357,7 +269,7 @@ def run_booking(continuous=False):
     proxies = [p.strip() for p in st.session_state.proxies.split(",") if p.strip()]
     check_until = st.session_state.check_until or None
 
-    if choice not in urls:
+    if choice not in venues:
         st.error("Invalid schedule selected.")
         st.session_state.status = "Error: Invalid schedule selected."
         return
@@ -375,13 +287,14 @@ def run_booking(continuous=False):
         st.session_state.status = "Error: LMS connectivity failed."
         return
 
-    scheduler_url = urls[choice]
+    scheduler_url = venues[choice].scheduler_url
+    job_metrics.clear()
     
     current_booking_threads = []
     
     for i, slot in enumerate(st.session_state.slot_details):
         proxy = proxies[i % len(proxies)] if proxies else None
-        slot_scheduler_url = urls.get(slot["venue_id"], scheduler_url)
+        slot_scheduler_url = venues[slot["venue_id"]].scheduler_url if slot["venue_id"] in venues else scheduler_url
 
         thread = threading.Thread(target=slot_booking_process, args=(
             username, password, slot["day"], slot["date"], slot["start_time"], slot["end_time"],
@@ -393,31 +306,19 @@ def run_booking(continuous=False):
     st.session_state.status = "Booking process initiated. Check logs for updates."
 
 def schedule_booking(schedule_time_str):
-    global scheduled_time, scheduler_thread
+    global scheduled_time
     try:
-        schedule_dt = parser.parse(schedule_time_str, fuzzy=False)
-        if not (0 <= schedule_dt.hour <= 23 and 0 <= schedule_dt.minute <= 59):
-            raise ValueError("Invalid time")
+        schedule_dt = datetime.strptime(schedule_time_str.strip(), "%H:%M")
         schedule_time_formatted = schedule_dt.strftime("%H:%M")
-        schedule.clear()
+        booking_scheduler.clear()
         scheduler_stop_event.clear()
         scheduled_time = schedule_time_formatted
         
-        schedule.every().day.at(schedule_time_formatted).do(lambda: run_booking(continuous=True))
+        booking_scheduler.daily(schedule_time_formatted, lambda: run_booking(continuous=True), name=f"booking at {schedule_time_formatted}")
         
         st.success(f"Booking scheduled daily at {schedule_time_formatted}")
         st.session_state.status = f"Status: Scheduled daily at {schedule_time_formatted}"
-
-        def run_schedule_continuously():
-            while not scheduler_stop_event.is_set():
-                schedule.run_pending()
-                time.sleep(1)
-        
-        if not hasattr(st.session_state, 'scheduler_thread_running') or not st.session_state.scheduler_thread_running:
-            scheduler_thread = threading.Thread(target=run_schedule_continuously, daemon=True)
-            scheduler_thread.start()
-            st.session_state.scheduler_thread_running = True
-            st.session_state.status = "Scheduler daemon thread started."
+        st.session_state.scheduler_thread_running = True
 
     except ValueError:
         st.error("Invalid time format. Use HH:MM (e.g., 21:03).")
@@ -442,7 +343,7 @@ if 'start_time_options' not in st.session_state:
 if 'end_time' not in st.session_state:
     st.session_state.end_time = ""
 if 'schedule_venue_id' not in st.session_state:
-    st.session_state.schedule_venue_id = list(venue_details.keys())[0]
+    st.session_state.schedule_venue_id = list(venues)[0]
 if 'username' not in st.session_state:
     st.session_state.username = ""
 if 'password' not in st.session_state:
@@ -471,7 +372,7 @@ st.markdown("---")
 
 # Configuration
 st.subheader("Bot Configuration")
-schedule_venue_id = st.selectbox("Select Venue Schedule", list(venue_details.keys()), index=list(venue_details.keys()).index(st.session_state.schedule_venue_id), key="schedule_venue_id_select", help="Choose the venue for booking.")
+schedule_venue_id = st.selectbox("Select Venue Schedule", list(venues), index=list(venues).index(st.session_state.schedule_venue_id), key="schedule_venue_id_select", help="Choose the venue for booking.")
 proxies = st.text_input("Proxies (comma-separated, e.g., http://proxy1:port,http://proxy2:port)", value=st.session_state.proxies, key="proxies_input", help="Optional: Add proxy servers for booking.")
 schedule_time = st.text_input("Schedule Time (HH:MM, e.g., 21:03)", value=st.session_state.schedule_time, key="schedule_time_input", help="Set a specific time for daily automated booking.")
 check_until = st.text_input("Check Until Time (HH:MM, e.g., 21:30, optional)", value=st.session_state.check_until, key="check_until_input", help="If continuous booking is enabled, the bot will stop checking after this time.")
@@ -493,35 +394,16 @@ st.session_state.date_input_value = date_input
 day_auto_filled = date_input.strftime("%A")
 st.text_input("Day (Auto-filled)", value=day_auto_filled, disabled=True, key="day_display")
 
-if schedule_venue_id in venue_details:
-    config = venue_details[schedule_venue_id]
-    overall_start_dt = parser.parse(config["overall_start_time_str"])
-    overall_end_dt = parser.parse(config["overall_end_time_str"])
-    break_start_dt = parser.parse(config["break_time_str"][0]) if config["break_time_str"] else None
-    break_end_dt = parser.parse(config["break_time_str"][1]) if config["break_time_str"] else None
-
-    if "fixed_start_times_str" in config:
-        st.session_state.start_time_options = config["fixed_start_times_str"]
-    elif "generate_all_intervals" in config and config["generate_all_intervals"]:
-        st.session_state.start_time_options = _generate_interval_start_times(
-            overall_start_dt, overall_end_dt, config["slot_duration_minutes"],
-            break_start_dt, break_end_dt
-        )
+if schedule_venue_id in venues:
+    st.session_state.start_time_options = list(venues[schedule_venue_id].labels)
 else:
     st.session_state.start_time_options = []
 
 start_time = st.selectbox("Start Time", st.session_state.start_time_options, key="start_time_input", help="Select the start time for your booking slot.")
 
-if start_time and schedule_venue_id in venue_details:
-    config = venue_details[schedule_venue_id]
-    try:
-        start_dt_obj = parser.parse(start_time)
-        overall_end_dt = parser.parse(config["overall_end_time_str"])
-        potential_end_dt_obj = start_dt_obj + timedelta(minutes=config["slot_duration_minutes"])
-        actual_end_dt_obj = min(potential_end_dt_obj, overall_end_dt)
-        st.session_state.end_time = actual_end_dt_obj.strftime("%I:%M %p").lstrip('0').replace(' 0', ' ').replace(':00 ', ':00').replace('AM', ' AM').replace('PM', ' PM')
-    except ValueError:
-        st.session_state.end_time = "Invalid Time"
+if start_time and schedule_venue_id in venues:
+    end = venues[schedule_venue_id].end_for(SlotTime.parse(start_time))
+    st.session_state.end_time = format_minutes(end) if end is not None else "Invalid Time"
 else:
     st.session_state.end_time = ""
 
@@ -564,12 +446,17 @@ st.markdown("---")
 st.subheader("Current Status")
 st.write(st.session_state.status)
 
+# Per-job dashboard from the jobs' live metrics
+summaries = [metrics.summary() for metrics in job_metrics]
+if summaries:
+    st.table([{heading: "-" if summary[key] is None else summary[key] for key, heading in DASHBOARD_COLUMNS} for summary in summaries])
+
 # Important Note
 st.markdown(
     """
     ---
     **Important Notes:**
-    - **Scheduling/Continuous Booking**: This app uses Python's `threading` and `schedule` library for background tasks. This works locally, but in cloud deployments (e.g., Streamlit Community Cloud), threads may not persist due to Streamlit's process management. For production, use a dedicated task scheduler like Celery or Airflow.
+    - **Scheduling/Continuous Booking**: This app runs bookings in background threads and times scheduled runs with the bot's own scheduler on the LMS clock. This works locally, but in cloud deployments (e.g., Streamlit Community Cloud), threads may not persist due to Streamlit's process management. For production, use a dedicated task scheduler like Celery or Airflow.
     - **Session State**: In multi-user deployments, `st.session_state` may lead to race conditions. For production, consider a backend database or user-specific sessions.
     """
 )